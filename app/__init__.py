@@ -1,20 +1,27 @@
-from app.config import BoardConfig, SonosConfig
+from app.config import BoardConfig, SonosConfig, WeatherConfig
 from app.container import (
     BoardContainer,
     SonosContainer,
     WeatherContainer,
     build_board_container,
     build_sonos_container,
+    build_weather_cadence,
     build_weather_container,
+    close_board_container,
+    close_sonos_container,
 )
 
 __all__ = [
     "BoardConfig",
     "SonosConfig",
+    "WeatherConfig",
     "BoardContainer",
     "WeatherContainer",
     "SonosContainer",
     "build_board_container",
     "build_weather_container",
+    "build_weather_cadence",
     "build_sonos_container",
+    "close_board_container",
+    "close_sonos_container",
 ]
@@ -13,6 +13,28 @@ def _load_dotenv_if_needed(load_env: bool) -> None:
 class BoardConfig:
     vb_rw_api_key: str
     redis_url: str
+    # shared send budget across every process using this key
+    rate_limit_burst: int = 1
+    rate_limit_interval_s: float = 15.0
+    rate_limit_wait_s: float = 30.0
+    # hand sends to the Redis-stream worker instead of sending inline
+    use_send_queue: bool = False
+    # "cloud" or "local" (the board's LAN Local API)
+    transport: str = "cloud"
+    local_api_key: str | None = None
+    local_host: str | None = None
+    local_port: int = 7000
+    # fall back to the cloud API when the local board is unreachable
+    transport_fallback: bool = True
+    # changes whose slowest cell turns at most this many flaps use the gentle speed
+    gentle_max_flaps: int = 10
+    # columns a layout may shift sideways to settle sooner; 0 keeps layouts as rendered
+    max_center_shift: int = 0
+    # per-board lease serializing sends across workers; renewed before every board
+    # request attempt, so it must outlast the rate-limit wait or one attempt plus backoff
+    send_lease: bool = True
+    send_lease_ttl_s: float = 90.0
+    send_lease_wait_s: float = 60.0
 
     @classmethod
     def from_env(cls, *, load_env: bool = True) -> "BoardConfig":
@@ -21,15 +43,78 @@ class BoardConfig:
         return cls(
             vb_rw_api_key=os.environ["VB_RW_API_KEY"],
             redis_url=os.environ["REDIS_URL"],
+            rate_limit_burst=int(os.getenv("VB_RATE_LIMIT_BURST", "1")),
+            rate_limit_interval_s=float(os.getenv("VB_RATE_LIMIT_INTERVAL_S", "15")),
+            rate_limit_wait_s=float(os.getenv("VB_RATE_LIMIT_WAIT_S", "30")),
+            use_send_queue=os.getenv("VB_SEND_QUEUE", "").lower() in {"1", "true", "yes"},
+            transport=os.getenv("VB_TRANSPORT", "cloud").lower(),
+            local_api_key=os.getenv("VB_LOCAL_API_KEY"),
+            local_host=os.getenv("VB_LOCAL_HOST"),
+            local_port=int(os.getenv("VB_LOCAL_PORT", "7000")),
+            transport_fallback=os.getenv("VB_TRANSPORT_FALLBACK", "true").lower() in {"1", "true", "yes"},
+            gentle_max_flaps=int(os.getenv("VB_GENTLE_MAX_FLAPS", "10")),
+            max_center_shift=int(os.getenv("VB_MAX_CENTER_SHIFT", "0")),
+            send_lease=os.getenv("VB_SEND_LEASE", "true").lower() in {"1", "true", "yes"},
+            send_lease_ttl_s=float(os.getenv("VB_SEND_LEASE_TTL_S", "90")),
+            send_lease_wait_s=float(os.getenv("VB_SEND_LEASE_WAIT_S", "60")),
         )
 
 
+@dataclass(frozen=True)
+class WeatherConfig:
+    # how long one fetch of a grid cell serves every weather view
+    refresh_s: float = 240.0
+    # oldest last-good value that may be shown while Open-Meteo is slow or down
+    stale_max_age_s: float = 1800.0
+    # how long a run waits on the upstream before falling back to it
+    revalidate_wait_s: float = 3.0
+    # how long a run waits at exit for a background refetch to store its result
+    revalidate_exit_wait_s: float = 20.0
+    # a displayed value only changes once the reading moves at least this far
+    temp_hysteresis: float = 0.3
+    uv_hysteresis: float = 0.5
+    rain_hysteresis: float = 10.0
+    # bounds for the adaptive fetch interval; the minimum should match the scheduler tick
+    cadence_min_interval_s: float = 300.0
+    cadence_max_interval_s: float = 3600.0
+
+    @classmethod
+    def from_env(cls, *, load_env: bool = True) -> "WeatherConfig":
+        _load_dotenv_if_needed(load_env)
+
+        return cls(
+            refresh_s=float(os.getenv("WEATHER_REFRESH_S", "240")),
+            stale_max_age_s=float(os.getenv("WEATHER_STALE_MAX_AGE_S", "1800")),
+            revalidate_wait_s=float(os.getenv("WEATHER_REVALIDATE_WAIT_S", "3")),
+            revalidate_exit_wait_s=float(os.getenv("WEATHER_REVALIDATE_EXIT_WAIT_S", "20")),
+            temp_hysteresis=float(os.getenv("WEATHER_TEMP_HYSTERESIS", "0.3")),
+            uv_hysteresis=float(os.getenv("WEATHER_UV_HYSTERESIS", "0.5")),
+            rain_hysteresis=float(os.getenv("WEATHER_RAIN_HYSTERESIS", "10")),
+            cadence_min_interval_s=float(os.getenv("WEATHER_CADENCE_MIN_S", "300")),
+            cadence_max_interval_s=float(os.getenv("WEATHER_CADENCE_MAX_S", "3600")),
+        )
+
+    def hysteresis_thresholds(self) -> dict[str, float]:
+        return {
+            "temperature": self.temp_hysteresis,
+            "temp_now": self.temp_hysteresis,
+            "feels_like": self.temp_hysteresis,
+            "temp_max": self.temp_hysteresis,
+            "temp_min": self.temp_hysteresis,
+            "uv_idx": self.uv_hysteresis,
+            "rain_chance_today": self.rain_hysteresis,
+        }
+
+
 @dataclass(frozen=True)
 class SonosConfig:
     client_id: str
     client_secret: str
     redirect_uri: str
     database_url: str
+    # show the cover art as a colour-tile mosaic beside the track (needs Pillow)
+    album_art: bool = False
+    album_art_cache_dir: str = ".album_art_cache"
 
     @classmethod
     def from_env(cls, *, load_env: bool = True) -> "SonosConfig":
@@ -40,4 +125,6 @@ class SonosConfig:
             client_secret=os.environ["SONOS_CLIENT_SECRET"],
             redirect_uri=os.environ["SONOS_REDIRECT_URI"],
             database_url=os.environ["DATABASE_URL"],
+            album_art=os.getenv("SONOS_ALBUM_ART", "").lower() in {"1", "true", "yes"},
+            album_art_cache_dir=os.getenv("SONOS_ALBUM_ART_DIR", ".album_art_cache"),
         )
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
 
-from app.config import BoardConfig, SonosConfig
+from app.config import BoardConfig, SonosConfig, WeatherConfig
 from redis_data_store import RedisDataStore
+from vestaboard.board_lease import BoardLease
 from vestaboard.display_manager import DisplayManager
+from vestaboard.rate_limiter import RedisTokenBucket
+from vestaboard.send_queue import SendQueue
+from vestaboard.transports import build_transports
 from vestaboard.vestaboard import VestaboardMessenger
+from weather_app.cadence import AdaptiveCadence
+from weather_app.last_good import LastGoodStore
 from weather_app.weather import WeatherClient
 
 
@@ -13,12 +19,14 @@ class BoardContainer:
     vestaboard_messenger: VestaboardMessenger
     redis_data_store: RedisDataStore
     display_manager: DisplayManager
+    send_queue: SendQueue | None = None
 
 
 @dataclass(frozen=True)
 class WeatherContainer:
     board: BoardContainer
     weather_client: WeatherClient
+    config: WeatherConfig
 
 
 @dataclass(frozen=True)
@@ -28,16 +36,49 @@ class SonosContainer:
     sonos_data_store: "PostgresDataStore"
     sonos_oauth_client: "SonosOAuthClient"
     sonos_event_processor: "EventProcessor"
+    sonos_discovery_cache: "SonosDiscoveryCache"
 
 
 def build_board_container(config: BoardConfig | None = None) -> BoardContainer:
     config = config or BoardConfig.from_env()
 
-    vestaboard_messenger = VestaboardMessenger(api_key=config.vb_rw_api_key)
     redis_data_store = RedisDataStore(config.redis_url)
+    rate_limiter = RedisTokenBucket(
+        redis_data_store.client,
+        config.vb_rw_api_key,
+        capacity=config.rate_limit_burst,
+        refill_interval_s=config.rate_limit_interval_s,
+    )
+    transport, fallback_transport = build_transports(
+        transport=config.transport,
+        api_key=config.vb_rw_api_key,
+        local_api_key=config.local_api_key,
+        local_host=config.local_host,
+        local_port=config.local_port,
+        fallback=config.transport_fallback,
+    )
+    vestaboard_messenger = VestaboardMessenger(
+        api_key=config.vb_rw_api_key,
+        rate_limiter=rate_limiter,
+        rate_limit_wait_s=config.rate_limit_wait_s,
+        transport=transport,
+        fallback_transport=fallback_transport,
+    )
+    send_queue = SendQueue(redis_data_store.client) if config.use_send_queue else None
+    lease = None
+    if config.send_lease:
+        lease = BoardLease(
+            redis_data_store.client,
+            ttl_s=config.send_lease_ttl_s,
+            wait_s=config.send_lease_wait_s,
+        )
     display_manager = DisplayManager(
         messenger=vestaboard_messenger,
         redis_data_store=redis_data_store,
+        send_queue=send_queue,
+        gentle_max_flaps=config.gentle_max_flaps,
+        max_center_shift=config.max_center_shift,
+        lease=lease,
     )
 
     return BoardContainer(
@@ -45,15 +86,38 @@ def build_board_container(config: BoardConfig | None = None) -> BoardContainer:
         vestaboard_messenger=vestaboard_messenger,
         redis_data_store=redis_data_store,
         display_manager=display_manager,
+        send_queue=send_queue,
     )
 
 
-def build_weather_container(board: BoardContainer | None = None) -> WeatherContainer:
+def build_weather_container(
+    board: BoardContainer | None = None,
+    config: WeatherConfig | None = None,
+) -> WeatherContainer:
     board = board or build_board_container()
+    config = config or WeatherConfig.from_env()
+    redis_client = board.redis_data_store.client
 
     return WeatherContainer(
         board=board,
-        weather_client=WeatherClient(),
+        weather_client=WeatherClient(
+            data_client=redis_client,
+            refresh_s=config.refresh_s,
+            last_good_store=LastGoodStore(redis_client),
+            stale_max_age_s=config.stale_max_age_s,
+            revalidate_wait_s=config.revalidate_wait_s,
+            revalidate_exit_wait_s=config.revalidate_exit_wait_s,
+        ),
+        config=config,
+    )
+
+
+def build_weather_cadence(weather: WeatherContainer, job: str) -> AdaptiveCadence:
+    return AdaptiveCadence(
+        weather.board.redis_data_store.client,
+        job,
+        min_interval_s=weather.config.cadence_min_interval_s,
+        max_interval_s=weather.config.cadence_max_interval_s,
     )
 
 
@@ -62,8 +126,10 @@ def build_sonos_container(
     board: BoardContainer | None = None,
     config: SonosConfig | None = None,
 ) -> SonosContainer:
+    from sonos_app.album_art import AlbumArtMosaics
     from sonos_app.data_store import PostgresDataStore
-    from sonos_app.event_processor import EventProcessor
+    from sonos_app.discovery_cache import SonosDiscoveryCache
+    from sonos_app.event_processor import ART_COLS, ART_ROWS, EventProcessor
     from sonos_app.sonos_oauth_client import SonosOAuthClient
 
     board = board or build_board_container()
@@ -79,9 +145,14 @@ def build_sonos_container(
         config.redirect_uri,
         data_store=sonos_data_store,
     )
+    album_art = None
+    if config.album_art:
+        album_art = AlbumArtMosaics(config.album_art_cache_dir, rows=ART_ROWS, cols=ART_COLS)
+
     sonos_event_processor = EventProcessor(
         vestaboard_messenger=board.vestaboard_messenger,
         display_manager=board.display_manager,
+        album_art=album_art,
     )
 
     return SonosContainer(
@@ -90,4 +161,16 @@ def build_sonos_container(
         sonos_data_store=sonos_data_store,
         sonos_oauth_client=sonos_oauth_client,
         sonos_event_processor=sonos_event_processor,
+        sonos_discovery_cache=SonosDiscoveryCache(),
     )
+
+
+def close_board_container(board: BoardContainer) -> None:
+    board.vestaboard_messenger.close()
+    board.redis_data_store.close()
+
+
+def close_sonos_container(container: SonosContainer) -> None:
+    container.sonos_event_processor.close()
+    container.sonos_data_store.close()
+    close_board_container(container.board)
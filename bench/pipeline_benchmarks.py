@@ -0,0 +1,198 @@
+"""
+End-to-end send benchmarks against the local Vestaboard stand-in.
+
+Drives the weather, detailed weather, countdown and Sonos pipelines through
+the real VestaboardMessenger and DisplayManager, pointed at
+bench.vestaboard_server, and reports per-stage timings:
+
+    python -m bench.pipeline_benchmarks --iterations 50 --latency-ms 80 --json bench_output.json
+
+Stages: build (incremental template render), redis_read, transition,
+persist, send, history, and total.
+"""
+import argparse
+import functools
+import json
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from bench.standins import InMemoryRecordStore
+from bench.vestaboard_server import FaultConfig, VestaboardStandIn
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.display_manager import DisplayManager
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.samples[name].append(time.perf_counter() - start)
+
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                "n": len(values),
+                "mean_ms": statistics.fmean(values) * 1000,
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return result
+
+
+def _instrument(timer: StageTimer, messenger, manager: DisplayManager) -> None:
+    messenger.set_transition = timer.wrap("transition", messenger.set_transition)
+    manager._get_prev_record = timer.wrap("redis_read", manager._get_prev_record)
+    manager._persist_record = timer.wrap("persist", manager._persist_record)
+    manager._send_content = timer.wrap("send", manager._send_content)
+    manager._record_history = timer.wrap("history", manager._record_history)
+
+
+def _weather_screen(i: int, previous):
+    from weather_app.run_weather import WEATHER_SCREEN, weather_slot_values
+    from weather_app.weather import WeatherNow
+    from weather_app.weather_header import WeatherHeader
+
+    data = [
+        WeatherNow(city=city, temperature=10.0 + (i + n) % 7 * 0.7, unit="C", wind_speed=12, wind_unit="kmh")
+        for n, city in enumerate(["WOODINVILLE", "WAHIAWA", "KONA", "WAIMEA", "RUILI"])
+    ]
+    screen = WEATHER_SCREEN.render_screen(weather_slot_values(data, WeatherHeader()), previous)
+    return BoardState.WEATHER, "weather_app", screen
+
+
+def _detailed_screen(i: int, previous):
+    from weather_app.run_detailed_weather import DETAILED_SCREEN, detailed_slot_values
+    from weather_app.weather import DetailedWeather
+    from weather_app.weather_header import WeatherHeader
+
+    detailed = DetailedWeather(
+        city="WOODINVILLE",
+        temp_now=11.0 + i % 9 * 0.3,
+        temp_max=15.2,
+        temp_min=6.4,
+        feels_like=9.8,
+        uv_idx=2.0,
+        rain_chance_today=40.0,
+        condition="PARTLY CLOUDY",
+        unit="C",
+    )
+    screen = DETAILED_SCREEN.render_screen(detailed_slot_values(detailed, WeatherHeader()), previous)
+    return BoardState.WEATHER, "detailed_weather_app", screen
+
+
+@functools.lru_cache(maxsize=1)
+def _countdown_engine():
+    from countdown_app.countdown_engine import CountdownEngine
+
+    return CountdownEngine.from_target_dates({
+        f"Target {n}": datetime(2026, 6, 1) + timedelta(days=n * 11)
+        for n in range(200)
+    })
+
+
+def _countdown_screen(i: int, previous):
+    from countdown_app.run_countdown import COUNTDOWN_SCREEN, TARGETS_PER_PAGE, countdown_slot_values
+
+    now = datetime(2026, 1, 1) + timedelta(days=i)
+    page = _countdown_engine().pages(TARGETS_PER_PAGE, TARGETS_PER_PAGE, now=now)[0]
+    return BoardState.COUNTDOWN, "countdown_app", COUNTDOWN_SCREEN.render_screen(countdown_slot_values(page), previous)
+
+
+def _sonos_screen(i: int, previous):
+    from sonos_app.event_processor import SONOS_SCREEN
+
+    values = {"track": f"Midnight City {i}", "artist": "M83", "album": "Hurry Up, We're Dreaming"}
+    return BoardState.SONOS, "sonos_app", SONOS_SCREEN.render_screen(values, previous)
+
+
+PIPELINES = {
+    "weather": _weather_screen,
+    "detailed_weather": _detailed_screen,
+    "countdown": _countdown_screen,
+    "sonos": _sonos_screen,
+}
+
+
+def run_pipeline(standin: VestaboardStandIn, build: Callable, iterations: int, redis_url: str | None):
+    from redis_data_store import RedisDataStore
+
+    timer = StageTimer()
+    messenger = standin.messenger()
+    store = RedisDataStore(redis_url) if redis_url else InMemoryRecordStore()
+    manager = DisplayManager(messenger=messenger, redis_data_store=store)
+    _instrument(timer, messenger, manager)
+
+    build_timed = timer.wrap("build", build)
+    screen = None
+
+    for i in range(iterations):
+        start = time.perf_counter()
+
+        # each render starts from the last one, like the jobs do from the record
+        state, source, screen = build_timed(i, screen)
+        manager.send(BoardMessage.from_screen(state, source, screen))
+
+        timer.samples["total"].append(time.perf_counter() - start)
+
+    messenger.close()
+    return timer.summary()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark board pipelines against a local Vestaboard stand-in.")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help="Comma-separated subset to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected per-request latency")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--redis-url", default=None, help="Use a real Redis instead of the in-memory record store")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the timing summary to this file")
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_s=args.latency_ms / 1000,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        seed=args.seed,
+    )
+
+    results = {}
+    with VestaboardStandIn(faults=faults) as standin:
+        for name in args.pipelines.split(","):
+            results[name] = run_pipeline(standin, PIPELINES[name], args.iterations, args.redis_url)
+
+            print(f"\n{name}")
+            for stage, s in results[name].items():
+                print(
+                    f"  {stage:<11} n={s['n']:>4} mean={s['mean_ms']:>8.2f}ms "
+                    f"p50={s['p50_ms']:>8.2f}ms p95={s['p95_ms']:>8.2f}ms max={s['max_ms']:>8.2f}ms"
+                )
+
+        print(f"\nstand-in responses: {standin.status_counts()}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Load generator for the /sonos/events webhook.
+
+Replays recorded playbackMetadata bodies as correctly signed Sonos events
+against the FastAPI app in-process, with Vestaboard, Sonos and Postgres
+replaced by the stand-ins in bench.standins. Each rate step is open-loop:
+requests are issued on a fixed schedule regardless of how fast the app
+answers, and latency is measured from the scheduled send time so queueing
+inside the app is not hidden.
+
+    python -m bench.sonos_events_load --rates 10,50,100 --duration 10
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from bench.standins import build_standin_sonos_container
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "playback_metadata"
+
+NAMESPACE = "playbackMetadata"
+EVENT_TYPE = "metadataStatus"
+TARGET_TYPE = "groupId"
+
+
+@dataclass(frozen=True)
+class RateResult:
+    target_rate: float
+    sent: int
+    completed: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    max_lag_ms: float
+    p99_lag_ms: float
+
+
+def load_bodies(directory: Path) -> List[Dict[str, Any]]:
+    bodies = []
+    for path in sorted(directory.glob("*.json")):
+        with open(path) as f:
+            bodies.append(json.load(f))
+
+    if not bodies:
+        raise ValueError(f"No recorded playbackMetadata bodies found in {directory}")
+
+    return bodies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class SignedEventFactory:
+    def __init__(
+        self,
+        bodies: List[Dict[str, Any]],
+        client_id: str,
+        client_secret: str,
+        group_id: str = "RINCON_STANDIN:1",
+        unique_tracks: bool = False,
+    ):
+        self.bodies = bodies
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.group_id = group_id
+        self.unique_tracks = unique_tracks
+        self._seq = 0
+
+    def next_event(self) -> tuple[Dict[str, str], Dict[str, Any]]:
+        from sonos_app.routes import compute_sonos_event_signature
+
+        self._seq += 1
+        seq_id = str(self._seq)
+        body = self.bodies[(self._seq - 1) % len(self.bodies)]
+
+        if self.unique_tracks:
+            # defeat the pre-render cache so every event pays the compose cost
+            body = copy.deepcopy(body)
+            track = body.get("currentItem", {}).get("track", {})
+            track["name"] = f"{track.get('name', '')} {seq_id}"
+
+        signature = compute_sonos_event_signature(
+            seq_id,
+            NAMESPACE,
+            EVENT_TYPE,
+            TARGET_TYPE,
+            self.group_id,
+            self.client_id,
+            self.client_secret,
+        )
+
+        headers = {
+            "X-Sonos-Event-Seq-Id": seq_id,
+            "X-Sonos-Namespace": NAMESPACE,
+            "X-Sonos-Type": EVENT_TYPE,
+            "X-Sonos-Target-Type": TARGET_TYPE,
+            "X-Sonos-Target-Value": self.group_id,
+            "X-Sonos-Event-Signature": signature,
+        }
+        return headers, body
+
+
+async def _monitor_loop_lag(lags: List[float], stop: asyncio.Event, interval_s: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_rate(
+    client: httpx.AsyncClient,
+    factory: SignedEventFactory,
+    rate: float,
+    duration_s: float,
+) -> RateResult:
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    lags: List[float] = []
+    errors = 0
+
+    async def fire(headers, body, scheduled_at):
+        nonlocal errors
+        try:
+            resp = await client.post("/sonos/events", headers=headers, json=body)
+            if resp.status_code != 200:
+                errors += 1
+                return
+        except Exception:
+            logger.exception("Request failed")
+            errors += 1
+            return
+
+        latencies.append(loop.time() - scheduled_at)
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lags, stop))
+
+    total = max(1, int(rate * duration_s))
+    start = loop.time()
+    tasks = []
+
+    for i in range(total):
+        scheduled_at = start + i / rate
+        delay = scheduled_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        headers, body = factory.next_event()
+        tasks.append(asyncio.create_task(fire(headers, body, scheduled_at)))
+
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+
+    stop.set()
+    await monitor
+
+    return RateResult(
+        target_rate=rate,
+        sent=total,
+        completed=len(latencies),
+        errors=errors,
+        throughput=len(latencies) / elapsed if elapsed > 0 else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        max_lag_ms=max(lags, default=0.0) * 1000,
+        p99_lag_ms=percentile(lags, 99) * 1000,
+    )
+
+
+def _install_standins(vb_latency_s: float):
+    from sonos_app.routes import app
+
+    # ASGITransport does not run the lifespan, so install the stand-in
+    # container the way startup would.
+    container = build_standin_sonos_container(vb_latency_s=vb_latency_s)
+    app.state.container = container
+    app.state.ready = True
+    app.state.startup_error = None
+
+    return app, container
+
+
+async def run(args) -> List[RateResult]:
+    app, container = _install_standins(args.vb_latency_ms / 1000)
+    factory = SignedEventFactory(
+        load_bodies(Path(args.bodies)),
+        container.config.client_id,
+        container.config.client_secret,
+        unique_tracks=args.unique_tracks,
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    results = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://standin") as client:
+        for rate in args.rates:
+            result = await run_rate(client, factory, rate, args.duration)
+            results.append(result)
+            print(
+                f"rate={result.target_rate:>7.1f}/s sent={result.sent:>6} ok={result.completed:>6} "
+                f"err={result.errors:>4} throughput={result.throughput:>7.1f}/s "
+                f"p50={result.p50_ms:>8.1f}ms p99={result.p99_ms:>8.1f}ms "
+                f"loop_lag_p99={result.p99_lag_ms:>7.1f}ms loop_lag_max={result.max_lag_ms:>7.1f}ms"
+            )
+
+    # the webhook only queues events; let the processor finish the backlog
+    await asyncio.to_thread(container.sonos_event_processor.close)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay signed Sonos events against /sonos/events.")
+    parser.add_argument(
+        "--rates",
+        type=lambda s: [float(r) for r in s.split(",")],
+        default=[10.0, 25.0, 50.0, 100.0],
+        help="Comma-separated events/second to step through",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per rate step")
+    parser.add_argument("--bodies", default=str(FIXTURES_DIR), help="Directory of recorded playbackMetadata JSON bodies")
+    parser.add_argument("--vb-latency-ms", type=float, default=150.0, help="Simulated Vestaboard/VBML call latency")
+    parser.add_argument("--unique-tracks", action="store_true", help="Make every event a new track")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
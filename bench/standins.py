@@ -0,0 +1,217 @@
+"""
+In-process stand-ins for the external services the apps talk to.
+
+They implement just enough of the real clients' interfaces to run the
+pipelines locally, with an injectable latency so load and benchmark runs
+can model a slow upstream.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import BoardConfig, SonosConfig
+from app.container import BoardContainer, SonosContainer
+from redis_data_store import BoardDisplayRecord
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.display_manager import DisplayManager
+from vestaboard.transitions import Transition, TransitionSpeed
+
+BOARD_ROWS = 6
+BOARD_COLS = 22
+
+
+class StandInMessenger:
+    """Mimics VestaboardMessenger without any network calls."""
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.sent: List[Any] = []
+        self.transition = (Transition.CLASSIC, TransitionSpeed.FAST)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+
+    def close(self) -> None:
+        pass
+
+    def get_message(self) -> Dict[str, Any]:
+        self._wait()
+        with self._lock:
+            layout = self.sent[-1] if self.sent else None
+        return {"layout": layout, "id": None, "raw": {}}
+
+    def acquire_send_slot(self) -> None:
+        pass
+
+    def send_message(self, message: str, *, slot_acquired: bool = False, before_attempt=None) -> Dict[str, Any]:
+        if before_attempt is not None:
+            before_attempt()
+        self._wait()
+        with self._lock:
+            self.sent.append(message)
+        return {"status": "ok"}
+
+    def send_layout(self, layout: List[List], *, slot_acquired: bool = False, before_attempt=None) -> Dict[str, Any]:
+        if before_attempt is not None:
+            before_attempt()
+        self._wait()
+        with self._lock:
+            self.sent.append(layout)
+        return {"status": "ok"}
+
+    def get_transition(self) -> Dict[str, Transition | TransitionSpeed]:
+        self._wait()
+        transition, speed = self.transition
+        return {"transition": transition, "transitionSpeed": speed}
+
+    def set_transition(self, transition: Transition, transition_speed: TransitionSpeed, *, before_attempt=None)\
+            -> Tuple[Transition, TransitionSpeed]:
+        if before_attempt is not None:
+            before_attempt()
+        self._wait()
+        self.transition = (transition, transition_speed)
+        return self.transition
+
+    def vbml_format_message(self, message: str) -> List[List]:
+        self._wait()
+        return [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+
+    def vbml_compose_layout(self, payload) -> List[List]:
+        self._wait()
+        return [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+
+
+class InMemoryRecordStore:
+    """Mimics RedisDataStore's current-record hash in process memory."""
+
+    def __init__(self):
+        self._record = BoardDisplayRecord(
+            state=BoardState.UNKNOWN,
+            source="standin",
+            transition=Transition.CLASSIC,
+        )
+        self.history: List[Tuple[Any, str, float]] = []
+        self._lock = threading.Lock()
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+    def get_current_record(self) -> BoardDisplayRecord:
+        with self._lock:
+            return self._record
+
+    def set_current_record(
+        self,
+        message: BoardMessage,
+        transition: Transition,
+        transition_speed: Optional[TransitionSpeed] = None,
+        fencing_token: Optional[int] = None,
+    ):
+        with self._lock:
+            self._record = BoardDisplayRecord(
+                state=message.state,
+                source=message.source,
+                transition=transition,
+                transition_speed=transition_speed,
+                layout=message.layout,
+                template_id=message.template_id,
+                components=message.components,
+                text=message.text,
+                updated_at=time.time(),
+            )
+            return self._record
+
+    def append_history(self, message: BoardMessage, transition: Transition, latency_s: float, sent_at=None):
+        with self._lock:
+            self.history.append((sent_at, message.source, latency_s))
+
+
+class InMemorySonosDataStore:
+    """Mimics PostgresDataStore's token and OAuth-state tables."""
+
+    def __init__(self):
+        self._tokens: Optional[Any] = None
+        self._states: set[str] = set()
+
+    def save_tokens(self, tokens: dict[str, str]):
+        from sonos_app.token import SonosToken
+
+        self._tokens = SonosToken(
+            access_token=tokens["access_token"],
+            refresh_token=tokens.get("refresh_token"),
+            expires_in=tokens.get("expires_in"),
+            scope=tokens.get("scope"),
+        )
+
+    def open(self, timeout_s: float = 10.0):
+        pass
+
+    def close(self):
+        pass
+
+    def load_tokens(self, *, use_cache: bool = True):
+        return self._tokens
+
+    def save_oauth_state(self, state: str):
+        self._states.add(state)
+
+    def consume_oauth_state(self, state: str) -> bool:
+        if state not in self._states:
+            return False
+        self._states.remove(state)
+        return True
+
+
+def build_standin_board_container(*, vb_latency_s: float = 0.0) -> BoardContainer:
+    messenger = StandInMessenger(latency_s=vb_latency_s)
+    record_store = InMemoryRecordStore()
+
+    return BoardContainer(
+        config=BoardConfig(vb_rw_api_key="standin", redis_url="redis://standin"),
+        vestaboard_messenger=messenger,
+        redis_data_store=record_store,
+        display_manager=DisplayManager(messenger=messenger, redis_data_store=record_store),
+    )
+
+
+def build_standin_sonos_container(
+    *,
+    client_id: str = "standin-client",
+    client_secret: str = "standin-secret",
+    vb_latency_s: float = 0.0,
+) -> SonosContainer:
+    from sonos_app.discovery_cache import SonosDiscoveryCache
+    from sonos_app.event_processor import EventProcessor
+    from sonos_app.sonos_oauth_client import SonosOAuthClient
+
+    board = build_standin_board_container(vb_latency_s=vb_latency_s)
+    config = SonosConfig(
+        client_id=client_id,
+        client_secret=client_secret,
+        redirect_uri="http://localhost/oauth/callback",
+        database_url="postgresql://standin",
+    )
+    data_store = InMemorySonosDataStore()
+
+    return SonosContainer(
+        board=board,
+        config=config,
+        sonos_data_store=data_store,
+        sonos_oauth_client=SonosOAuthClient(
+            config.client_id,
+            config.client_secret,
+            config.redirect_uri,
+            data_store=data_store,
+        ),
+        sonos_event_processor=EventProcessor(
+            vestaboard_messenger=board.vestaboard_messenger,
+            display_manager=board.display_manager,
+        ),
+        sonos_discovery_cache=SonosDiscoveryCache(),
+    )
@@ -0,0 +1,326 @@
+"""
+HTTP stand-in for the Vestaboard services VestaboardMessenger talks to.
+
+Serves, on one port:
+  - GET/POST /             cloud Read/Write API (X-Vestaboard-Token)
+  - GET/PUT  /transition   cloud transition settings
+  - POST     /format       VBML format (rendered locally)
+  - POST     /compose      VBML compose (rendered locally)
+  - GET/POST /local-api/message   board Local API (X-Vestaboard-Local-Api-Key)
+
+Latency, 409 on duplicate content, 429 with Retry-After and 5xx responses
+can be injected so retry and backoff paths can be measured:
+
+    python -m bench.vestaboard_server --port 7000 --latency-ms 120 --rate-429 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+
+from vestaboard import vbml
+from vestaboard.transports import CloudTransport, LocalTransport
+
+BOARD_ROWS = 6
+BOARD_COLS = 22
+
+
+@dataclass
+class FaultConfig:
+    latency_s: float = 0.0
+    # reject a post whose layout is already on the board, as the cloud does
+    conflict_on_duplicate: bool = True
+    rate_429: float = 0.0
+    retry_after_s: float = 0.05
+    rate_5xx: float = 0.0
+    seed: Optional[int] = None
+
+
+class VestaboardStandIn:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: str = "standin",
+        local_api_key: str = "standin-local",
+        faults: Optional[FaultConfig] = None,
+    ):
+        self.api_key = api_key
+        self.local_api_key = local_api_key
+        self.faults = faults or FaultConfig()
+        self._random = random.Random(self.faults.seed)
+
+        self.layout: List[List[int]] = [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+        self.message_id: Optional[str] = None
+        self.transition = {"transition": "classic", "transitionSpeed": "fast"}
+        self.requests: List[tuple[str, str, int]] = []
+        self.lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def cloud_transport(self) -> CloudTransport:
+        return CloudTransport(self.api_key, base_url=self.url)
+
+    def local_transport(self) -> LocalTransport:
+        return LocalTransport(self.local_api_key, self.host, port=self.port)
+
+    def messenger(self, *, local: bool = False, **kwargs):
+        """A VestaboardMessenger wired to this stand-in."""
+        from vestaboard.vestaboard import VestaboardMessenger
+
+        kwargs.setdefault("retry_base_delay_s", 0.01)
+        kwargs.setdefault("retry_max_delay_s", 0.1)
+        return VestaboardMessenger(
+            transport=self.local_transport() if local else self.cloud_transport(),
+            vbml_base_url=self.url,
+            **kwargs,
+        )
+
+    def status_counts(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        with self.lock:
+            for _, _, status in self.requests:
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def start(self) -> "VestaboardStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "VestaboardStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self._random.random() < rate
+
+
+def _is_layout(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) == BOARD_ROWS
+        and all(isinstance(row, list) and len(row) == BOARD_COLS for row in value)
+    )
+
+
+def _make_handler(standin: VestaboardStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Any = None, headers: Optional[dict] = None):
+            with standin.lock:
+                standin.requests.append((self.command, self.path, status))
+
+            payload = b"" if body is None else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_json(self) -> Any:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"null")
+
+        def _inject_faults(self) -> bool:
+            faults = standin.faults
+            if faults.latency_s > 0:
+                time.sleep(faults.latency_s)
+
+            if standin._roll(faults.rate_429):
+                self._send_json(
+                    429,
+                    {"error": "rate limited"},
+                    headers={"Retry-After": f"{faults.retry_after_s:g}"},
+                )
+                return True
+
+            if standin._roll(faults.rate_5xx):
+                self._send_json(503, {"error": "unavailable"})
+                return True
+
+            return False
+
+        def _authorized(self, header: str, key: str) -> bool:
+            if self.headers.get(header) == key:
+                return True
+            self._send_json(401, {"error": "unauthorized"})
+            return False
+
+        def _set_layout(self, layout: List[List[int]]) -> bool:
+            with standin.lock:
+                if standin.faults.conflict_on_duplicate and layout == standin.layout:
+                    return False
+                standin.layout = layout
+                standin.message_id = str(uuid.uuid4())
+                return True
+
+        def _cloud_message(self):
+            if not self._authorized(CloudTransport.HEADER_NAME, standin.api_key):
+                return
+
+            if self.command == "GET":
+                with standin.lock:
+                    body = {
+                        "currentMessage": {
+                            "layout": json.dumps(standin.layout),
+                            "id": standin.message_id,
+                        }
+                    }
+                self._send_json(200, body)
+                return
+
+            body = self._read_json()
+            if isinstance(body, dict) and isinstance(body.get("text"), str):
+                layout = vbml.format_message(body["text"])
+            elif _is_layout(body):
+                layout = body
+            else:
+                self._send_json(400, {"error": "expected text or a 6x22 character-code array"})
+                return
+
+            if not self._set_layout(layout):
+                self._send_json(409, {"status": "skipped", "detail": "Message already displayed"})
+                return
+
+            self._send_json(200, {"id": standin.message_id, "created": int(time.time() * 1000)})
+
+        def _transition(self):
+            if not self._authorized(CloudTransport.HEADER_NAME, standin.api_key):
+                return
+
+            if self.command == "PUT":
+                body = self._read_json() or {}
+                with standin.lock:
+                    standin.transition = {
+                        "transition": body.get("transition", standin.transition["transition"]),
+                        "transitionSpeed": body.get("transitionSpeed", standin.transition["transitionSpeed"]),
+                    }
+
+            with standin.lock:
+                body = dict(standin.transition)
+            self._send_json(200, body)
+
+        def _local_message(self):
+            if not self._authorized(LocalTransport.HEADER_NAME, standin.local_api_key):
+                return
+
+            if self.command == "GET":
+                with standin.lock:
+                    body = {"message": standin.layout}
+                self._send_json(200, body)
+                return
+
+            layout = self._read_json()
+            if not _is_layout(layout):
+                self._send_json(400, {"error": "expected a 6x22 character-code array"})
+                return
+
+            self._set_layout(layout)
+            self._send_json(201)
+
+        def _handle(self):
+            routes = {
+                ("GET", "/"): self._cloud_message,
+                ("POST", "/"): self._cloud_message,
+                ("GET", "/transition"): self._transition,
+                ("PUT", "/transition"): self._transition,
+                ("POST", "/format"): lambda: self._send_json(200, vbml.format_message(self._read_json()["message"])),
+                ("POST", "/compose"): lambda: self._send_json(200, vbml.render_payload(self._read_json())),
+                ("GET", "/local-api/message"): self._local_message,
+                ("POST", "/local-api/message"): self._local_message,
+            }
+
+            handler = routes.get((self.command, self.path))
+            if handler is None:
+                self._send_json(404, {"error": "not found"})
+                return
+
+            if self._inject_faults():
+                return
+
+            handler()
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def do_PUT(self):
+            self._handle()
+
+    return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a local Vestaboard stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=LocalTransport.DEFAULT_PORT)
+    parser.add_argument("--api-key", default="standin")
+    parser.add_argument("--local-api-key", default="standin-local")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after-s", type=float, default=0.05)
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--no-conflict", action="store_true", help="Accept duplicate content instead of 409")
+    args = parser.parse_args()
+
+    standin = VestaboardStandIn(
+        host=args.host,
+        port=args.port,
+        api_key=args.api_key,
+        local_api_key=args.local_api_key,
+        faults=FaultConfig(
+            latency_s=args.latency_ms / 1000,
+            conflict_on_duplicate=not args.no_conflict,
+            rate_429=args.rate_429,
+            retry_after_s=args.retry_after_s,
+            rate_5xx=args.rate_5xx,
+        ),
+    )
+    print(f"Vestaboard stand-in listening on {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+"""
+Fetch, parse and render benchmarks for the weather pipeline, served from
+recorded Open-Meteo responses so runs are offline and deterministic.
+
+A small fixture set for the CITY_COORDS locations is checked in under
+bench/fixtures/open_meteo, so the benchmarks run as-is. Its responses are
+synthetic (plausible values in the real FlatBuffers format), not live data.
+To replace them with live responses (hits the API for every location):
+
+    python -m bench.weather_benchmarks --record
+
+then benchmark against them:
+
+    python -m bench.weather_benchmarks --cities 1,10,100 --json weather_bench.json
+
+Larger city counts reuse the recorded coordinates under new names, so the
+parse and format work scales while the fixtures stay small. "fetch" is one
+uncached data-plane request per cell (replay plus FlatBuffers decode);
+"parse" is the projection of each view's fields from it.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, Tuple
+
+import requests
+
+from bench.pipeline_benchmarks import StageTimer
+from weather_app.cities import CITY_COORDS
+from weather_app.recording import RecordingSession, ReplaySession
+from weather_app.run_detailed_weather import DETAILED_SCREEN, detailed_slot_values
+from weather_app.run_weather import CITIES_PER_SCREEN, WEATHER_SCREEN, weather_slot_values
+from weather_app.weather import WeatherClient
+from weather_app.weather_header import WeatherHeader
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "open_meteo")
+
+
+def synthetic_cities(n: int) -> Dict[str, Tuple[float, float]]:
+    recorded = list(CITY_COORDS.items())
+    cities = {}
+    for i in range(n):
+        name, coords = recorded[i % len(recorded)]
+        cities[name if i < len(recorded) else f"{name[:12]} {i}"] = coords
+    return cities
+
+
+def record(directory: str) -> int:
+    client = WeatherClient(api_session=RecordingSession(directory, inner=requests.Session()))
+
+    client.get_current_weather_multi_cities()
+    for city, (lat, lon) in CITY_COORDS.items():
+        client.get_detailed_weather(city, lat, lon)
+
+    recorded = len([name for name in os.listdir(directory) if name.endswith(".json")])
+    print(f"Recorded {recorded} responses to {directory}")
+    return 0
+
+
+def bench_current(client: WeatherClient, cities: Dict[str, Tuple[float, float]], timer: StageTimer) -> None:
+    header = WeatherHeader()
+
+    start = time.perf_counter()
+    readings = {}
+    for city, (lat, lon) in cities.items():
+        t = time.perf_counter()
+        readings[city] = client.data_plane.fetch(client.views.plan_for(lat, lon, client.CURRENT_VIEW)).current
+        timer.samples["fetch"].append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    weather_data = client._project_weather_now(readings)
+    timer.samples["parse"].append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for i in range(0, len(weather_data), CITIES_PER_SCREEN):
+        WEATHER_SCREEN.render(weather_slot_values(weather_data[i:i + CITIES_PER_SCREEN], header))
+    timer.samples["render"].append(time.perf_counter() - t)
+
+    timer.samples["total"].append(time.perf_counter() - start)
+
+
+def bench_detailed(client: WeatherClient, cities: Dict[str, Tuple[float, float]], timer: StageTimer) -> None:
+    header = WeatherHeader()
+
+    start = time.perf_counter()
+    responses = []
+    for city, (lat, lon) in cities.items():
+        t = time.perf_counter()
+        responses.append((city, client.data_plane.fetch(client.views.plan_for(lat, lon, client.DETAILED_VIEW))))
+        timer.samples["fetch"].append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    detailed = [client._project_detailed_weather(data, city) for city, data in responses]
+    timer.samples["parse"].append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for d in detailed:
+        DETAILED_SCREEN.render(detailed_slot_values(d, header))
+    timer.samples["render"].append(time.perf_counter() - t)
+
+    timer.samples["total"].append(time.perf_counter() - start)
+
+
+BENCHMARKS = {
+    "current": bench_current,
+    "detailed": bench_detailed,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the weather pipeline against recorded Open-Meteo responses.")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--record", action="store_true", help="Record fresh fixtures from the live API and exit")
+    parser.add_argument("--cities", default="1,10,100", help="Comma-separated city counts")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the timing summary to this file")
+    args = parser.parse_args()
+
+    if args.record:
+        return record(args.fixtures)
+
+    replay = ReplaySession(args.fixtures)
+    if not len(replay):
+        parser.error(f"No fixtures in {args.fixtures}; run with --record first")
+
+    client = WeatherClient(api_session=replay)
+
+    results: Dict[str, Dict[int, dict]] = {}
+    for name, bench in BENCHMARKS.items():
+        results[name] = {}
+        for n in (int(c) for c in args.cities.split(",")):
+            cities = synthetic_cities(n)
+            timer = StageTimer()
+            for _ in range(args.repeat):
+                bench(client, cities, timer)
+            results[name][n] = timer.summary()
+
+            print(f"\n{name} x{n} cities")
+            for stage, s in results[name][n].items():
+                print(f"  {stage:<7} n={s['n']:>5} mean={s['mean_ms']:>8.3f}ms p95={s['p95_ms']:>8.3f}ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,6 +9,7 @@ class CountdownResult:
     target: datetime
     delta: timedelta
     is_past: bool
+    business_days: Optional[int] = None
 
 
 class CountDown:
@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from countdown_app.countdown import CountdownResult
+
+DEFAULT_TIMEZONE = "America/Los_Angeles"
+
+
+@dataclass(frozen=True)
+class CountdownTarget:
+    name: str
+    when: datetime
+    tz: str = DEFAULT_TIMEZONE
+
+
+def _to_utc_naive(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class CountdownEngine:
+    """
+    Countdown over a large target set held as NumPy arrays.
+
+    Each target's wall-clock time is localized to its own time zone once at
+    construction; after that every query is a single vectorized pass over
+    the whole set.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[CountdownTarget],
+        holidays: Iterable[date] = (),
+    ):
+        self.targets: List[CountdownTarget] = list(targets)
+
+        aware = [
+            t.when if t.when.tzinfo else t.when.replace(tzinfo=ZoneInfo(t.tz))
+            for t in self.targets
+        ]
+        self._aware_targets = aware
+
+        self.names = np.array([t.name for t in self.targets], dtype=object)
+        self.target_utc = np.array(
+            [np.datetime64(_to_utc_naive(dt), "s") for dt in aware],
+            dtype="datetime64[s]",
+        )
+        self.target_local_date = np.array(
+            [np.datetime64(dt.date(), "D") for dt in aware],
+            dtype="datetime64[D]",
+        )
+
+        self.timezones = sorted({t.tz for t in self.targets})
+        tz_index = {tz: i for i, tz in enumerate(self.timezones)}
+        self.tz_idx = np.array([tz_index[t.tz] for t in self.targets], dtype=np.intp)
+
+        self.holidays = np.array(sorted(holidays), dtype="datetime64[D]")
+
+    @classmethod
+    def from_target_dates(
+        cls,
+        target_dates: Dict[str, datetime],
+        default_tz: str = DEFAULT_TIMEZONE,
+        timezones: Optional[Dict[str, str]] = None,
+        holidays: Iterable[date] = (),
+    ) -> "CountdownEngine":
+        timezones = timezones or {}
+        return cls(
+            [
+                CountdownTarget(name=name, when=when, tz=timezones.get(name, default_tz))
+                for name, when in target_dates.items()
+            ],
+            holidays=holidays,
+        )
+
+    @staticmethod
+    def _now_utc(now: Optional[datetime]) -> datetime:
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        return now
+
+    def deltas(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Seconds from now to every target (negative once passed)."""
+        now_utc = np.datetime64(_to_utc_naive(self._now_utc(now)), "s")
+        return (self.target_utc - now_utc).astype(np.int64)
+
+    def business_days(self, now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Business days from today to each target date, both in the target's
+        own time zone, excluding the configured holidays.
+        """
+        now_utc = self._now_utc(now)
+        today_per_tz = np.array(
+            [np.datetime64(now_utc.astimezone(ZoneInfo(tz)).date(), "D") for tz in self.timezones],
+            dtype="datetime64[D]",
+        )
+        today = today_per_tz[self.tz_idx]
+
+        return np.busday_count(today, self.target_local_date, holidays=self.holidays)
+
+    def nearest(
+        self,
+        n: int,
+        now: Optional[datetime] = None,
+    ) -> List[CountdownResult]:
+        """
+        The n nearest targets: upcoming ones soonest first, then passed ones
+        most recent first. A passed target keeps its (negative) delta, and
+        its business days count back to it.
+        """
+        deltas = self.deltas(now)
+        if n <= 0 or deltas.size == 0:
+            return []
+
+        # upcoming before passed, each by distance from now
+        rank = np.where(deltas >= 0, 0, 1)
+        distance = np.abs(deltas)
+
+        candidates = np.arange(deltas.size)
+        if n < deltas.size:
+            # partial sort: only the n nearest are ordered below
+            key = rank * (distance.max() + 1) + distance
+            candidates = np.argpartition(key, n - 1)[:n]
+
+        order = candidates[np.lexsort((distance[candidates], rank[candidates]))]
+        busdays = np.abs(self.business_days(now)[order])
+
+        return [
+            CountdownResult(
+                name=self.names[i],
+                target=self._aware_targets[i],
+                delta=timedelta(seconds=int(deltas[i])),
+                is_past=bool(deltas[i] < 0),
+                business_days=int(b),
+            )
+            for i, b in zip(order, busdays)
+        ]
+
+    def pages(
+        self,
+        n: int,
+        per_page: int,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, CountdownResult]]:
+        """Split the n nearest targets into board-sized pages."""
+        results = self.nearest(n, now)
+
+        return [
+            {r.name: r for r in results[i:i + per_page]}
+            for i in range(0, len(results), per_page)
+        ]
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+from typing import Iterable, List
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth `weekday` (Monday=0) of the month; n=-1 is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    # a Saturday holiday is taken on Friday, a Sunday one on Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def observed_holidays(year: int) -> List[date]:
+    """
+    Days off for `year`: the US federal holidays except Columbus Day, with
+    fixed-date ones moved off weekends. New Year's Day of the next year can
+    be observed on this year's December 31.
+    """
+    days = [
+        _observed(date(year, 1, 1)),
+        _nth_weekday(year, 1, 0, 3),    # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),    # Presidents' Day
+        _nth_weekday(year, 5, 0, -1),   # Memorial Day
+        _observed(date(year, 6, 19)),
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),    # Labor Day
+        _observed(date(year, 11, 11)),
+        _nth_weekday(year, 11, 3, 4),   # Thanksgiving
+        _observed(date(year, 12, 25)),
+    ]
+
+    next_new_year = _observed(date(year + 1, 1, 1))
+    if next_new_year.year == year:
+        days.append(next_new_year)
+
+    return sorted(d for d in days if d.year == year)
+
+
+def holiday_calendar(years: Iterable[int]) -> List[date]:
+    return sorted(day for year in years for day in observed_holidays(year))
@@ -0,0 +1,60 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List
+
+import redis
+
+
+@dataclass(frozen=True)
+class CachedRender:
+    layout: List[List[int]]
+    displayed: bool
+
+
+class CountdownRenderCache:
+    """
+    Caches the composed countdown layout per (target set, local date).
+
+    The day counts only change once per calendar day, so the first run of
+    the day composes the layout and later runs reuse it.
+    """
+
+    KEY_PREFIX = "countdown:render"
+
+    def __init__(self, client: redis.Redis, ttl_s: int = 2 * 86400):
+        self.client = client
+        self.ttl_s = ttl_s
+
+    @staticmethod
+    def target_set_id(target_dates: Dict[str, datetime]) -> str:
+        canonical = json.dumps(
+            sorted((name, dt.isoformat()) for name, dt in target_dates.items())
+        )
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def _key(self, target_set_id: str, local_date: date) -> str:
+        return f"{self.KEY_PREFIX}:{target_set_id}:{local_date.isoformat()}"
+
+    def get(self, target_set_id: str, local_date: date) -> CachedRender | None:
+        data = self.client.hgetall(self._key(target_set_id, local_date))
+
+        if not data or "layout" not in data:
+            return None
+
+        return CachedRender(
+            layout=json.loads(data["layout"]),
+            displayed=data.get("displayed") == "1",
+        )
+
+    def put(self, target_set_id: str, local_date: date, layout: List[List[int]]):
+        key = self._key(target_set_id, local_date)
+
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={"layout": json.dumps(layout), "displayed": "0"})
+        pipe.expire(key, self.ttl_s)
+        pipe.execute()
+
+    def mark_displayed(self, target_set_id: str, local_date: date):
+        self.client.hset(self._key(target_set_id, local_date), "displayed", "1")
@@ -1,12 +1,18 @@
 import logging
 import sys
+from datetime import datetime
+from typing import Dict
+from zoneinfo import ZoneInfo
 
 from app import build_board_container
 from countdown_app.countdown import CountDown
-from countdown_app.targets import TARGET_DATES
+from countdown_app.countdown_engine import CountdownEngine
+from countdown_app.render_cache import CountdownRenderCache
+from countdown_app.targets import TARGET_DATES, TARGET_TIMEZONE, TARGET_TIMEZONES, target_holidays
 from vestaboard import utils
 from vestaboard.board_message import BoardMessage
 from vestaboard.board_state import BoardState
+from vestaboard.templates import Cell, ScreenTemplate
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +24,38 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+SOURCE = "countdown_app"
+
+# two header rows leave four target rows per screen
+TARGETS_PER_PAGE = 4
+MAX_TARGETS = 40
+
+
+COUNTDOWN_SCREEN = ScreenTemplate([
+    [Cell(12, "time until"), Cell(5, "days", justify="right"), Cell(5, "work", justify="right")],
+    [Cell(22, "{63}{64}{65}{66}{67}{68}{63}{64}{65}{66}{67}{68}{63}{64}{65}{66}{67}{68}", justify="center")],
+    *(
+        [
+            Cell(12, slot=f"target.{i}.name"),
+            Cell(5, slot=f"target.{i}.days", justify="right"),
+            Cell(5, slot=f"target.{i}.business_days", justify="right"),
+        ]
+        for i in range(TARGETS_PER_PAGE)
+    ),
+]).compile()
+
+
+def countdown_slot_values(results) -> Dict[str, str]:
+    values = {}
+
+    for i, (description, result) in enumerate(results.items()):
+        values[f"target.{i}.name"] = description
+        values[f"target.{i}.days"] = str(CountDown.breakdown(result.delta)["days"])
+        values[f"target.{i}.business_days"] = "" if result.business_days is None else str(result.business_days)
+
+    return values
+
+
 def run():
     logger.info("Countdown job started")
 
@@ -26,82 +64,57 @@ def run():
         return
 
     container = build_board_container()
-    vb = container.vestaboard_messenger
-    ct = CountDown(TARGET_DATES)
     manager = container.display_manager
 
-    try:
-        results = ct.calculate_date_delta()
-        logger.info("Successfully calculated countdowns (%d targets)", len(results))
-    except Exception:
-        logger.exception("Error calculating countdowns")
-        raise
+    render_cache = CountdownRenderCache(container.redis_data_store.client)
+    target_set_id = render_cache.target_set_id(TARGET_DATES)
+    local_date = datetime.now(ZoneInfo("America/Los_Angeles")).date()
 
-    if not results:
-        logger.warning("No countdown results returned; skipping message send.")
-        return
+    cached = render_cache.get(target_set_id, local_date)
+    shown = manager.shown_record(SOURCE)
 
-    vbml_components = []
+    # a queued send is only marked by the record the worker writes once it's delivered
+    if cached and shown and (cached.displayed or shown.layout == cached.layout):
+        logger.info("Countdown for %s already displayed; nothing to do", local_date)
+        return
 
-    vbml_components.append(
-        utils.compose_vbml_component(
-            "time until",
-            height=1,
-            width=11,
-            justify="left",
-            align="top"
+    if cached:
+        logger.info("Using cached countdown layout for %s", local_date)
+        vbml_layout = cached.layout
+    else:
+        engine = CountdownEngine.from_target_dates(
+            TARGET_DATES,
+            default_tz=TARGET_TIMEZONE,
+            timezones=TARGET_TIMEZONES,
+            holidays=target_holidays(local_date),
         )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            "days",
-            height=1,
-            width=11,
-            justify="right",
-            align="top"
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            "{63}{64}{65}{66}{67}{68}{63}{64}{65}{66}{67}{68}{63}{64}{65}{66}{67}{68}",
-            height=1,
-            width=22,
-            justify="center",
-            align="top"
-        )
-    )
 
+        try:
+            pages = engine.pages(MAX_TARGETS, TARGETS_PER_PAGE)
+            logger.info("Successfully calculated countdowns (%d pages)", len(pages))
+        except Exception:
+            logger.exception("Error calculating countdowns")
+            raise
 
-    for description, result in results.items():
-        description_component = utils.compose_vbml_component(
-            description,
-            height=1,
-            width=16,
-            justify="left",
-            align="top"
-        )
-        vbml_components.append(description_component)
-
-        timedelta_component = utils.compose_vbml_component(
-            str(CountDown.breakdown(result.delta)["days"]),
-            height=1,
-            width=6,
-            justify="right",
-            align="top"
-        )
-        vbml_components.append(timedelta_component)
+        if not pages:
+            logger.warning("No countdown targets; skipping message send.")
+            return
 
-    vbml_payload = utils.compose_vbml_payload(vbml_components)
-    logger.debug("VBML payload prepared")
+        # one page per day, rotating through the set
+        results = pages[local_date.toordinal() % len(pages)]
 
-    vbml_layout = vb.vbml_compose_layout(vbml_payload)
+        vbml_layout = COUNTDOWN_SCREEN.render(countdown_slot_values(results))
+        render_cache.put(target_set_id, local_date, vbml_layout)
 
     try:
-        msg = BoardMessage(BoardState.COUNTDOWN, "countdown_app", layout=vbml_layout)
-        manager.send(msg)
-        logger.info("Countdown message sent successfully")
+        msg = BoardMessage(BoardState.COUNTDOWN, SOURCE, layout=vbml_layout)
+        manager.submit(msg, idempotency_key=f"{SOURCE}:{target_set_id}:{local_date.isoformat()}")
+
+        if manager.send_queue is None:
+            render_cache.mark_displayed(target_set_id, local_date)
+            logger.info("Countdown message sent successfully")
+        else:
+            logger.info("Countdown message queued")
     except Exception:
         logger.exception("Error sending countdown message")
         raise
@@ -1,7 +1,21 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import List, Optional
 
-# max length for description = 16
+from countdown_app.holidays import holiday_calendar
+
+# max length for description = 12; the days and work columns take the rest of the row
 TARGET_DATES = {
     "Retirement": datetime(2029, 12, 7),
     "Final": datetime(2026, 3, 17)
-}
\ No newline at end of file
+}
+
+# target dates are wall-clock times in this zone unless overridden per target
+TARGET_TIMEZONE = "America/Los_Angeles"
+TARGET_TIMEZONES: dict[str, str] = {}
+
+
+def target_holidays(today: Optional[date] = None) -> List[date]:
+    """Days excluded from business-day counts, for every year between today and any target."""
+    today = today or date.today()
+    years = [today.year, *(dt.year for dt in TARGET_DATES.values())]
+    return holiday_calendar(range(min(years), max(years) + 1))
@@ -1,30 +1,30 @@
-import os
 import sys
-import utils
-import weather
 
-from vestaboard import VestaboardMessenger
-from weather import WeatherClient
+from app import build_weather_container
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from weather_app.weather import format_weather_line
+
+SOURCE = "main"
 
 def main() -> int:
     try:
-        vb = VestaboardMessenger()
-        wc = WeatherClient()
+        container = build_weather_container()
+        wc = container.weather_client
+        manager = container.board.display_manager
 
-        w = wc.get_current_weather()
-        message = weather.format_weather_line(w)
+        w = wc.get_current_weather_multi_cities()[0]
+        message = format_weather_line(w)
 
-        try:
-            current = vb.get_message()
-            current_text = (current.get("text") or "").strip()
-        except Exception:
-            current_text = ""
+        # the stored record says what the board shows; no need to ask the board
+        current = manager.load_record()
+        current_text = (current.text or "").strip() if current else ""
 
         if current_text == message.strip():
             print(f"No change. Board already shows: {message}")
             return 0
 
-        vb.send_message(message)
+        manager.send(BoardMessage(state=BoardState.WEATHER, source=SOURCE, text=message))
         print(f"Sent to Vestaboard: {message}")
         return 0
 
@@ -33,4 +33,4 @@ def main() -> int:
         return 1
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
@@ -1,24 +1,125 @@
-from dataclasses import dataclass
+import json
+import statistics
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
 import redis
+from vestaboard.board_lease import LeaseLost
 from vestaboard.board_message import BoardMessage
 from vestaboard.board_state import BoardState
-from vestaboard.transitions import Transition
+from vestaboard.layout_codec import pack_layout, unpack_layout
+from vestaboard.transitions import Transition, TransitionSpeed
+
 
+# Write the record under the next sequence number and publish it. With a
+# fencing token (ARGV[1]) the write is skipped if a later lease holder has
+# written already. ARGV[3] is the record JSON without its closing brace, so
+# the sequence number can be appended as the last field.
+_SET_RECORD_SCRIPT = """
+if ARGV[1] ~= '' then
+    local fence = tonumber(redis.call('HGET', KEYS[1], 'fence'))
+    if fence and fence > tonumber(ARGV[1]) then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'fence', ARGV[1])
+end
+local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('PUBLISH', ARGV[2], ARGV[3] .. ', "seq": ' .. seq .. '}')
+return seq
+"""
 
 @dataclass
 class BoardDisplayRecord:
     state: BoardState
     source: str
     transition: Transition
+    # unknown for records written before speeds were persisted
+    transition_speed: Optional[TransitionSpeed] = None
+    # what was last sent, so template screens can re-render incrementally
+    layout: Optional[List[List[int]]] = None
+    template_id: Optional[str] = None
+    components: Optional[Dict[str, str]] = None
+    # text messages are laid out by the board, so only their text is known
+    text: Optional[str] = None
+    updated_at: Optional[float] = None
+    # board lease fencing token the record was written under, if any
+    fence: Optional[int] = None
+    # Redis-assigned, one higher for every write; orders updates for readers
+    seq: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "source": self.source,
+            "transition": self.transition.value,
+            "transition_speed": self.transition_speed.value if self.transition_speed else None,
+            "layout": self.layout,
+            "template_id": self.template_id,
+            "components": self.components,
+            "text": self.text,
+            "updated_at": self.updated_at,
+            "fence": self.fence,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BoardDisplayRecord":
+        speed = data.get("transition_speed")
+
+        return cls(
+            state=BoardState(data["state"]),
+            source=data["source"],
+            transition=Transition(data["transition"]),
+            transition_speed=TransitionSpeed(speed) if speed else None,
+            layout=data.get("layout"),
+            template_id=data.get("template_id"),
+            components=data.get("components"),
+            text=data.get("text"),
+            updated_at=data.get("updated_at"),
+            fence=data.get("fence"),
+            seq=data.get("seq"),
+        )
+
+@dataclass(frozen=True)
+class DisplayHistoryEntry:
+    entry_id: str
+    sent_at: float
+    source: str
+    state: BoardState
+    transition: str
+    latency_ms: float
+    layout: Optional[List[List[int]]]
+
+@dataclass(frozen=True)
+class SourceStats:
+    source: str
+    sends: int
+    wasted_sends: int
+    latency_p50_ms: float
+    latency_max_ms: float
+    mean_interval_s: Optional[float]
 
 class RedisDataStore:
     KEY = "vestaboard:display:current"
+    HISTORY_KEY = "vestaboard:display:history"
+    HISTORY_MAXLEN = 10_000
+    # every record change is published here as BoardDisplayRecord.to_dict() JSON
+    UPDATES_CHANNEL = "vestaboard:display:updates"
 
     def __init__(self, redis_url):
         self.client = redis.Redis.from_url(
             redis_url,
             decode_responses=True
         )
+        self._set_record = self.client.register_script(_SET_RECORD_SCRIPT)
+
+    def ping(self) -> bool:
+        return bool(self.client.ping())
+
+    def close(self):
+        self.client.close()
 
     def get_current_record(self):
         data = self.client.hgetall(self.KEY)
@@ -26,23 +127,163 @@ class RedisDataStore:
         if not data:
             raise ValueError("No current board state recorded")
 
+        return self.parse_record(data)
+
+    @staticmethod
+    def parse_record(data: Dict[str, str]) -> BoardDisplayRecord:
+        """A BoardDisplayRecord from the fields of the current-record hash."""
+        speed = data.get("transition_speed")
+        layout = data.get("layout")
+        components = data.get("components")
+        updated_at = data.get("updated_at")
+        fence = data.get("fence")
+        seq = data.get("seq")
+
         return BoardDisplayRecord(
             state=BoardState(data["state"]),
             source=data["source"],
-            transition=data["transition"]
+            transition=Transition(data["transition"]),
+            transition_speed=TransitionSpeed(speed) if speed else None,
+            layout=unpack_layout(layout) if layout else None,
+            template_id=data.get("template_id") or None,
+            components=json.loads(components) if components else None,
+            text=data.get("text") or None,
+            updated_at=float(updated_at) if updated_at else None,
+            fence=int(fence) if fence else None,
+            seq=int(seq) if seq else None,
         )
 
-    def set_current_record(self, message: BoardMessage, transition: Transition):
-        self.client.hset(
-            name=self.KEY,
-            mapping={
-                "state": message.state.value,
+    def set_current_record(
+        self,
+        message: BoardMessage,
+        transition: Transition,
+        transition_speed: Optional[TransitionSpeed] = None,
+        fencing_token: Optional[int] = None,
+    ) -> BoardDisplayRecord:
+        """
+        Store what the board now shows and publish it on UPDATES_CHANNEL in
+        the same transaction, so readers never need to ask the board. Each
+        write gets the next `seq`, which readers order updates by.
+
+        With a board lease fencing_token, raises LeaseLost instead of
+        overwriting a record written under a later lease.
+        """
+        record = BoardDisplayRecord(
+            state=message.state,
+            source=message.source,
+            transition=transition,
+            transition_speed=transition_speed,
+            layout=message.layout,
+            template_id=message.template_id,
+            components=message.components,
+            text=message.text,
+            updated_at=time.time(),
+            fence=fencing_token,
+        )
+        mapping = {
+            "state": message.state.value,
+            "source": message.source,
+            "transition": transition.value,
+            # always written, so a text message clears the previous layout
+            "layout": pack_layout(message.layout) if message.layout else b"",
+            "template_id": message.template_id or "",
+            "components": json.dumps(message.components) if message.components is not None else "",
+            "text": message.text or "",
+            "updated_at": repr(record.updated_at),
+        }
+        if transition_speed is not None:
+            mapping["transition_speed"] = transition_speed.value
+
+        # the script appends "seq" as the last field
+        payload = json.dumps({k: v for k, v in record.to_dict().items() if k != "seq"})[:-1]
+        fields = [item for pair in mapping.items() for item in pair]
+
+        seq = int(self._set_record(
+            keys=[self.KEY],
+            args=["" if fencing_token is None else fencing_token, self.UPDATES_CHANNEL, payload, *fields],
+        ))
+        if not seq:
+            raise LeaseLost(f"Board record already written under a later lease than {fencing_token}")
+
+        return replace(record, seq=seq)
+
+    def append_history(
+        self,
+        message: BoardMessage,
+        transition: Transition,
+        latency_s: float,
+        sent_at: Optional[float] = None,
+    ) -> str:
+        """
+        Record a successful send on the capped history stream. Layouts are
+        stored packed (132 bytes); text messages have no layout.
+        """
+        return self.client.xadd(
+            self.HISTORY_KEY,
+            {
+                "ts": repr(sent_at if sent_at is not None else time.time()),
                 "source": message.source,
-                "transition": transition.value
-            }
+                "state": message.state.value,
+                "transition": transition.value,
+                "latency_ms": f"{latency_s * 1000:.3f}",
+                "layout": pack_layout(message.layout) if message.layout else b"",
+            },
+            maxlen=self.HISTORY_MAXLEN,
+            approximate=True,
         )
 
+    def get_recent_history(self, count: int = 50) -> List[DisplayHistoryEntry]:
+        """Most recent sends, newest first."""
+        entries = self.client.xrevrange(self.HISTORY_KEY, count=count)
+
+        return [self._parse_history_entry(entry_id, fields) for entry_id, fields in entries]
+
+    def get_source_stats(self, count: int = 1000) -> Dict[str, SourceStats]:
+        """
+        Per-source send statistics over the last `count` sends. A send is
+        wasted when its layout matches what the board was already showing.
+        """
+        history = list(reversed(self.get_recent_history(count)))
+
+        latencies: Dict[str, List[float]] = {}
+        timestamps: Dict[str, List[float]] = {}
+        wasted: Dict[str, int] = {}
 
+        prev_layout = None
+        for entry in history:
+            latencies.setdefault(entry.source, []).append(entry.latency_ms)
+            timestamps.setdefault(entry.source, []).append(entry.sent_at)
 
+            if entry.layout is not None and entry.layout == prev_layout:
+                wasted[entry.source] = wasted.get(entry.source, 0) + 1
+            prev_layout = entry.layout
 
+        stats = {}
+        for source, source_latencies in latencies.items():
+            ts = timestamps[source]
+            intervals = [b - a for a, b in zip(ts, ts[1:])]
 
+            stats[source] = SourceStats(
+                source=source,
+                sends=len(source_latencies),
+                wasted_sends=wasted.get(source, 0),
+                latency_p50_ms=statistics.median(source_latencies),
+                latency_max_ms=max(source_latencies),
+                mean_interval_s=statistics.fmean(intervals) if intervals else None,
+            )
+
+        return stats
+
+    @staticmethod
+    def _parse_history_entry(entry_id: str, fields: Dict[str, str]) -> DisplayHistoryEntry:
+        layout = fields.get("layout")
+
+        return DisplayHistoryEntry(
+            entry_id=entry_id,
+            sent_at=float(fields["ts"]),
+            source=fields["source"],
+            state=BoardState(fields["state"]),
+            transition=fields["transition"],
+            latency_ms=float(fields["latency_ms"]),
+            layout=unpack_layout(layout) if layout else None,
+        )
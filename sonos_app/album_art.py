@@ -0,0 +1,162 @@
+"""
+Album cover art as a mosaic of Vestaboard colour tiles.
+
+Needs Pillow to decode the image; without it AlbumArtMosaics.available is
+False and the now-playing screen stays text-only.
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from vestaboard import characters
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# approximate RGB of each colour tile; a blank shows as the board's black
+TILE_PALETTE: Tuple[Tuple[int, Tuple[int, int, int]], ...] = (
+    (characters.RED, (206, 44, 48)),
+    (characters.ORANGE, (236, 128, 38)),
+    (characters.YELLOW, (246, 205, 58)),
+    (characters.GREEN, (48, 150, 78)),
+    (characters.BLUE, (34, 108, 196)),
+    (characters.VIOLET, (120, 66, 160)),
+    (characters.WHITE, (236, 236, 236)),
+    (characters.BLANK, (24, 24, 24)),
+)
+
+_TILE_CODES = np.array([code for code, _ in TILE_PALETTE], dtype=np.int64)
+_TILE_RGB = np.array([rgb for _, rgb in TILE_PALETTE], dtype=np.float64)
+
+
+def quantize_to_tiles(rgb: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """
+    Block-average an (H, W, 3) image down to rows x cols and map each cell
+    to the nearest tile colour. Returns a rows x cols array of tile codes.
+    """
+    height, width = rgb.shape[0] // rows * rows, rgb.shape[1] // cols * cols
+    if height == 0 or width == 0:
+        raise ValueError(f"Image smaller than the {rows}x{cols} mosaic")
+
+    # crop to a whole number of blocks, then average each block
+    blocks = rgb[:height, :width, :3].astype(np.float64)
+    cells = blocks.reshape(rows, height // rows, cols, width // cols, 3).mean(axis=(1, 3))
+
+    distances = ((cells[:, :, None, :] - _TILE_RGB[None, None, :, :]) ** 2).sum(axis=-1)
+    return _TILE_CODES[distances.argmin(axis=-1)]
+
+
+class AlbumArtMosaics:
+    """
+    Cover art URL -> tile mosaic, cached at two levels: computed mosaics in
+    an in-memory LRU, and downloaded image bytes in an LRU directory on
+    disk, so a repeated track neither refetches nor recomputes and a
+    restart only recomputes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        rows: int,
+        cols: int,
+        max_memory_entries: int = 128,
+        max_disk_entries: int = 512,
+        timeout_s: float = 5.0,
+        session: Optional[requests.Session] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.rows = rows
+        self.cols = cols
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.timeout_s = timeout_s
+        self.session = session or requests.Session()
+
+        self._mosaics: "OrderedDict[str, List[List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def get(self, url: Optional[str]) -> Optional[List[List[int]]]:
+        """The rows x cols tile codes for `url`, or None if unavailable."""
+        if not url or not self.available:
+            return None
+
+        with self._lock:
+            mosaic = self._mosaics.get(url)
+            if mosaic is not None:
+                self._mosaics.move_to_end(url)
+                return mosaic
+
+        try:
+            data = self._image_bytes(url)
+            with Image.open(io.BytesIO(data)) as image:
+                rgb = np.asarray(image.convert("RGB"))
+            mosaic = quantize_to_tiles(rgb, self.rows, self.cols).tolist()
+        except Exception:
+            logger.exception("Failed to build album art mosaic for %s", url)
+            return None
+
+        with self._lock:
+            self._mosaics[url] = mosaic
+            while len(self._mosaics) > self.max_memory_entries:
+                self._mosaics.popitem(last=False)
+
+        return mosaic
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _image_bytes(self, url: str) -> bytes:
+        path = self._path(url)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # mtime is the LRU clock for the disk cache
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            pass
+
+        response = self.session.get(url, timeout=self.timeout_s)
+        response.raise_for_status()
+        data = response.content
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError:
+            logger.warning("Could not cache album art on disk at %s", self.cache_dir, exc_info=True)
+
+        return data
+
+    def _evict_disk(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                entries.append((entry.stat().st_mtime, entry.path))
+
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_disk_entries, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -1,13 +1,41 @@
 import psycopg
+from psycopg_pool import ConnectionPool
+
 from sonos_app.token import SonosToken
 
 class PostgresDataStore:
-    def __init__(self, db_url, user_key):
+    def __init__(self, db_url, user_key, pool_min_size: int = 1, pool_max_size: int = 4):
         self.db_url = db_url
         self.user_key = user_key
+        self._pool = ConnectionPool(
+            db_url,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            open=False,
+        )
+        self._pool_open = False
+        self._tokens: SonosToken | None = None
+
+    def open(self, timeout_s: float = 10.0):
+        """
+        Open the connection pool and wait until it holds a live connection.
+        Until this is called every query opens its own connection.
+        """
+        self._pool.open(wait=True, timeout=timeout_s)
+        self._pool_open = True
+
+    def close(self):
+        if self._pool_open:
+            self._pool.close()
+            self._pool_open = False
+
+    def _connection(self):
+        if self._pool_open:
+            return self._pool.connection()
+        return psycopg.connect(self.db_url)
 
     def save_tokens(self, tokens: dict[str, str]):
-        with psycopg.connect(self.db_url) as conn:
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -30,8 +58,22 @@ class PostgresDataStore:
                 )
                 conn.commit()
 
-    def load_tokens(self):
-        with psycopg.connect(self.db_url) as conn:
+        self._tokens = SonosToken(
+            access_token=tokens["access_token"],
+            refresh_token=tokens["refresh_token"],
+            expires_in=tokens.get("expires_in"),
+            scope=tokens.get("scope"),
+        )
+
+    def load_tokens(self, *, use_cache: bool = True):
+        """
+        Return the stored tokens. The last loaded or saved tokens are served
+        from memory unless use_cache is False.
+        """
+        if use_cache and self._tokens is not None:
+            return self._tokens
+
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -51,16 +93,17 @@ class PostgresDataStore:
             return None
 
         access_token, refresh_token, expires_in, scope, updated_at = row
-        return SonosToken(
+        self._tokens = SonosToken(
             access_token=access_token,
             refresh_token=refresh_token,
             expires_in=expires_in,
             scope=scope,
             updated_at=updated_at.isoformat() if updated_at else None
         )
+        return self._tokens
 
     def save_oauth_state(self, state: str):
-        with psycopg.connect(self.db_url) as conn:
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -76,7 +119,7 @@ class PostgresDataStore:
         """
         Return True if state existed and was deleted, False otherwise.
         """
-        with psycopg.connect(self.db_url) as conn:
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
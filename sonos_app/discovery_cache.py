@@ -0,0 +1,44 @@
+import asyncio
+import time
+from typing import Any, Dict, Tuple
+
+from sonos_app.sonos_client import SonosClient
+
+
+class SonosDiscoveryCache:
+    """
+    Caches household and group discovery responses, which rarely change,
+    so the discovery endpoints don't round-trip to Sonos on every call.
+    """
+
+    def __init__(self, ttl_s: float = 300.0):
+        self.ttl_s = ttl_s
+        self._entries: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+
+    async def get_households(self, client: SonosClient) -> dict:
+        return await self._get(("households",), client.get_households)
+
+    async def get_groups(self, client: SonosClient, household_id: str) -> dict:
+        return await self._get(
+            ("groups", household_id),
+            lambda: client.get_groups(household_id),
+        )
+
+    async def warm(self, client: SonosClient) -> None:
+        households = await self.get_households(client)
+        await asyncio.gather(*(
+            self.get_groups(client, h["id"])
+            for h in households.get("households", [])
+        ))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _get(self, key: Tuple[str, ...], fetch) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        value = await fetch()
+        self._entries[key] = (time.monotonic() + self.ttl_s, value)
+        return value
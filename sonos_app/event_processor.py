@@ -1,93 +1,222 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from sonos_app.album_art import AlbumArtMosaics
 from sonos_app.playback_metadata import PlaybackMetadata
-from vestaboard import utils
 from vestaboard.board_message import BoardMessage
 from vestaboard.board_state import BoardState
 from vestaboard.display_manager import DisplayManager
+from vestaboard.send_queue import content_key
+from vestaboard.templates import Cell, RenderedScreen, ScreenTemplate
 from vestaboard.vestaboard import VestaboardMessenger
 
+logger = logging.getLogger(__name__)
+
+# (track, artist, album, cover art url when the screen shows it)
+TrackKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+SONOS_SCREEN = ScreenTemplate([
+    [Cell(22, "{66}{67}{68}  NOW PLAYING   {68}{67}{66}", justify="center")],
+    [Cell(22)],
+    [Cell(22, slot="track", justify="center", height=2)],
+    [Cell(22, slot="artist", justify="center")],
+    [Cell(22, slot="album", justify="center")],
+]).compile()
+
+# board cells are taller than wide, so a square cover spans more columns than rows
+ART_ROWS = 6
+ART_COLS = 8
+TEXT_COLS = 22 - ART_COLS
+# art slots, named by their first row, grouped to line up with the text rows
+ART_ROW_GROUPS = ((0,), (1,), (2, 3), (4,), (5,))
+
+SONOS_ART_SCREEN = ScreenTemplate([
+    [Cell(ART_COLS, slot="art.0"), Cell(TEXT_COLS, "NOW PLAYING", justify="center")],
+    [Cell(ART_COLS, slot="art.1"), Cell(TEXT_COLS)],
+    [Cell(ART_COLS, slot="art.2", height=2), Cell(TEXT_COLS, slot="track", justify="center", height=2)],
+    [Cell(ART_COLS, slot="art.4"), Cell(TEXT_COLS, slot="artist", justify="center")],
+    [Cell(ART_COLS, slot="art.5"), Cell(TEXT_COLS, slot="album", justify="center")],
+]).compile()
+
+
+def art_slot_values(mosaic: List[List[int]]) -> Dict[str, str]:
+    """Template values for an ART_ROWS x ART_COLS mosaic of tile codes."""
+    def encode(row: List[int]) -> str:
+        return "".join(f"{{{code}}}" for code in row)
+
+    return {
+        f"art.{group[0]}": "\n".join(encode(mosaic[r]) for r in group)
+        for group in ART_ROW_GROUPS
+    }
+
 
 class EventProcessor:
+    # a queued now-playing screen is useless once the track has moved on
+    QUEUED_SEND_TTL_S = 120.0
+
     def __init__(
         self,
         vestaboard_messenger: VestaboardMessenger,
         display_manager: DisplayManager,
+        prerender_ttl_s: float = 900.0,
+        album_art: Optional[AlbumArtMosaics] = None,
     ):
         self.vb_messenger = vestaboard_messenger
         self.manager = display_manager
+        self.prerender_ttl_s = prerender_ttl_s
+
+        if album_art is not None and not album_art.available:
+            logger.warning("Album art mode needs Pillow; showing text-only now-playing screens")
+            album_art = None
+        self.album_art = album_art
+
+        # track key -> (expires_at monotonic, rendered screen)
+        self._layout_cache: Dict[TrackKey, Tuple[float, RenderedScreen]] = {}
+        # the last screen submitted; the next track only re-renders the lines that differ
+        self._last_screen: Optional[RenderedScreen] = None
+        # guards the two above; pre-renders run on the background worker
+        self._lock = threading.Lock()
+        # one worker, so events are rendered and sent in the order they arrived
+        self._events = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sonos-events")
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sonos-prerender")
+
+    def close(self):
+        self._events.shutdown(wait=True)
+        # pending pre-renders are only speculative
+        self._background.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, metadata: PlaybackMetadata) -> Future:
+        """
+        Queue an event for process_metadata behind any earlier ones. Callers
+        needn't wait on the future; a failure is logged when it lands.
+        """
+        future = self._events.submit(self.process_metadata, metadata)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Sonos event processing failed", exc_info=future.exception())
 
     def process_metadata(self, metadata: PlaybackMetadata):
         if not self._is_relevant_metadata(metadata):
             return
 
-        vbml_components = []
-        headers = self.compose_header_components()
-        for h in headers:
-            vbml_components.append(h)
+        # cached by URL, so a repeated track neither refetches nor recomputes
+        mosaic = self.album_art.get(metadata.image_url) if self.album_art is not None else None
+        image_url = metadata.image_url if mosaic is not None else None
+
+        key = self._track_key(metadata.track_name, metadata.artist_name, metadata.album_name, image_url)
+        screen = self._get_cached_layout(key)
+
+        if screen is None:
+            screen = self._render_layout(
+                metadata.track_name,
+                metadata.artist_name,
+                metadata.album_name,
+                mosaic,
+            )
+            self._cache_layout(key, screen)
+        else:
+            logger.info("Using pre-rendered layout for track=%s", metadata.track_name)
+
+        msg = BoardMessage.from_screen(BoardState.SONOS, "sonos_app", screen)
+        self.manager.submit(msg, ttl_s=self.QUEUED_SEND_TTL_S, idempotency_key=content_key(msg))
+        with self._lock:
+            self._last_screen = screen
+
+        # off the event's critical path; the next track event finds it cached
+        self._background.submit(self._prerender_next, metadata)
+
+    def _prerender_next(self, metadata: PlaybackMetadata):
+        """
+        Speculatively render the layout for the upcoming track so the matching
+        track-change event can be sent without rendering.
+        """
+        # with album art the next track's cover isn't known until it starts
+        if not metadata.next_track_name or self.album_art is not None:
+            return
 
-        metas = self.compose_metadata_component(metadata)
-        for m in metas:
-            vbml_components.append(m)
+        key = self._track_key(
+            metadata.next_track_name,
+            metadata.next_artist_name,
+            metadata.next_album_name,
+        )
+        if self._get_cached_layout(key) is not None:
+            return
 
-        vbml_payload = utils.compose_vbml_payload(vbml_components)
+        try:
+            layout = self._render_layout(
+                metadata.next_track_name,
+                metadata.next_artist_name,
+                metadata.next_album_name,
+            )
+        except Exception:
+            logger.exception("Failed to pre-render next track=%s", metadata.next_track_name)
+            return
 
-        vbml_layout = self.vb_messenger.vbml_compose_layout(vbml_payload)
+        self._cache_layout(key, layout)
+        logger.info("Pre-rendered layout for next track=%s", metadata.next_track_name)
 
-        msg = BoardMessage(BoardState.SONOS, "sonos_app", layout=vbml_layout)
-        self.manager.send(msg)
+    def _render_layout(
+        self,
+        track_name: Optional[str],
+        artist_name: Optional[str],
+        album_name: Optional[str],
+        mosaic: Optional[List[List[int]]] = None,
+    ) -> RenderedScreen:
+        values = {"track": track_name, "artist": artist_name, "album": album_name}
+        with self._lock:
+            previous = self._last_screen
 
-    @staticmethod
-    def _is_relevant_metadata(metadata: PlaybackMetadata):
-        return bool(
-            metadata and
-            metadata.group_id and
-            metadata.track_name
-        )
+        if mosaic is None:
+            return SONOS_SCREEN.render_screen(values, previous=previous)
 
-    @staticmethod
-    def compose_header_components():
-        top_comp = utils.compose_vbml_component(
-            template="{66}{67}{68}  NOW PLAYING   {68}{67}{66}",
-            height=1,
-            width=22,
-            justify="center",
-            align="top"
-        )
+        return SONOS_ART_SCREEN.render_screen({**values, **art_slot_values(mosaic)}, previous=previous)
 
-        placeholder = utils.compose_vbml_component(
-            template="",
-            height=1,
-            width=22,
-            justify="center",
-            align="top"
-        )
-        return [top_comp, placeholder]
+    def _get_cached_layout(self, key: TrackKey) -> Optional[RenderedScreen]:
+        with self._lock:
+            self._evict_expired()
 
-    @staticmethod
-    def compose_metadata_component(metadata: PlaybackMetadata):
-        track_name_comp = utils.compose_vbml_component(
-            template=metadata.track_name,
-            height=2,
-            width=22,
-            justify="center",
-            align="top"
-        )
+            entry = self._layout_cache.get(key)
+            if entry is None:
+                return None
 
-        artist_comp = utils.compose_vbml_component(
-            template=metadata.artist_name,
-            height=1,
-            width=22,
-            justify="center",
-            align="top"
-        )
+            return entry[1]
 
-        album_comp = utils.compose_vbml_component(
-            template=metadata.album_name,
-            height=1,
-            width=22,
-            justify="center",
-            align="top"
-        )
+    def _cache_layout(self, key: TrackKey, screen: RenderedScreen):
+        with self._lock:
+            self._layout_cache[key] = (time.monotonic() + self.prerender_ttl_s, screen)
 
-        return [track_name_comp, artist_comp, album_comp]
+    def _evict_expired(self):
+        # callers hold self._lock
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._layout_cache.items() if expires_at <= now]
+        for k in expired:
+            del self._layout_cache[k]
 
+    @staticmethod
+    def _track_key(
+        track_name: Optional[str],
+        artist_name: Optional[str],
+        album_name: Optional[str],
+        image_url: Optional[str] = None,
+    ) -> TrackKey:
+        return (
+            track_name.strip() if track_name else None,
+            artist_name.strip() if artist_name else None,
+            album_name.strip() if album_name else None,
+            image_url,
+        )
 
+    @staticmethod
+    def _is_relevant_metadata(metadata: PlaybackMetadata):
+        return bool(
+            metadata and
+            metadata.group_id and
+            metadata.track_name
+        )
@@ -20,6 +20,7 @@ class PlaybackMetadata:
     image_url: Optional[str]
     next_track_name: Optional[str]
     next_artist_name: Optional[str]
+    next_album_name: Optional[str]
     raw_namespace: Optional[str]
     raw_type: Optional[str]
 
@@ -67,7 +68,7 @@ def parse_playback_metadata(headers: Mapping[str, str], body: Mapping[str, Any])
       - provider/service (Spotify/Apple Music/etc.)
       - playlist/container name + type + objectId
       - current track: name, artist, album, objectId, duration, image
-      - next track: name, artist
+      - next track: name, artist, album
       - group_id from Sonos event headers (target-value)
     """
     h = _lower_keys(headers)
@@ -95,6 +96,7 @@ def parse_playback_metadata(headers: Mapping[str, str], body: Mapping[str, Any])
     # Next track
     next_track_name = _get(body, "nextItem", "track", "name")
     next_artist_name = _get(body, "nextItem", "track", "artist", "name")
+    next_album_name = _get(body, "nextItem", "track", "album", "name")
 
     # Choose best image url: track -> container -> fallbacks in images
     track = _get(body, "currentItem", "track")
@@ -128,6 +130,7 @@ def parse_playback_metadata(headers: Mapping[str, str], body: Mapping[str, Any])
         image_url=image_url,
         next_track_name=next_track_name if isinstance(next_track_name, str) else None,
         next_artist_name=next_artist_name if isinstance(next_artist_name, str) else None,
+        next_album_name=next_album_name if isinstance(next_album_name, str) else None,
         raw_namespace=raw_namespace,
         raw_type=raw_type,
     )
\ No newline at end of file
@@ -1,11 +1,15 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import RedirectResponse, PlainTextResponse, JSONResponse
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import RedirectResponse, PlainTextResponse, JSONResponse, StreamingResponse
+from dataclasses import asdict
+import asyncio
 import base64
 import hashlib
 
-from app import build_sonos_container
+from app import SonosContainer, build_sonos_container, close_sonos_container
 from sonos_app.sonos_client import SonosClient
 from sonos_app.playback_metadata import parse_playback_metadata
+from vestaboard.board_feed import BoardFeed
 
 import logging
 
@@ -15,55 +19,188 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+STARTUP_RETRY_BASE_DELAY_S = 0.5
+STARTUP_RETRY_MAX_DELAY_S = 10.0
 
 
-container = build_sonos_container()
-oauth_client = container.sonos_oauth_client
-db_client = container.sonos_data_store
-event_processor = container.sonos_event_processor
-sonos_config = container.config
+async def _connect_container() -> SonosContainer:
+    """
+    Build the container and open its Redis and Postgres pools concurrently.
+    """
+    container = await asyncio.to_thread(build_sonos_container)
+
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(container.board.redis_data_store.ping),
+            asyncio.to_thread(container.sonos_data_store.open),
+        )
+    except BaseException:
+        await asyncio.to_thread(close_sonos_container, container)
+        raise
+
+    return container
+
+
+async def _warm_caches(container: SonosContainer) -> None:
+    db_client = container.sonos_data_store
+
+    try:
+        tokens = await asyncio.to_thread(db_client.load_tokens, use_cache=False)
+        if not tokens:
+            logger.info("[STARTUP] No Sonos tokens stored yet; skipping discovery warm-up")
+            return
+
+        client = SonosClient(tokens, db_client, container.sonos_oauth_client)
+        await container.sonos_discovery_cache.warm(client)
+    except Exception:
+        # Caches fill lazily on first use; a failed warm-up is not fatal.
+        logger.exception("[STARTUP] Cache warm-up failed")
+
+
+async def _initialize(app: FastAPI) -> None:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            container = await _connect_container()
+            break
+        except Exception as e:
+            delay = min(
+                STARTUP_RETRY_MAX_DELAY_S,
+                STARTUP_RETRY_BASE_DELAY_S * (2 ** (attempt - 1)),
+            )
+            app.state.startup_error = str(e)
+            logger.warning(
+                "[STARTUP] Dependencies unavailable (attempt %d): %s. Retrying in %.1fs",
+                attempt, e, delay,
+            )
+            await asyncio.sleep(delay)
+
+    app.state.container = container
+    app.state.board_feed = BoardFeed(container.board.config.redis_url)
+    await _warm_caches(container)
+
+    app.state.startup_error = None
+    app.state.ready = True
+    logger.info("[STARTUP] Sonos service ready after %d attempt(s)", attempt)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Dependencies come up in the background so uvicorn binds immediately and
+    # a briefly unavailable Redis/Postgres delays readiness instead of
+    # failing the worker.
+    app.state.container = None
+    app.state.board_feed = None
+    app.state.ready = False
+    app.state.startup_error = None
+    init_task = asyncio.create_task(_initialize(app))
+
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        init_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await init_task
+
+        if app.state.board_feed is not None:
+            await app.state.board_feed.close()
+            app.state.board_feed = None
+
+        if app.state.container is not None:
+            await asyncio.to_thread(close_sonos_container, app.state.container)
+            app.state.container = None
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def get_container(request: Request) -> SonosContainer:
+    container = getattr(request.app.state, "container", None)
+    if container is None or not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Service is starting up")
+    return container
+
 
 @app.get("/health")
 def health():
     return {"ok": True}
 
+@app.get("/ready")
+def ready(request: Request):
+    if getattr(request.app.state, "ready", False):
+        return {"ready": True}
+
+    return JSONResponse(
+        {"ready": False, "error": getattr(request.app.state, "startup_error", None)},
+        status_code=503,
+    )
+
+@app.get("/board/state")
+async def board_state(request: Request, container: SonosContainer = Depends(get_container)):
+    record = await request.app.state.board_feed.current()
+    if record is None:
+        raise HTTPException(status_code=404, detail="No board state recorded yet")
+
+    return record.to_dict()
+
+@app.get("/board/stream")
+async def board_stream(request: Request, container: SonosContainer = Depends(get_container)):
+    return StreamingResponse(
+        request.app.state.board_feed.events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/board/lease")
+async def board_lease(container: SonosContainer = Depends(get_container)):
+    lease = container.board.display_manager.lease
+    if lease is None:
+        return {"enabled": False}
+
+    stats = await asyncio.to_thread(lease.stats)
+    return {"enabled": True, **asdict(stats), "contention_ratio": stats.contention_ratio}
+
 @app.get("/oauth/start")
-def oauth_start():
-    return RedirectResponse(oauth_client.get_oauth_url())
+def oauth_start(container: SonosContainer = Depends(get_container)):
+    return RedirectResponse(container.sonos_oauth_client.get_oauth_url())
 
 
 @app.get("/oauth/callback")
-async def oauth_callback(code: str, state: str):
+async def oauth_callback(code: str, state: str, container: SonosContainer = Depends(get_container)):
     logger.info(
         "[OAUTH CALLBACK] Received state=%s",
         state,
     )
-    tokens = await oauth_client.oauth_callback(code, state)
+    tokens = await container.sonos_oauth_client.oauth_callback(code, state)
 
-    db_client.save_tokens(tokens)
+    container.sonos_data_store.save_tokens(tokens)
+    container.sonos_discovery_cache.clear()
 
     return PlainTextResponse("Authorization successful. Close this tab.")
 
 @app.get("/sonos/households")
-async def sonos_households():
+async def sonos_households(container: SonosContainer = Depends(get_container)):
+    db_client = container.sonos_data_store
     tokens = db_client.load_tokens()
 
-    client = SonosClient(tokens, db_client, oauth_client)
+    client = SonosClient(tokens, db_client, container.sonos_oauth_client)
 
-    return await client.get_households()
+    return await container.sonos_discovery_cache.get_households(client)
 
 @app.get("/sonos/groups")
-async def sonos_groups():
+async def sonos_groups(container: SonosContainer = Depends(get_container)):
+    db_client = container.sonos_data_store
     tokens = db_client.load_tokens()
-    client = SonosClient(tokens, db_client, oauth_client)
+    client = SonosClient(tokens, db_client, container.sonos_oauth_client)
 
-    households = await client.get_households()
+    households = await container.sonos_discovery_cache.get_households(client)
     household_id = households["households"][0]["id"]
 
-    return await client.get_groups(household_id)
+    return await container.sonos_discovery_cache.get_groups(client, household_id)
 
-def verify_sonos_event_signature(
+def compute_sonos_event_signature(
     seq_id: str,
     namespace: str,
     typ: str,
@@ -71,8 +208,7 @@ def verify_sonos_event_signature(
     target_value: str,
     client_id: str,
     client_secret: str,
-    signature: str
-) -> bool:
+) -> str:
     sha = hashlib.sha256()
 
     for value in [
@@ -86,10 +222,30 @@ def verify_sonos_event_signature(
     ]:
         sha.update(value.encode("utf-8"))
 
-    return signature == base64.urlsafe_b64encode(sha.digest()).decode("utf-8").rstrip("=")
+    return base64.urlsafe_b64encode(sha.digest()).decode("utf-8").rstrip("=")
+
+def verify_sonos_event_signature(
+    seq_id: str,
+    namespace: str,
+    typ: str,
+    target_type: str,
+    target_value: str,
+    client_id: str,
+    client_secret: str,
+    signature: str
+) -> bool:
+    return signature == compute_sonos_event_signature(
+        seq_id,
+        namespace,
+        typ,
+        target_type,
+        target_value,
+        client_id,
+        client_secret,
+    )
 
 @app.post("/sonos/events")
-async def sonos_events(request: Request):
+async def sonos_events(request: Request, container: SonosContainer = Depends(get_container)):
     headers = request.headers
     seq_id = headers.get("X-Sonos-Event-Seq-Id")
     namespace = headers.get("X-Sonos-Namespace")
@@ -104,26 +260,30 @@ async def sonos_events(request: Request):
         event_type,
         target_type,
         target_value,
-        sonos_config.client_id,
-        sonos_config.client_secret,
+        container.config.client_id,
+        container.config.client_secret,
         signature,
     ):
         raise HTTPException(status_code=401, detail="Invalid Sonos signature")
 
     body = await request.json()
     metadata = parse_playback_metadata(request.headers, body)
-    event_processor.process_metadata(metadata)
+    # a send may wait on the shared rate limiter and may download cover art;
+    # acknowledge once it's queued, and let the processor handle one event at
+    # a time in arrival order (and log any failure)
+    container.sonos_event_processor.submit(metadata)
     print(metadata)
 
     return JSONResponse({"ok": True})
 
 @app.post("/sonos/subscribe/{group_id}")
-async def subscribe_group(group_id: str):
+async def subscribe_group(group_id: str, container: SonosContainer = Depends(get_container)):
+    db_client = container.sonos_data_store
     tokens = db_client.load_tokens()
     if not tokens:
         raise HTTPException(status_code=400, detail="No tokens found. Run /oauth/start first.")
 
-    client = SonosClient(tokens, db_client, oauth_client)
+    client = SonosClient(tokens, db_client, container.sonos_oauth_client)
 
     await client.subscribe_playback_metadata(group_id)
 
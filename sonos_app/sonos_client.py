@@ -51,7 +51,7 @@ class SonosClient:
 
         # Refresh token on 401
         if resp.status_code == 401:
-            latest = self.data_store.load_tokens()
+            latest = self.data_store.load_tokens(use_cache=False)
             if not latest or not latest.refresh_token:
                 raise RuntimeError(
                     "Sonos access token expired and no refresh_token found. Re-auth required."
@@ -105,7 +105,7 @@ class SonosClient:
         resp = await do_post(self.tokens)
 
         if resp.status_code == 401:
-            latest = self.data_store.load_tokens()
+            latest = self.data_store.load_tokens(use_cache=False)
             if not latest or not latest.refresh_token:
                 raise RuntimeError(
                     "Sonos access token expired and no refresh_token found. Re-auth required.")
@@ -0,0 +1,19 @@
+import pytest
+import redis
+
+from redis_data_store import RedisDataStore
+
+
+@pytest.fixture
+def redis_client():
+    """An in-memory Redis; the Lua scripts need fakeredis' lupa support."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def data_store(redis_client, monkeypatch):
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: redis_client)
+    return RedisDataStore("redis://test")
@@ -0,0 +1,91 @@
+import io
+
+import numpy as np
+import pytest
+
+from sonos_app.album_art import TILE_PALETTE, AlbumArtMosaics, quantize_to_tiles
+from vestaboard import characters
+
+RGB = dict(TILE_PALETTE)
+
+
+def test_each_block_maps_to_its_nearest_tile():
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    image[:2, :3] = RGB[characters.RED]
+    image[:2, 3:] = (250, 250, 250)
+    image[2:, :3] = (30, 110, 190)
+    image[2:, 3:] = (0, 0, 0)
+
+    tiles = quantize_to_tiles(image, rows=2, cols=2)
+
+    assert tiles.tolist() == [
+        [characters.RED, characters.WHITE],
+        [characters.BLUE, characters.BLANK],
+    ]
+
+
+def test_blocks_are_averaged_and_the_remainder_cropped():
+    # alternate yellow and red pixels average to orange; the last column is cropped
+    image = np.zeros((2, 3, 3), dtype=np.uint8)
+    image[:, 0] = (255, 200, 40)
+    image[:, 1] = (215, 60, 30)
+    image[:, 2] = RGB[characters.VIOLET]
+
+    assert quantize_to_tiles(image, rows=1, cols=1).tolist() == [[characters.ORANGE]]
+
+
+def test_image_smaller_than_the_mosaic_is_rejected():
+    with pytest.raises(ValueError):
+        quantize_to_tiles(np.zeros((2, 30, 3)), rows=3, cols=22)
+
+
+class CountingSession:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.gets = 0
+
+    def get(self, url, timeout):
+        self.gets += 1
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+def png(color) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (44, 12), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_mosaics_are_cached_in_memory_and_on_disk(tmp_path):
+    session = CountingSession(png(RGB[characters.GREEN]))
+    mosaics = AlbumArtMosaics(str(tmp_path), rows=3, cols=22, session=session)
+
+    first = mosaics.get("https://art.example/cover.png")
+    assert first == [[characters.GREEN] * 22] * 3
+    assert mosaics.get("https://art.example/cover.png") is first
+
+    # a restart recomputes from the disk cache without downloading again
+    restarted = AlbumArtMosaics(str(tmp_path), rows=3, cols=22, session=session)
+    assert restarted.get("https://art.example/cover.png") == first
+    assert session.gets == 1
+
+
+def test_disk_cache_evicts_the_oldest_images(tmp_path):
+    session = CountingSession(png(RGB[characters.GREEN]))
+    mosaics = AlbumArtMosaics(str(tmp_path), rows=3, cols=22, max_disk_entries=2, session=session)
+
+    for n in range(3):
+        mosaics.get(f"https://art.example/{n}.png")
+
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_undecodable_art_gives_no_mosaic(tmp_path):
+    pytest.importorskip("PIL.Image")
+    mosaics = AlbumArtMosaics(str(tmp_path), rows=3, cols=22, session=CountingSession(b"not an image"))
+
+    assert mosaics.get("https://art.example/broken.png") is None
+    assert mosaics.get(None) is None
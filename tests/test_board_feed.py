@@ -0,0 +1,132 @@
+import asyncio
+import dataclasses
+import json
+
+import pytest
+import redis
+import redis.asyncio as redis_async
+
+from redis_data_store import RedisDataStore
+from vestaboard.board_feed import BoardFeed, sse_event
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.transitions import Transition
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    """A sync client for the writer and an asyncio one for the feed, on one server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: sync_client)
+    monkeypatch.setattr(redis_async.Redis, "from_url", lambda *args, **kwargs: async_client)
+
+    return RedisDataStore("redis://test"), BoardFeed("redis://test", keepalive_s=0.05)
+
+
+def write(store: RedisDataStore, text: str, fencing_token=None):
+    return store.set_current_record(
+        BoardMessage(BoardState.WEATHER, "weather_app", text=text),
+        Transition.CLASSIC,
+        fencing_token=fencing_token,
+    )
+
+
+def data(event: str) -> dict:
+    line = next(line for line in event.splitlines() if line.startswith("data: "))
+    return json.loads(line[len("data: "):])
+
+
+async def stream(feed: BoardFeed, during, count: int, keepalives: bool = False):
+    """The first `count` events, running `during` once the stream is open."""
+    async def connected():
+        return False
+
+    events = feed.events(connected)
+    received = [await anext(events)]
+    during()
+    while len(received) < count:
+        event = await asyncio.wait_for(anext(events), 2)
+        if keepalives or not event.startswith(":"):
+            received.append(event)
+    await events.aclose()
+    await feed.close()
+    return received
+
+
+def test_writes_get_increasing_sequence_numbers(clients):
+    store, _ = clients
+
+    first = write(store, "ONE")
+    second = write(store, "TWO", fencing_token=7)
+
+    assert (first.seq, second.seq) == (1, 2)
+    assert store.get_current_record().seq == 2
+    assert store.get_current_record().fence == 7
+
+
+def test_stream_starts_with_the_current_record_then_follows_writes(clients):
+    store, feed = clients
+    write(store, "ONE")
+
+    def writes():
+        write(store, "TWO")
+        write(store, "THREE")
+
+    events = asyncio.run(stream(feed, writes, count=3))
+
+    assert [data(e)["text"] for e in events] == ["ONE", "TWO", "THREE"]
+    assert [data(e)["seq"] for e in events] == [1, 2, 3]
+    assert events[0].startswith("event: board\nid: 1\n")
+
+
+def test_updates_already_covered_are_skipped(clients):
+    store, feed = clients
+    write(store, "ONE")
+    write(store, "TWO")
+
+    def replay_and_write():
+        # an update published before the stream read the record, then a real one
+        stale = {**store.get_current_record().to_dict(), "text": "ONE", "seq": 1}
+        store.client.publish(RedisDataStore.UPDATES_CHANNEL, json.dumps(stale))
+        write(store, "THREE")
+
+    events = asyncio.run(stream(feed, replay_and_write, count=2))
+
+    assert [data(e)["text"] for e in events] == ["TWO", "THREE"]
+
+
+def test_clock_skew_between_writers_does_not_drop_updates(clients, monkeypatch):
+    store, feed = clients
+    write(store, "ONE")
+
+    def lagging_writer():
+        # a writer whose clock is an hour behind still gets the next seq
+        monkeypatch.setattr("redis_data_store.time.time", lambda: 0.0)
+        write(store, "TWO")
+
+    events = asyncio.run(stream(feed, lagging_writer, count=2))
+
+    assert [data(e)["text"] for e in events] == ["ONE", "TWO"]
+
+
+def test_idle_stream_sends_keepalives(clients):
+    store, feed = clients
+    write(store, "ONE")
+
+    events = asyncio.run(stream(feed, lambda: None, count=2, keepalives=True))
+
+    assert events[1] == ": keepalive\n\n"
+
+
+def test_sse_event_without_a_seq_has_no_id(clients):
+    store, _ = clients
+    record = write(store, "ONE")
+
+    event = sse_event(dataclasses.replace(record, seq=None))
+
+    assert event.startswith("event: board\ndata: ")
@@ -0,0 +1,195 @@
+import threading
+
+import pytest
+
+from bench.standins import StandInMessenger
+from vestaboard.board_lease import BoardLease, LeaseLost, LeaseTimeout
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.display_manager import DisplayManager
+from vestaboard.rate_limiter import RateLimitExceeded
+from vestaboard.transitions import Transition
+from vestaboard.vestaboard import VestaboardMessenger
+
+
+@pytest.fixture
+def lease(redis_client):
+    return BoardLease(redis_client, ttl_s=5.0, wait_s=0.2, poll_s=0.01)
+
+
+def message(text: str) -> BoardMessage:
+    return BoardMessage(BoardState.WEATHER, "test", text=text)
+
+
+def test_tokens_increase_across_grants(lease):
+    first = lease.acquire()
+    first.release()
+    second = lease.acquire()
+
+    assert second.token > first.token
+
+
+def test_held_lease_blocks_others_until_released(lease):
+    holder = lease.acquire()
+
+    with pytest.raises(LeaseTimeout):
+        lease.acquire()
+
+    holder.release()
+    assert lease.acquire().token > holder.token
+    assert lease.stats().timeouts == 1
+
+
+def test_waiter_gets_the_lease_when_the_holder_releases(lease):
+    holder = lease.acquire()
+    timer = threading.Timer(0.05, holder.release)
+    timer.start()
+
+    waiter = lease.acquire()
+    timer.join()
+
+    assert waiter.token == holder.token + 1
+    assert lease.stats().contended == 1
+
+
+def test_expired_lease_can_be_taken_and_old_holder_is_lost(redis_client):
+    lease = BoardLease(redis_client, ttl_s=0.05, wait_s=1.0, poll_s=0.01)
+    old = lease.acquire()
+    new = lease.acquire()
+
+    with pytest.raises(LeaseLost):
+        old.renew()
+    # releasing the stale token must not free the new holder's lease
+    old.release()
+    assert redis_client.get(lease.KEY) == str(new.token)
+    assert lease.stats().lost == 1
+
+
+def test_renew_extends_the_lease(redis_client):
+    lease = BoardLease(redis_client, ttl_s=1.0)
+    token = lease.acquire()
+    redis_client.pexpire(lease.KEY, 10)
+
+    token.renew()
+
+    assert redis_client.pttl(lease.KEY) > 500
+
+
+def test_fenced_record_write_rejects_older_token(lease, data_store):
+    older = lease.acquire()
+    older.release()
+    newer = lease.acquire()
+
+    data_store.set_current_record(message("NEW"), Transition.CLASSIC, fencing_token=newer.token)
+    with pytest.raises(LeaseLost):
+        data_store.set_current_record(message("OLD"), Transition.CLASSIC, fencing_token=older.token)
+
+    record = data_store.get_current_record()
+    assert record.text == "NEW"
+    assert record.fence == newer.token
+
+
+def test_send_under_lease_writes_fenced_record_and_releases(lease, data_store, redis_client):
+    data_store.set_current_record(message("START"), Transition.CLASSIC)
+    messenger = StandInMessenger()
+    manager = DisplayManager(messenger=messenger, redis_data_store=data_store, lease=lease)
+
+    manager.send(message("HELLO"))
+
+    record = data_store.get_current_record()
+    assert messenger.sent == ["HELLO"]
+    assert record.text == "HELLO"
+    assert record.fence is not None
+    assert not redis_client.exists(lease.KEY)
+
+
+def test_lost_lease_stops_the_send_and_keeps_the_record(lease, data_store, redis_client):
+    data_store.set_current_record(message("START"), Transition.CLASSIC)
+    messenger = StandInMessenger()
+    manager = DisplayManager(messenger=messenger, redis_data_store=data_store, lease=lease)
+
+    prepared = manager.prepare_transition(BoardState.WEATHER)
+    # the lease expires and another sender takes it before the send
+    redis_client.delete(lease.KEY)
+    other = lease.acquire()
+
+    with pytest.raises(LeaseLost):
+        manager.commit(message("LATE"), prepared)
+
+    assert messenger.sent == []
+    assert data_store.get_current_record().text == "START"
+    assert redis_client.get(lease.KEY) == str(other.token)
+
+
+class SlotlessMessenger(StandInMessenger):
+    """No rate-limit slot comes free; records whether the lease was held while asking."""
+
+    def __init__(self, lease):
+        super().__init__()
+        self.lease = lease
+        self.lease_held = None
+
+    def acquire_send_slot(self) -> None:
+        self.lease_held = bool(self.lease.client.exists(self.lease.KEY))
+        raise RateLimitExceeded("no slot")
+
+
+def test_rate_limit_wait_happens_before_the_lease(lease, data_store, redis_client):
+    data_store.set_current_record(message("START"), Transition.CLASSIC)
+    messenger = SlotlessMessenger(lease)
+    manager = DisplayManager(messenger=messenger, redis_data_store=data_store, lease=lease)
+
+    with pytest.raises(RateLimitExceeded):
+        manager.send(message("HELLO"))
+
+    assert messenger.lease_held is False
+    assert not redis_client.exists(lease.KEY)
+    assert redis_client.get(lease.FENCE_KEY) is None
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"{}"
+
+    def json(self):
+        return {}
+
+    def raise_for_status(self):
+        pass
+
+
+class ScriptedSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return self.responses.pop(0)
+
+
+def test_retry_after_is_honored_in_full(monkeypatch):
+    slept = []
+    monkeypatch.setattr("vestaboard.vestaboard.time.sleep", slept.append)
+    session = ScriptedSession(Response(429, {"Retry-After": "8"}), Response(200))
+    messenger = VestaboardMessenger(api_key="key", session=session, retry_max_delay_s=10.0)
+
+    messenger.send_message("HELLO")
+
+    assert slept == [8.0]
+    assert session.requests == 2
+
+
+def test_retry_after_past_the_cap_is_deferred_not_shortened(monkeypatch):
+    slept = []
+    monkeypatch.setattr("vestaboard.vestaboard.time.sleep", slept.append)
+    session = ScriptedSession(Response(429, {"Retry-After": "45"}), Response(200))
+    messenger = VestaboardMessenger(api_key="key", session=session, retry_max_delay_s=10.0)
+
+    with pytest.raises(RateLimitExceeded):
+        messenger.send_message("HELLO")
+
+    assert slept == []
+    assert session.requests == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from weather_app.cadence import AdaptiveCadence, WeatherObservation
+
+
+@pytest.fixture
+def cadence(redis_client):
+    return AdaptiveCadence(redis_client, "weather", min_interval_s=300.0, max_interval_s=3600.0)
+
+
+def calm(temperature: float = 20.0):
+    return {"KONA": WeatherObservation(temperature=temperature, weather_code=1, precipitation_probability=10.0)}
+
+
+def test_first_run_is_due_and_starts_at_the_minimum(cadence):
+    assert cadence.is_due(now=0.0)
+    assert cadence.observe(calm(), now=0.0) == 300.0
+
+
+def test_calm_runs_stretch_to_the_maximum(cadence):
+    intervals = [cadence.observe(calm(), now=float(i)) for i in range(10)]
+
+    assert intervals[:4] == [300.0, 450.0, 675.0, 1012.5]
+    assert intervals[-1] == 3600.0
+
+
+def test_volatile_run_halves_the_interval(cadence):
+    for i in range(4):
+        cadence.observe(calm(), now=float(i))
+
+    assert cadence.observe(calm(temperature=22.0), now=10.0) == pytest.approx(1012.5 / 2)
+
+
+def test_interval_never_drops_below_the_minimum(cadence):
+    cadence.observe(calm(), now=0.0)
+
+    assert cadence.observe(calm(temperature=30.0), now=1.0) == 300.0
+
+
+def test_middling_change_keeps_the_interval(cadence):
+    cadence.observe(calm(), now=0.0)
+    cadence.observe(calm(), now=1.0)
+
+    # 0.7 of the temperature step: neither calm nor volatile
+    assert cadence.observe(calm(temperature=20.7), now=2.0) == 450.0
+
+
+@pytest.mark.parametrize("change", [
+    WeatherObservation(temperature=20.0, weather_code=61, precipitation_probability=10.0),
+    WeatherObservation(temperature=20.0, weather_code=1, precipitation_probability=30.0),
+])
+def test_weather_code_and_precipitation_changes_are_volatile(cadence, change):
+    assert cadence.volatility({"KONA": change}, calm()) >= 1.0
+
+
+def test_new_cities_do_not_count(cadence):
+    assert cadence.volatility({"HILO": WeatherObservation(temperature=5.0)}, calm()) == 0.0
+
+
+def test_is_due_allows_scheduler_drift(cadence):
+    cadence.observe(calm(), now=1000.0)
+
+    assert not cadence.is_due(now=1000.0 + 300.0 - 31.0)
+    assert cadence.is_due(now=1000.0 + 300.0 - 30.0)
+
+
+def test_state_carries_across_instances(redis_client, cadence):
+    cadence.observe(calm(), now=0.0)
+
+    later = AdaptiveCadence(redis_client, "weather", min_interval_s=300.0, max_interval_s=3600.0)
+    assert later.observe(calm(), now=300.0) == 450.0
+    assert AdaptiveCadence(redis_client, "detailed_weather").is_due(now=0.0)
@@ -0,0 +1,101 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from countdown_app.countdown import CountDown
+from countdown_app.countdown_engine import CountdownEngine
+from countdown_app.render_cache import CountdownRenderCache
+from countdown_app.run_countdown import COUNTDOWN_SCREEN, countdown_slot_values
+
+LA = ZoneInfo("America/Los_Angeles")
+
+TARGETS = {
+    "Retirement": datetime(2029, 12, 7),
+    "Final": datetime(2026, 3, 17),
+    "Launch": datetime(2026, 11, 2, 9, 30),
+    "Kickoff": datetime(2026, 10, 1),
+}
+
+
+# the job runs at 08:00 Pacific, far enough from midnight that a DST shift
+# between now and the target doesn't move the day count
+@pytest.mark.parametrize("now", [
+    datetime(2026, 10, 19, 8, 2),
+    datetime(2026, 3, 16, 8, 0),
+    datetime(2026, 3, 17, 8, 0),
+    datetime(2029, 12, 8, 8, 0),
+])
+def test_day_counts_match_countdown(now):
+    engine = CountdownEngine.from_target_dates(TARGETS, default_tz="America/Los_Angeles")
+    results = engine.nearest(len(TARGETS), now=now.replace(tzinfo=LA))
+
+    expected = CountDown(TARGETS).calculate_date_delta(now)
+
+    assert {r.name for r in results} == set(TARGETS)
+    for result in results:
+        assert result.is_past == expected[result.name].is_past
+        assert CountDown.breakdown(result.delta)["days"] == CountDown.breakdown(expected[result.name].delta)["days"]
+
+
+def test_upcoming_targets_come_before_passed_ones():
+    engine = CountdownEngine.from_target_dates(TARGETS, default_tz="America/Los_Angeles")
+    results = engine.nearest(len(TARGETS), now=datetime(2026, 10, 19, 8, 0, tzinfo=LA))
+
+    assert [r.name for r in results] == ["Launch", "Retirement", "Kickoff", "Final"]
+    assert [r.is_past for r in results] == [False, False, True, True]
+
+
+def test_passed_targets_count_business_days_back():
+    engine = CountdownEngine.from_target_dates(
+        {"Monday": datetime(2026, 10, 12), "Next Monday": datetime(2026, 10, 26)},
+        default_tz="America/Los_Angeles",
+    )
+    results = engine.nearest(2, now=datetime(2026, 10, 19, 8, 0, tzinfo=LA))
+
+    assert [(r.name, r.business_days) for r in results] == [("Next Monday", 5), ("Monday", 5)]
+
+
+def test_nearest_keeps_only_the_n_nearest():
+    engine = CountdownEngine.from_target_dates(TARGETS, default_tz="America/Los_Angeles")
+    results = engine.nearest(2, now=datetime(2026, 10, 19, 8, 0, tzinfo=LA))
+
+    assert [r.name for r in results] == ["Launch", "Retirement"]
+
+
+def test_passed_target_renders_absolute_days():
+    engine = CountdownEngine.from_target_dates({"Final": datetime(2026, 3, 17)}, default_tz="America/Los_Angeles")
+    page = engine.pages(1, 1, now=datetime(2026, 3, 27, 8, 0, tzinfo=LA))[0]
+
+    values = countdown_slot_values(page)
+
+    assert values["target.0.name"] == "Final"
+    assert values["target.0.days"] == "10"
+    assert values["target.0.business_days"] == "8"
+    assert len(COUNTDOWN_SCREEN.render(values)) == 6
+
+
+def test_render_cache_round_trip(redis_client):
+    cache = CountdownRenderCache(redis_client)
+    set_id = cache.target_set_id(TARGETS)
+    today = date(2026, 10, 19)
+    layout = [[1] * 22 for _ in range(6)]
+
+    assert cache.get(set_id, today) is None
+
+    cache.put(set_id, today, layout)
+    cached = cache.get(set_id, today)
+    assert cached.layout == layout
+    assert not cached.displayed
+
+    cache.mark_displayed(set_id, today)
+    assert cache.get(set_id, today).displayed
+    assert cache.get(set_id, date(2026, 10, 20)) is None
+
+
+def test_target_set_id_ignores_order_but_not_dates():
+    reordered = dict(reversed(list(TARGETS.items())))
+    moved = {**TARGETS, "Final": datetime(2026, 3, 18)}
+
+    assert CountdownRenderCache.target_set_id(reordered) == CountdownRenderCache.target_set_id(TARGETS)
+    assert CountdownRenderCache.target_set_id(moved) != CountdownRenderCache.target_set_id(TARGETS)
@@ -0,0 +1,97 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from countdown_app.countdown_engine import CountdownEngine, CountdownTarget
+from countdown_app.holidays import holiday_calendar, observed_holidays
+from countdown_app.run_countdown import countdown_slot_values
+
+LA = ZoneInfo("America/Los_Angeles")
+
+
+def test_observed_holidays_2026():
+    assert observed_holidays(2026) == [
+        date(2026, 1, 1),
+        date(2026, 1, 19),
+        date(2026, 2, 16),
+        date(2026, 5, 25),
+        date(2026, 6, 19),
+        date(2026, 7, 3),     # July 4 is a Saturday
+        date(2026, 9, 7),
+        date(2026, 11, 11),
+        date(2026, 11, 26),
+        date(2026, 12, 25),
+    ]
+
+
+def test_sunday_holidays_move_to_monday():
+    days = observed_holidays(2027)
+
+    assert date(2027, 7, 5) in days
+    assert date(2027, 6, 18) in days     # Juneteenth on a Saturday
+
+
+def test_new_year_on_saturday_is_observed_the_year_before():
+    assert date(2021, 12, 31) in observed_holidays(2021)
+    assert all(d.year == 2022 for d in observed_holidays(2022))
+    assert date(2022, 12, 26) in observed_holidays(2022)
+
+
+def test_holiday_calendar_spans_years_in_order():
+    calendar = holiday_calendar(range(2026, 2028))
+
+    assert calendar == sorted(calendar)
+    assert len(calendar) == 21
+    assert calendar[-1] == date(2027, 12, 31)     # New Year's Day 2028 is a Saturday
+
+
+def test_business_days_skip_weekends_and_holidays():
+    engine = CountdownEngine.from_target_dates(
+        {"Plain": datetime(2026, 10, 26), "Thanksgiving": datetime(2026, 11, 30)},
+        default_tz="America/Los_Angeles",
+        holidays=holiday_calendar([2026]),
+    )
+
+    plain, thanksgiving = engine.business_days(datetime(2026, 11, 23, 8, 0, tzinfo=LA))
+    assert thanksgiving == 4
+    assert plain == -19     # Veterans Day falls in between
+
+    plain, _ = engine.business_days(datetime(2026, 10, 19, 8, 0, tzinfo=LA))
+    assert plain == 5
+
+
+def test_each_target_counts_from_its_own_today():
+    engine = CountdownEngine([
+        CountdownTarget("Home", datetime(2026, 10, 26), tz="America/Los_Angeles"),
+        CountdownTarget("Tokyo", datetime(2026, 10, 26), tz="Asia/Tokyo"),
+    ])
+
+    # Monday evening in LA is already Tuesday in Tokyo
+    now = datetime(2026, 10, 19, 20, 0, tzinfo=LA)
+
+    assert list(engine.business_days(now)) == [5, 4]
+    home, tokyo = engine.deltas(now)
+    assert home - tokyo == 16 * 3600
+
+
+def test_pages_split_nearest_targets():
+    engine = CountdownEngine.from_target_dates({
+        f"T{n}": datetime(2026, 11, 1 + n) for n in range(6)
+    })
+
+    pages = engine.pages(5, 2, now=datetime(2026, 10, 19, tzinfo=LA))
+
+    assert [list(page) for page in pages] == [["T0", "T1"], ["T2", "T3"], ["T4"]]
+
+
+def test_slot_values_per_target():
+    engine = CountdownEngine.from_target_dates(
+        {"Launch": datetime(2026, 11, 2, 9, 30)},
+        holidays=holiday_calendar([2026]),
+    )
+    page = engine.pages(1, 1, now=datetime(2026, 10, 19, 8, 0, tzinfo=LA))[0]
+
+    assert countdown_slot_values(page) == {
+        "target.0.name": "Launch",
+        "target.0.days": "14",
+        "target.0.business_days": "10",
+    }
@@ -0,0 +1,171 @@
+import time
+
+import numpy as np
+import pytest
+
+from weather_app.data_plane import CellPlan, ViewRegistry, WeatherDataPlane, WeatherView, grid_cell
+from weather_app.units import CANONICAL_PARAMS
+
+KONA = (19.64, -155.99)
+# a few hundred metres away, inside the same grid cell
+KONA_PIER = (19.641, -155.994)
+HILO = (19.72, -155.08)
+
+CURRENT = WeatherView("current", {"Kona": KONA}, current=("temperature_2m", "wind_speed_10m"))
+DETAILED = WeatherView(
+    "detailed",
+    {"Kona Pier": KONA_PIER, "Hilo": HILO},
+    current=("temperature_2m", "weather_code"),
+    hourly=("temperature_2m",),
+    daily=("uv_index_max",),
+)
+
+
+class Variable:
+    def __init__(self, value):
+        self.value = value
+
+    def Value(self):
+        return self.value
+
+    def ValuesAsNumpy(self):
+        return np.asarray(self.value, dtype=np.float32)
+
+
+class Block:
+    def __init__(self, start, interval, length):
+        self.start, self.interval, self.length = start, interval, length
+
+    def Time(self):
+        return self.start
+
+    def TimeEnd(self):
+        return self.start + self.interval * self.length
+
+    def Interval(self):
+        return self.interval
+
+    def Variables(self, i):
+        return Variable(np.full(self.length, float(i)))
+
+
+class Response:
+    def __init__(self):
+        hour = int(time.time()) // 3600 * 3600
+        self.hourly = Block(hour, 3600, 24)
+        self.daily = Block(hour, 86400, 2)
+
+    def Current(self):
+        return self
+
+    def Variables(self, i):
+        return Variable(float(i))
+
+    def Hourly(self):
+        return self.hourly
+
+    def Daily(self):
+        return self.daily
+
+    def UtcOffsetSeconds(self):
+        return 0
+
+
+class FakeApi:
+    """Stands in for openmeteo_requests.Client and records each request's params."""
+
+    def __init__(self):
+        self.requests = []
+
+    def weather_api(self, url, params):
+        self.requests.append(params)
+        return [Response()]
+
+
+def plane(api, registry=None, client=None):
+    return WeatherDataPlane(api, "https://example.invalid/v1/forecast", registry or ViewRegistry([CURRENT, DETAILED]), client=client)
+
+
+def test_plan_unions_views_per_cell():
+    plans = ViewRegistry([CURRENT, DETAILED]).plan()
+
+    assert set(plans) == {grid_cell(*KONA), grid_cell(*HILO)}
+    kona = plans[grid_cell(*KONA)]
+    assert kona.current == ("temperature_2m", "weather_code", "wind_speed_10m")
+    assert kona.hourly == ("temperature_2m",)
+    assert kona.daily == ("uv_index_max",)
+    assert plans[grid_cell(*HILO)].current == ("temperature_2m", "weather_code")
+
+
+def test_plan_for_adds_an_unregistered_view():
+    extra = WeatherView("extra", {}, current=("precipitation",))
+
+    plan = ViewRegistry([CURRENT]).plan_for(*KONA, extra)
+
+    assert plan.current == ("precipitation", "temperature_2m", "wind_speed_10m")
+    assert plan.hourly == ()
+
+
+def test_merge_keeps_the_cell():
+    plan = CellPlan("19.64:-155.99", 19.64, -155.99).merge(CURRENT)
+
+    assert (plan.cell, plan.lat, plan.lon) == ("19.64:-155.99", 19.64, -155.99)
+
+
+def test_views_sharing_a_cell_share_one_fetch():
+    api = FakeApi()
+    data_plane = plane(api)
+
+    detailed = data_plane.get(*KONA_PIER, DETAILED)
+    current = data_plane.get(*KONA, CURRENT)
+
+    assert len(api.requests) == 1
+    assert current is detailed
+    assert set(current.current) == {"temperature_2m", "weather_code", "wind_speed_10m"}
+    assert api.requests[0]["hourly"] == ["temperature_2m"]
+    assert api.requests[0]["temperature_unit"] == CANONICAL_PARAMS["temperature_unit"]
+
+
+def test_stale_current_refetches_without_the_series():
+    api = FakeApi()
+    data_plane = plane(api)
+
+    first = data_plane.get(*KONA, DETAILED)
+    again = data_plane.get(*KONA, DETAILED, now=time.time() + 300)
+
+    assert len(api.requests) == 2
+    assert "hourly" not in api.requests[1] and "daily" not in api.requests[1]
+    assert again.forecast is first.forecast
+
+
+def test_stale_series_are_refetched():
+    api = FakeApi()
+    data_plane = plane(api)
+
+    data_plane.get(*KONA, DETAILED)
+    data_plane.get(*KONA, DETAILED, now=time.time() + 3700)
+
+    assert api.requests[1]["daily"] == ["uv_index_max"]
+
+
+def test_cells_are_shared_through_redis(redis_client):
+    api = FakeApi()
+    plane(api, client=redis_client).get(*KONA, DETAILED)
+
+    other = plane(api, client=redis_client).get(*KONA, CURRENT)
+
+    assert len(api.requests) == 1
+    assert other.forecast.hourly["temperature_2m"].shape == (24,)
+    assert redis_client.ttl(f"{WeatherDataPlane.KEY_PREFIX}:{grid_cell(*KONA)}") > 0
+
+
+def test_grid_cell_rounds_to_two_decimals():
+    assert grid_cell(*KONA) == grid_cell(*KONA_PIER) == "19.64:-155.99"
+    assert grid_cell(*HILO) != grid_cell(*KONA)
+
+
+@pytest.mark.parametrize("view", [CURRENT, DETAILED])
+def test_each_view_gets_its_fields(view):
+    data = plane(FakeApi()).get(*HILO, view)
+
+    assert set(view.current) <= data.current.keys()
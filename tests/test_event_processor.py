@@ -0,0 +1,157 @@
+import asyncio
+import dataclasses
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from bench.standins import build_standin_board_container
+from sonos_app.event_processor import EventProcessor
+from sonos_app.playback_metadata import PlaybackMetadata
+
+
+def metadata(track, next_track=None, **fields):
+    base = {field.name: None for field in dataclasses.fields(PlaybackMetadata)}
+    base.update(group_id="group", track_name=track, artist_name="ARTIST", album_name="ALBUM")
+    if next_track is not None:
+        base.update(next_track_name=next_track, next_artist_name="ARTIST", next_album_name="ALBUM")
+    base.update(fields)
+    return PlaybackMetadata(**base)
+
+
+def make_processor():
+    board = build_standin_board_container()
+    return EventProcessor(board.vestaboard_messenger, board.display_manager), board.vestaboard_messenger
+
+
+def test_sends_a_now_playing_layout():
+    processor, messenger = make_processor()
+
+    processor.process_metadata(metadata("SONG"))
+    processor.close()
+
+    assert len(messenger.sent) == 1
+    assert isinstance(messenger.sent[0], list)
+
+
+def test_event_without_track_is_ignored():
+    processor, messenger = make_processor()
+
+    processor.process_metadata(metadata(None))
+    processor.process_metadata(metadata("SONG", group_id=None))
+    processor.close()
+
+    assert messenger.sent == []
+
+
+def test_next_track_is_prerendered_and_reused(monkeypatch):
+    processor, messenger = make_processor()
+
+    processor.process_metadata(metadata("FIRST", next_track="SECOND"))
+    # the pre-render runs on the background worker; wait for it
+    processor._background.submit(lambda: None).result()
+
+    rendered = []
+    original = processor._render_layout
+    monkeypatch.setattr(processor, "_render_layout", lambda *args: rendered.append(args) or original(*args))
+
+    processor.process_metadata(metadata("SECOND"))
+    processor.close()
+
+    assert rendered == []
+    assert len(messenger.sent) == 2
+
+
+def test_prerendered_layout_matches_a_direct_render():
+    processor, messenger = make_processor()
+    processor.process_metadata(metadata("FIRST", next_track="SECOND"))
+    processor._background.submit(lambda: None).result()
+    processor.process_metadata(metadata("SECOND"))
+    processor.close()
+
+    direct, direct_messenger = make_processor()
+    direct.process_metadata(metadata("SECOND"))
+    direct.close()
+
+    assert messenger.sent[-1] == direct_messenger.sent[-1]
+
+
+def test_expired_prerender_is_rendered_again():
+    board = build_standin_board_container()
+    processor = EventProcessor(board.vestaboard_messenger, board.display_manager, prerender_ttl_s=0.0)
+
+    processor.process_metadata(metadata("FIRST", next_track="SECOND"))
+    processor._background.submit(lambda: None).result()
+    processor.close()
+
+    assert processor._get_cached_layout(processor._track_key("SECOND", "ARTIST", "ALBUM")) is None
+
+
+def test_submitted_events_are_processed_in_order(monkeypatch):
+    processor, messenger = make_processor()
+    original = processor.process_metadata
+    seen = []
+
+    def process(event):
+        # the first event is the slowest; a later one must still wait for it
+        if event.track_name == "ONE":
+            time.sleep(0.05)
+        seen.append(event.track_name)
+        original(event)
+
+    monkeypatch.setattr(processor, "process_metadata", process)
+
+    futures = [processor.submit(metadata(track)) for track in ["ONE", "TWO", "THREE"]]
+    for future in futures:
+        future.result(timeout=5)
+    processor.close()
+
+    assert seen == ["ONE", "TWO", "THREE"]
+    assert len(messenger.sent) == 3
+
+
+def test_failed_event_is_logged_without_awaiting(caplog, monkeypatch):
+    processor, messenger = make_processor()
+
+    def fail(metadata):
+        raise RuntimeError("board unreachable")
+
+    monkeypatch.setattr(processor, "process_metadata", fail)
+
+    with caplog.at_level(logging.ERROR, logger="sonos_app.event_processor"):
+        future = processor.submit(metadata("SONG"))
+        processor.close()
+
+    assert isinstance(future.exception(), RuntimeError)
+    assert "Sonos event processing failed" in caplog.text
+
+
+def test_webhook_answers_before_the_send():
+    httpx = pytest.importorskip("httpx")
+    from bench.sonos_events_load import SignedEventFactory, _install_standins, load_bodies
+
+    # a slow board; the webhook must not wait for it
+    app, container = _install_standins(vb_latency_s=0.5)
+    factory = SignedEventFactory(
+        load_bodies(Path(__file__).parent.parent / "bench" / "fixtures" / "playback_metadata"),
+        container.config.client_id,
+        container.config.client_secret,
+    )
+    messenger = container.board.vestaboard_messenger
+
+    async def post():
+        headers, body = factory.next_event()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://standin") as client:
+            start = time.monotonic()
+            response = await client.post("/sonos/events", headers=headers, json=body)
+            return response, time.monotonic() - start
+
+    response, elapsed_s = asyncio.run(post())
+
+    assert response.status_code == 200
+    assert elapsed_s < 0.4
+    assert messenger.sent == []
+
+    container.sonos_event_processor.close()
+    assert len(messenger.sent) == 1
@@ -0,0 +1,98 @@
+import numpy as np
+
+from vestaboard.characters import BLANK
+from vestaboard.flap_planner import (
+    DRUM_SIZE,
+    FLAP_ORDER,
+    fastest_rendering,
+    flap_distances,
+    plan_settle,
+    shifted_renderings,
+)
+from vestaboard.layout_codec import BOARD_COLS, BOARD_ROWS
+
+
+def blank():
+    return [[BLANK] * BOARD_COLS for _ in range(BOARD_ROWS)]
+
+
+def test_distance_is_forward_drum_steps():
+    a, b = int(FLAP_ORDER[1]), int(FLAP_ORDER[4])
+
+    assert flap_distances([[a]], [[b]]).tolist() == [[3]]
+    # going back means going all the way round
+    assert flap_distances([[b]], [[a]]).tolist() == [[DRUM_SIZE - 3]]
+    assert flap_distances([[a]], [[a]]).tolist() == [[0]]
+
+
+def test_distances_broadcast_over_stacks():
+    prev = np.array(blank())
+    candidates = np.stack([prev, prev + 1])
+
+    distances = flap_distances(prev[None], candidates)
+
+    assert distances.shape == (2, BOARD_ROWS, BOARD_COLS)
+    assert distances[0].sum() == 0
+    assert (distances[1] > 0).all()
+
+
+def test_plan_settle_follows_the_slowest_cell():
+    prev, nxt = blank(), blank()
+    nxt[0][0] = int(FLAP_ORDER[2])
+    nxt[5][21] = int(FLAP_ORDER[7])
+
+    plan = plan_settle(prev, nxt)
+
+    assert plan.max_flaps == 7
+    assert plan.total_flaps == 9
+    assert plan.changed_cells == 2
+
+
+def test_plan_settle_of_identical_layouts_is_zero():
+    plan = plan_settle(blank(), blank())
+
+    assert (plan.max_flaps, plan.total_flaps, plan.changed_cells) == (0, 0, 0)
+
+
+def test_shifted_renderings_stay_within_blank_columns():
+    layout = blank()
+    layout[0][0] = 1
+    layout[0][19] = 2
+
+    renderings = shifted_renderings(layout, max_shift=3)
+
+    # two blank columns on the right, none on the left
+    assert len(renderings) == 3
+    assert renderings[0].tolist() == layout
+    for rendering in renderings:
+        assert np.count_nonzero(rendering != BLANK) == 2
+
+
+def test_fastest_rendering_prefers_the_shift_matching_the_board():
+    prev = blank()
+    prev[2][10:15] = [8, 5, 12, 12, 15]
+    layout = blank()
+    layout[2][8:13] = [8, 5, 12, 12, 15]
+
+    assert fastest_rendering(prev, layout, max_shift=2) == prev
+
+
+def test_fastest_rendering_never_settles_slower_than_the_layout():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        prev = rng.integers(0, 70, size=(BOARD_ROWS, BOARD_COLS)).tolist()
+        layout = blank()
+        layout[3][6:14] = rng.integers(1, 37, size=8).tolist()
+
+        chosen = plan_settle(prev, fastest_rendering(prev, layout, max_shift=4))
+        given = plan_settle(prev, layout)
+
+        assert (chosen.max_flaps, chosen.total_flaps) <= (given.max_flaps, given.total_flaps)
+
+
+def test_fastest_rendering_keeps_layout_on_ties_or_without_shift():
+    layout = blank()
+    layout[0][10] = 1
+
+    assert fastest_rendering(blank(), layout, max_shift=3) == layout
+    assert fastest_rendering(blank(), layout, max_shift=0) == layout
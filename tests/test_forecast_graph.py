@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from vestaboard import characters
+from weather_app.forecast_graph import BAR_ROWS, bin_columns, build_forecast_graph, graph_tiles
+from weather_app.forecast_store import ForecastSnapshot
+
+
+def test_bin_columns_averages_when_more_hours_than_columns():
+    np.testing.assert_allclose(bin_columns(np.arange(8.0), columns=4), [0.5, 2.5, 4.5, 6.5])
+
+
+def test_bin_columns_repeats_when_fewer_hours_than_columns():
+    np.testing.assert_allclose(bin_columns([1.0, 2.0], columns=4), [1.0, 1.0, 2.0, 2.0])
+
+
+def test_bin_columns_skips_missing_hours():
+    binned = bin_columns([1.0, np.nan, np.nan, np.nan, 5.0, 7.0], columns=3)
+
+    np.testing.assert_allclose(binned[0], 1.0)
+    assert np.isnan(binned[1])
+    np.testing.assert_allclose(binned[2], 6.0)
+
+
+def test_bin_columns_empty_series_is_all_missing():
+    assert np.isnan(bin_columns([], columns=4)).all()
+
+
+def test_graph_tiles_scale_bars_to_the_window():
+    bars, rain = graph_tiles(np.array([0.0, 5.0, 10.0]), np.array([0.0, 50.0, 90.0]))
+
+    assert bars.shape == (BAR_ROWS, 3)
+    heights = (bars != characters.BLANK).sum(axis=0)
+    # the coldest column still gets a tile, the warmest fills the column
+    assert heights.tolist() == [1, 3, BAR_ROWS]
+    assert rain.tolist() == [characters.BLANK, characters.BLUE, characters.VIOLET]
+
+
+def test_graph_tiles_colour_by_temperature_band():
+    bars, _ = graph_tiles(np.array([-5.0, 35.0]), np.array([0.0, 0.0]))
+
+    assert bars[-1].tolist() == [characters.WHITE, characters.RED]
+
+
+def test_graph_tiles_flat_window_has_minimum_bars():
+    bars, _ = graph_tiles(np.full(4, 12.0), np.zeros(4))
+
+    assert ((bars != characters.BLANK).sum(axis=0) == 1).all()
+
+
+@pytest.mark.parametrize("temps", [np.full(3, np.nan), np.array([])])
+def test_graph_tiles_missing_window_is_blank(temps):
+    bars, rain = graph_tiles(temps, np.full(temps.size, np.nan))
+
+    assert (bars == characters.BLANK).all()
+    assert (rain == characters.BLANK).all()
+
+
+EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+
+def snapshot(temps, rain):
+    hours = len(temps)
+    return ForecastSnapshot(
+        hourly_time=np.arange(hours) * 3600,
+        hourly={
+            "temperature_2m": np.asarray(temps, dtype=np.float64),
+            "precipitation_probability": np.asarray(rain, dtype=np.float64),
+        },
+        daily_time=np.array([]),
+        daily={},
+        utc_offset_s=0,
+        fetched_at=0.0,
+    )
+
+
+def test_build_forecast_graph_summary():
+    forecast = snapshot(np.linspace(0.0, 10.0, 24), np.linspace(0.0, 60.0, 24))
+    graph = build_forecast_graph(forecast, 22, "fahrenheit", now=EPOCH)
+
+    assert graph.hours == 22
+    assert graph.temp_min == pytest.approx(32.0)
+    assert graph.slot_values()["title"] == "NEXT 22H"
+    assert graph.slot_values()["summary"].endswith("F 55%")
+
+
+def test_build_forecast_graph_rejects_a_window_without_temperatures():
+    forecast = snapshot(np.full(24, np.nan), np.full(24, np.nan))
+
+    with pytest.raises(ValueError):
+        build_forecast_graph(forecast, 22, "celsius", now=EPOCH)
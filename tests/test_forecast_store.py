@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from weather_app.forecast_store import ForecastSnapshot
+
+# local midnight on 2026-10-19 for a location seven hours behind UTC
+LOCAL_MIDNIGHT = int(datetime(2026, 10, 19, 7, tzinfo=timezone.utc).timestamp())
+UTC_OFFSET_S = -7 * 3600
+
+
+def snapshot(fetched_at: float = LOCAL_MIDNIGHT) -> ForecastSnapshot:
+    temperatures = np.arange(48, dtype=np.float64)
+    temperatures[23] = np.nan
+
+    return ForecastSnapshot(
+        hourly_time=LOCAL_MIDNIGHT + 3600 * np.arange(48, dtype=np.int64),
+        hourly={"temperature_2m": temperatures},
+        daily_time=LOCAL_MIDNIGHT + 86400 * np.arange(2, dtype=np.int64),
+        daily={"temperature_2m_max": np.array([20.0, 25.0])},
+        utc_offset_s=UTC_OFFSET_S,
+        fetched_at=fetched_at,
+    )
+
+
+def local(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime.fromtimestamp(LOCAL_MIDNIGHT + (day - 19) * 86400 + hour * 3600 + minute * 60, tz=timezone.utc)
+
+
+def test_rest_of_day_max_stops_at_local_midnight():
+    # hours 15..23 today; 23 is missing, and tomorrow's warmer hours don't count
+    assert snapshot().rest_of_day_max("temperature_2m", now=local(19, 15, 30)) == 22.0
+
+
+def test_rest_of_day_max_in_the_last_hour():
+    assert snapshot().rest_of_day_max("temperature_2m", now=local(20, 23, 10)) == 47.0
+
+
+def test_next_hours_include_the_current_hour():
+    forecast = snapshot()
+
+    assert forecast.next_hours_range("temperature_2m", 3, now=local(19, 15, 30)) == (15.0, 17.0)
+    assert list(forecast.next_hours("temperature_2m", 2, now=local(20, 1))) == [25.0, 26.0]
+
+
+def test_today_uses_the_local_day():
+    forecast = snapshot()
+
+    assert forecast.today("temperature_2m_max", now=local(19, 23, 59)) == 20.0
+    assert forecast.today("temperature_2m_max", now=local(20, 0, 1)) == 25.0
+
+
+def test_is_fresh_needs_age_and_coverage():
+    forecast = snapshot()
+    fetched = LOCAL_MIDNIGHT
+
+    assert forecast.is_fresh(3600, now=fetched + 1800)
+    assert not forecast.is_fresh(3600, now=fetched + 3600)
+    # too old for the series to cover the current hour, whatever the max age
+    assert not forecast.is_fresh(10 * 86400, now=fetched + 49 * 3600 + 1)
+
+
+def test_json_round_trip_keeps_missing_values():
+    forecast = snapshot(fetched_at=123.5)
+
+    restored = ForecastSnapshot.from_json(forecast.to_json())
+
+    assert restored.fetched_at == 123.5
+    assert restored.utc_offset_s == UTC_OFFSET_S
+    np.testing.assert_array_equal(restored.hourly_time, forecast.hourly_time)
+    np.testing.assert_array_equal(restored.hourly["temperature_2m"], forecast.hourly["temperature_2m"])
+    assert np.isnan(restored.hourly["temperature_2m"][23])
+    assert restored.today("temperature_2m_max", now=local(19, 12)) == pytest.approx(20.0)
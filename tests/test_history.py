@@ -0,0 +1,74 @@
+import pytest
+
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.layout_codec import LAYOUT_SIZE, pack_layout, unpack_layout
+from vestaboard.transitions import Transition
+
+
+def layout(code: int):
+    return [[code] * 22 for _ in range(6)]
+
+
+def test_pack_round_trips_every_code():
+    original = [[(r * 22 + c) % 72 for c in range(22)] for r in range(6)]
+
+    packed = pack_layout(original)
+
+    assert len(packed) == LAYOUT_SIZE
+    assert unpack_layout(packed) == original
+    # what a decode_responses client hands back
+    assert unpack_layout(packed.decode("latin-1")) == original
+
+
+@pytest.mark.parametrize("bad", [
+    layout(0)[:5],
+    [row[:21] for row in layout(0)],
+    [[128] * 22 for _ in range(6)],
+    [[-1] * 22 for _ in range(6)],
+])
+def test_pack_rejects_malformed_layouts(bad):
+    with pytest.raises(ValueError):
+        pack_layout(bad)
+
+
+def test_unpack_rejects_wrong_length():
+    with pytest.raises(ValueError):
+        unpack_layout(b"\x00" * (LAYOUT_SIZE - 1))
+
+
+def test_history_is_newest_first_with_layouts(data_store):
+    data_store.append_history(BoardMessage(BoardState.WEATHER, "weather_app", layout=layout(1)), Transition.CLASSIC, 0.25, sent_at=100.0)
+    data_store.append_history(BoardMessage(BoardState.SONOS, "sonos_app", text="hello"), Transition.WAVE, 0.5, sent_at=160.0)
+
+    newest, oldest = data_store.get_recent_history()
+
+    assert (newest.source, newest.state, newest.transition) == ("sonos_app", BoardState.SONOS, "wave")
+    assert newest.layout is None
+    assert newest.latency_ms == 500.0
+    assert oldest.layout == layout(1)
+    assert oldest.sent_at == 100.0
+
+
+def test_source_stats_count_wasted_sends_and_intervals(data_store):
+    sends = [
+        ("weather_app", layout(1), 0.1, 0.0),
+        ("weather_app", layout(1), 0.3, 300.0),     # board already showed this
+        ("sonos_app", layout(2), 0.2, 310.0),
+        ("weather_app", layout(1), 0.2, 600.0),     # replaced the sonos screen, so not wasted
+    ]
+    for source, sent_layout, latency_s, sent_at in sends:
+        message = BoardMessage(BoardState.WEATHER, source, layout=sent_layout)
+        data_store.append_history(message, Transition.CLASSIC, latency_s, sent_at=sent_at)
+
+    stats = data_store.get_source_stats()
+
+    weather = stats["weather_app"]
+    assert weather.sends == 3
+    assert weather.wasted_sends == 1
+    assert weather.latency_p50_ms == pytest.approx(200.0)
+    assert weather.latency_max_ms == pytest.approx(300.0)
+    assert weather.mean_interval_s == pytest.approx(300.0)
+
+    assert stats["sonos_app"].sends == 1
+    assert stats["sonos_app"].mean_interval_s is None
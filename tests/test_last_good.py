@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from weather_app.last_good import LastGoodStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # requests_cache puts its sqlite file in the working directory
+    monkeypatch.chdir(tmp_path)
+    weather = pytest.importorskip("weather_app.weather")
+
+    return weather.WeatherClient(
+        last_good_store=LastGoodStore(),
+        stale_max_age_s=60.0,
+        revalidate_wait_s=0.05,
+        revalidate_exit_wait_s=1.0,
+    )
+
+
+def serve(client, fetch, refetch=True):
+    return client._stale_while_revalidate(
+        key="k",
+        fetch=fetch,
+        encode=lambda value: value,
+        decode=lambda payload: payload,
+        refetch=refetch,
+    )
+
+
+def test_without_a_last_good_value_fetches_and_remembers(client):
+    assert serve(client, lambda: "fresh") == ("fresh", False)
+    assert client.last_good_store.get("k")[0] == "fresh"
+
+
+def test_fast_upstream_replaces_the_last_good_value(client):
+    client.last_good_store.put("k", "old")
+
+    assert serve(client, lambda: "new") == ("new", False)
+    assert client.last_good_store.get("k")[0] == "new"
+
+
+def test_slow_upstream_serves_stale_then_lands_in_the_store(client):
+    client.last_good_store.put("k", "old")
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(5)
+        return "new"
+
+    try:
+        assert serve(client, slow_fetch) == ("old", True)
+    finally:
+        release.set()
+
+    client.wait_for_revalidations()
+    assert client.last_good_store.get("k")[0] == "new"
+
+
+def test_failing_upstream_serves_stale(client):
+    client.last_good_store.put("k", "old")
+
+    def failing_fetch():
+        raise ConnectionError("upstream down")
+
+    assert serve(client, failing_fetch) == ("old", True)
+    assert client.last_good_store.get("k")[0] == "old"
+
+
+def test_refetch_false_skips_the_upstream(client):
+    client.last_good_store.put("k", "old")
+
+    def fetch():
+        raise AssertionError("should not be called")
+
+    assert serve(client, fetch, refetch=False) == ("old", False)
+
+
+def test_too_old_a_value_is_a_plain_fetch(client):
+    client.last_good_store.put("k", "old", fetched_at=time.time() - 120)
+
+    def failing_fetch():
+        raise ConnectionError("upstream down")
+
+    with pytest.raises(ConnectionError):
+        serve(client, failing_fetch)
+
+
+def test_exit_wait_is_bounded(client):
+    client.last_good_store.put("k", "old")
+    release = threading.Event()
+
+    try:
+        serve(client, lambda: release.wait(5))
+
+        start = time.monotonic()
+        client.wait_for_revalidations(timeout_s=0.1)
+        assert time.monotonic() - start < 1.0
+    finally:
+        release.set()
+
+
+def test_store_is_shared_through_redis(redis_client):
+    LastGoodStore(redis_client).put("k", {"temp": 12.5}, fetched_at=100.0)
+
+    assert LastGoodStore(redis_client).get("k") == ({"temp": 12.5}, 100.0)
+    assert LastGoodStore(redis_client).get("missing") is None
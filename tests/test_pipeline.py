@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from bench.standins import InMemoryRecordStore, StandInMessenger
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.display_manager import DisplayManager
+from vestaboard.pipeline import Stage, StopPipeline, UpdatePipeline, display_stages
+from vestaboard.send_queue import SendQueue
+
+
+def test_stages_get_their_dependencies_results():
+    result = UpdatePipeline([
+        Stage("a", lambda: 2),
+        Stage("b", lambda: 3),
+        Stage("sum", lambda a, b: a + b, deps=("a", "b")),
+    ]).run()
+
+    assert result.completed
+    assert result.results == {"a": 2, "b": 3, "sum": 5}
+    assert set(result.timings) == {"a", "b", "sum"}
+    assert result.timings["sum"][0] >= max(result.timings["a"][1], result.timings["b"][1])
+
+
+def test_independent_stages_overlap():
+    # each stage waits for the other, so this only finishes if they run together
+    barrier = threading.Barrier(2, timeout=2)
+
+    result = UpdatePipeline([
+        Stage("fetch", barrier.wait),
+        Stage("load_record", barrier.wait),
+    ]).run()
+
+    assert result.completed
+
+
+def test_stop_pipeline_skips_dependents_and_returns_partial_result():
+    calls = []
+
+    def compose(fetch):
+        raise StopPipeline("nothing changed")
+
+    result = UpdatePipeline([
+        Stage("fetch", lambda: "data"),
+        Stage("compose", compose, deps=("fetch",)),
+        Stage("send", lambda compose: calls.append(compose), deps=("compose",)),
+    ]).run()
+
+    assert not result.completed
+    assert result.stopped == "nothing changed"
+    assert result.results == {"fetch": "data"}
+    assert calls == []
+
+
+def test_stop_without_a_reason_names_the_stage():
+    def skip():
+        raise StopPipeline()
+
+    assert UpdatePipeline([Stage("skip", skip)]).run().stopped == "skip"
+
+
+def test_stage_error_is_raised_after_running_stages_finish():
+    started = threading.Event()
+    finished = []
+
+    def slow():
+        started.wait(2)
+        finished.append("slow")
+        return "slow"
+
+    def fail():
+        started.set()
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        UpdatePipeline([
+            Stage("slow", slow),
+            Stage("fail", fail),
+            Stage("send", lambda fail: finished.append("send"), deps=("fail",)),
+        ]).run()
+
+    assert finished == ["slow"]
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([Stage("a", int), Stage("a", int)], "Duplicate"),
+    ([Stage("a", int, deps=("b",))], "unknown"),
+    ([Stage("a", int, deps=("b",)), Stage("b", int, deps=("a",))], "cycle"),
+])
+def test_invalid_graphs_are_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        UpdatePipeline(stages)
+
+
+def layout(code: int):
+    return [[code] * 22 for _ in range(6)]
+
+
+def test_display_stages_send_and_record():
+    messenger = StandInMessenger()
+    store = InMemoryRecordStore()
+    manager = DisplayManager(messenger=messenger, redis_data_store=store)
+
+    message = BoardMessage(BoardState.WEATHER, "weather_app", layout=layout(1))
+    result = UpdatePipeline([
+        Stage("compose", lambda: message),
+        *display_stages(manager, BoardState.WEATHER, content="compose"),
+    ]).run()
+
+    assert result.completed
+    assert messenger.sent == [layout(1)]
+    assert store.get_current_record().layout == layout(1)
+
+
+def test_display_stages_hand_off_to_the_send_queue(redis_client):
+    queue = SendQueue(redis_client)
+    manager = DisplayManager(messenger=StandInMessenger(), redis_data_store=InMemoryRecordStore(), send_queue=queue)
+
+    stages = display_stages(manager, BoardState.WEATHER, content="compose")
+    message = BoardMessage(BoardState.WEATHER, "weather_app", layout=layout(1))
+    UpdatePipeline([Stage("compose", lambda: message), *stages]).run()
+
+    assert [stage.name for stage in stages] == ["commit"]
+    assert redis_client.xlen(queue.STREAM_KEY) == 1
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from vestaboard.rate_limiter import RateLimitExceeded, RedisTokenBucket
+from vestaboard.vestaboard import VestaboardMessenger
+
+
+def test_bucket_allows_capacity_then_refuses(redis_client):
+    bucket = RedisTokenBucket(redis_client, "key", capacity=2, refill_interval_s=3600)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_bucket_is_shared_by_api_key(redis_client):
+    first = RedisTokenBucket(redis_client, "key", refill_interval_s=3600)
+    second = RedisTokenBucket(redis_client, "key", refill_interval_s=3600)
+    other = RedisTokenBucket(redis_client, "other-key", refill_interval_s=3600)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert other.try_acquire()
+
+
+def test_bucket_key_does_not_contain_api_key(redis_client):
+    bucket = RedisTokenBucket(redis_client, "secret-api-key")
+
+    assert "secret-api-key" not in bucket.key
+
+
+def test_acquire_waits_for_refill(redis_client):
+    bucket = RedisTokenBucket(redis_client, "key", refill_interval_s=0.05)
+    assert bucket.try_acquire()
+
+    start = time.monotonic()
+    assert bucket.acquire(timeout_s=1.0)
+    assert time.monotonic() - start < 1.0
+
+
+def test_acquire_gives_up_when_token_arrives_too_late(redis_client):
+    bucket = RedisTokenBucket(redis_client, "key", refill_interval_s=3600)
+    assert bucket.try_acquire()
+
+    start = time.monotonic()
+    assert not bucket.acquire(timeout_s=5.0)
+    # it knows the refill is an hour away and doesn't sleep out the timeout
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.parametrize("kwargs", [{"capacity": 0}, {"refill_interval_s": 0}])
+def test_bucket_rejects_bad_settings(redis_client, kwargs):
+    with pytest.raises(ValueError):
+        RedisTokenBucket(redis_client, "key", **kwargs)
+
+
+def test_messenger_raises_when_no_slot(redis_client):
+    bucket = RedisTokenBucket(redis_client, "key", refill_interval_s=3600)
+    messenger = VestaboardMessenger(api_key="key", rate_limiter=bucket, rate_limit_wait_s=0.1)
+
+    messenger.acquire_send_slot()
+    with pytest.raises(RateLimitExceeded):
+        messenger.acquire_send_slot()
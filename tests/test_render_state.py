@@ -0,0 +1,76 @@
+import pytest
+
+from weather_app.render_state import RenderStateStore, hold_values, layout_digest
+
+THRESHOLDS = {"temperature": 0.5, "wind_speed": 2.0}
+
+
+def test_small_moves_hold_the_rendered_value():
+    held = hold_values(
+        {"KONA.temperature": 20.4, "KONA.wind_speed": 11.0},
+        {"KONA.temperature": 20.0, "KONA.wind_speed": 10.0},
+        THRESHOLDS,
+    )
+
+    assert held == {"KONA.temperature": 20.0, "KONA.wind_speed": 10.0}
+
+
+def test_a_move_of_the_threshold_goes_through():
+    held = hold_values({"KONA.temperature": 20.5}, {"KONA.temperature": 20.0}, THRESHOLDS)
+
+    assert held == {"KONA.temperature": 20.5}
+
+
+def test_reading_hovering_on_a_boundary_does_not_flap():
+    rendered = {"KONA.temperature": 20.4}
+    shown = []
+
+    for reading in [20.6, 20.4, 20.6, 20.5, 20.4]:
+        rendered = hold_values({"KONA.temperature": reading}, rendered, THRESHOLDS)
+        shown.append(round(rendered["KONA.temperature"]))
+
+    assert shown == [20] * 5
+
+
+def test_slow_drift_is_measured_from_the_rendered_value():
+    rendered = {"KONA.temperature": 20.0}
+
+    for reading in [20.2, 20.4]:
+        rendered = hold_values({"KONA.temperature": reading}, rendered, THRESHOLDS)
+        assert rendered["KONA.temperature"] == 20.0
+
+    rendered = hold_values({"KONA.temperature": 20.6}, rendered, THRESHOLDS)
+    assert rendered["KONA.temperature"] == 20.6
+
+
+def test_new_and_unthresholded_values_pass_through():
+    held = hold_values(
+        {"HILO.temperature": 18.1, "KONA.weather_code": 3.0},
+        {"KONA.weather_code": 2.0},
+        THRESHOLDS,
+    )
+
+    assert held == {"HILO.temperature": 18.1, "KONA.weather_code": 3.0}
+
+
+def test_layout_digest_tracks_every_cell():
+    layout = [[0] * 22 for _ in range(6)]
+    changed = [row[:] for row in layout]
+    changed[5][21] = 1
+
+    assert layout_digest(layout) == layout_digest([row[:] for row in layout])
+    assert layout_digest(layout) != layout_digest(changed)
+
+
+def test_store_round_trip_per_job(redis_client):
+    store = RenderStateStore(redis_client, "weather")
+
+    assert store.get() is None
+
+    store.put("abc", {"KONA.temperature": 20.0})
+    state = store.get()
+    assert state.digest == "abc"
+    assert state.values == {"KONA.temperature": 20.0}
+
+    assert RenderStateStore(redis_client, "detailed_weather").get() is None
+    assert redis_client.ttl(store.key) == pytest.approx(86400, abs=5)
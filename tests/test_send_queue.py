@@ -0,0 +1,194 @@
+import pytest
+
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.send_queue import SendQueue, SendQueueWorker, content_key
+
+
+class RecordingManager:
+    """Stands in for DisplayManager.send; fails the texts in `failing` once each."""
+
+    def __init__(self, failing=()):
+        self.sent = []
+        self.failing = set(failing)
+
+    def send(self, message: BoardMessage):
+        if message.text in self.failing:
+            self.failing.discard(message.text)
+            raise RuntimeError(f"send failed for {message.text}")
+        self.sent.append(message.text)
+
+
+def text(value: str, source: str = "test") -> BoardMessage:
+    return BoardMessage(BoardState.WEATHER, source, text=value)
+
+
+@pytest.fixture
+def queue(redis_client):
+    queue = SendQueue(redis_client)
+    queue.ensure_group()
+    return queue
+
+
+def pending(queue: SendQueue) -> int:
+    return queue.client.xpending(queue.STREAM_KEY, queue.GROUP)["pending"]
+
+
+def test_delivers_in_order_and_acks(queue):
+    manager = RecordingManager()
+    worker = SendQueueWorker(queue, manager, "worker-1")
+
+    queue.enqueue(text("A"))
+    queue.enqueue(text("B"))
+    worker.run_once(block_ms=10)
+
+    assert manager.sent == ["A", "B"]
+    assert pending(queue) == 0
+
+
+def test_same_idempotency_key_is_sent_once(queue):
+    manager = RecordingManager()
+    worker = SendQueueWorker(queue, manager, "worker-1")
+
+    message = text("A")
+    queue.enqueue(message, idempotency_key=content_key(message))
+    queue.enqueue(message, idempotency_key=content_key(message))
+    worker.run_once(block_ms=10)
+
+    assert manager.sent == ["A"]
+    assert pending(queue) == 0
+
+
+def test_without_a_key_each_entry_is_its_own(queue):
+    manager = RecordingManager()
+    worker = SendQueueWorker(queue, manager, "worker-1")
+
+    queue.enqueue(text("A"))
+    queue.enqueue(text("A"))
+    worker.run_once(block_ms=10)
+
+    assert manager.sent == ["A", "A"]
+
+
+def test_content_key_depends_on_source_and_content():
+    assert content_key(text("A")) == content_key(text("A"))
+    assert content_key(text("A")) != content_key(text("B"))
+    assert content_key(text("A", source="a")) != content_key(text("A", source="b"))
+
+
+def test_failed_send_is_reclaimed_and_retried(queue):
+    manager = RecordingManager(failing={"A"})
+    worker = SendQueueWorker(queue, manager, "worker-1", min_idle_ms=0)
+
+    queue.enqueue(text("A"))
+    worker.run_once(block_ms=10)
+    assert manager.sent == []
+    assert pending(queue) == 1
+
+    # a second worker takes over the entry the first left pending
+    SendQueueWorker(queue, manager, "worker-2", min_idle_ms=0).run_once(block_ms=10)
+
+    assert manager.sent == ["A"]
+    assert pending(queue) == 0
+
+
+def test_reclaimed_entry_is_dropped_once_a_newer_one_was_sent(queue):
+    manager = RecordingManager(failing={"A"})
+    worker = SendQueueWorker(queue, manager, "worker-1", min_idle_ms=0)
+
+    queue.enqueue(text("A"))
+    queue.enqueue(text("B"))
+    worker.run_once(block_ms=10)
+    assert manager.sent == ["B"]
+
+    worker.run_once(block_ms=10)
+
+    # resending A would replace the newer B on the board
+    assert manager.sent == ["B"]
+    assert pending(queue) == 0
+
+
+def test_entry_claimed_by_another_consumer_stays_pending(queue):
+    manager = RecordingManager()
+    message = text("A")
+    queue.enqueue(message, idempotency_key=content_key(message))
+
+    # another consumer reclaimed the entry and is mid-send
+    assert queue.claim_send(content_key(message), "worker-1") is None
+    SendQueueWorker(queue, manager, "worker-2").run_once(block_ms=10)
+
+    assert manager.sent == []
+    assert pending(queue) == 1
+
+
+def test_claim_is_released_when_the_send_fails(queue):
+    manager = RecordingManager(failing={"A"})
+    message = text("A")
+    key = content_key(message)
+    queue.enqueue(message, idempotency_key=key)
+
+    SendQueueWorker(queue, manager, "worker-1", min_idle_ms=0).run_once(block_ms=10)
+    assert queue.claim_send(key, "worker-2") is None
+    queue.release_claim(key, "worker-2")
+
+    SendQueueWorker(queue, manager, "worker-2", min_idle_ms=0).run_once(block_ms=10)
+    assert manager.sent == ["A"]
+    assert queue.claim_send(key, "worker-3") == SendQueue.SENT
+
+
+def test_release_leaves_other_consumers_claims(queue):
+    assert queue.claim_send("k", "worker-1") is None
+    queue.release_claim("k", "worker-2")
+
+    assert queue.claim_send("k", "worker-2") == "worker-1"
+
+
+def test_mark_delivered_never_moves_back(queue):
+    newer = queue.enqueue(text("A"))
+    queue.mark_delivered(newer)
+    queue.mark_delivered("0-1")
+
+    assert queue.client.get(queue.DELIVERED_KEY) == newer
+
+
+def test_expired_entry_is_dropped(queue):
+    manager = RecordingManager()
+    worker = SendQueueWorker(queue, manager, "worker-1")
+
+    queue.enqueue(text("A"), ttl_s=-1)
+    worker.run_once(block_ms=10)
+
+    assert manager.sent == []
+    assert pending(queue) == 0
+
+
+def test_gives_up_after_max_attempts(queue):
+    manager = RecordingManager(failing={"A"})
+    worker = SendQueueWorker(queue, manager, "worker-1", min_idle_ms=0, max_attempts=1)
+
+    queue.enqueue(text("A"))
+    worker.run_once(block_ms=10)
+    # the reclaim is the second delivery, past max_attempts
+    worker.run_once(block_ms=10)
+
+    assert manager.sent == []
+    assert pending(queue) == 0
+
+
+def test_submit_scopes_the_key_to_the_shown_record(queue):
+    from bench.standins import InMemoryRecordStore, StandInMessenger
+    from vestaboard.display_manager import DisplayManager
+
+    store = InMemoryRecordStore()
+    manager = DisplayManager(messenger=StandInMessenger(), redis_data_store=store, send_queue=queue)
+    message = text("A")
+
+    manager.submit(message, idempotency_key=content_key(message))
+    manager.submit(message, idempotency_key=content_key(message))
+    store.set_current_record(text("B"), store.get_current_record().transition)
+    manager.submit(message, idempotency_key=content_key(message))
+
+    entries = queue.client.xrange(queue.STREAM_KEY)
+    keys = [fields["idempotency_key"] for _, fields in entries]
+    # the same content is a duplicate until the board shows something else
+    assert keys[0] == keys[1] != keys[2]
@@ -0,0 +1,126 @@
+import pytest
+
+from vestaboard.characters import BLANK
+from vestaboard.layout_codec import BOARD_COLS, BOARD_ROWS
+from vestaboard.templates import Cell, ScreenTemplate
+from vestaboard.vbml import render_block
+
+SCREEN = ScreenTemplate([
+    [Cell(11, "time until"), Cell(11, "days", justify="right")],
+    [Cell(16, slot="name"), Cell(6, slot="days", justify="right")],
+    [Cell(22, slot="note", justify="center", height=2)],
+]).compile()
+
+
+def test_render_places_static_text_and_slots():
+    layout = SCREEN.render({"name": "LAUNCH", "days": "12"})
+
+    assert len(layout) == BOARD_ROWS
+    assert all(len(row) == BOARD_COLS for row in layout)
+    assert layout[0][:11] == render_block("time until", 11, 1)[0]
+    assert layout[1][:16] == render_block("LAUNCH", 16, 1)[0]
+    assert layout[1][16:] == render_block("12", 6, 1, justify="right")[0]
+
+
+def test_missing_slots_stay_blank():
+    layout = SCREEN.render({})
+
+    assert layout[1] == [BLANK] * BOARD_COLS
+    assert layout[2] == layout[3] == [BLANK] * BOARD_COLS
+
+
+def test_multi_row_slot_spans_its_rows():
+    layout = SCREEN.render({"note": "A LONG NOTE THAT WRAPS ONTO A SECOND ROW"})
+    block = render_block("A LONG NOTE THAT WRAPS ONTO A SECOND ROW", 22, 2, justify="center")
+
+    assert layout[2:4] == block
+
+
+def test_cells_sharing_a_slot_render_to_their_own_geometry():
+    screen = ScreenTemplate([[Cell(10, slot="a"), Cell(12, slot="a", justify="right")]]).compile()
+
+    row = screen.render({"a": "HI"})[0]
+
+    assert row[:10] == render_block("HI", 10, 1)[0]
+    assert row[10:] == render_block("HI", 12, 1, justify="right")[0]
+
+
+def test_template_too_wide_or_tall_is_rejected():
+    with pytest.raises(ValueError):
+        ScreenTemplate([[Cell(20), Cell(3)]]).compile()
+    with pytest.raises(ValueError):
+        ScreenTemplate([[Cell(22)]] * (BOARD_ROWS + 1)).compile()
+
+
+def test_template_id_follows_geometry():
+    same = ScreenTemplate([
+        [Cell(11, "time until"), Cell(11, "days", justify="right")],
+        [Cell(16, slot="name"), Cell(6, slot="days", justify="right")],
+        [Cell(22, slot="note", justify="center", height=2)],
+    ]).compile()
+    other = ScreenTemplate([[Cell(22, slot="name")]]).compile()
+
+    assert same.template_id == SCREEN.template_id
+    assert other.template_id != SCREEN.template_id
+
+
+VALUE_SEQUENCE = [
+    {"name": "LAUNCH", "days": "12", "note": "GO"},
+    {"name": "LAUNCH", "days": "11", "note": "GO"},
+    {"name": "LANDING", "days": "11", "note": ""},
+    {"name": "LANDING", "days": "9", "note": "A LONG NOTE THAT WRAPS ONTO A SECOND ROW"},
+    {"name": None, "days": "9", "note": "SHORT"},
+    {},
+]
+
+
+def test_incremental_render_matches_full_render():
+    previous = None
+
+    for values in VALUE_SEQUENCE:
+        screen = SCREEN.render_screen(values, previous=previous)
+
+        assert screen.layout == SCREEN.render(values)
+        assert screen.components == SCREEN.components(values)
+        previous = screen
+
+
+def test_incremental_render_only_encodes_changed_slots(monkeypatch):
+    previous = SCREEN.render_screen(VALUE_SEQUENCE[0])
+    encoded = []
+    original = SCREEN._encode
+    monkeypatch.setattr(SCREEN, "_encode", lambda slot, value: encoded.append(slot.name) or original(slot, value))
+
+    SCREEN.render_screen(VALUE_SEQUENCE[1], previous=previous)
+
+    assert encoded == ["days"]
+
+
+def test_previous_screen_of_another_template_is_ignored():
+    other = ScreenTemplate([[Cell(22, slot="name")]]).compile()
+    previous = other.render_screen({"name": "SOMETHING ELSE"})
+
+    screen = SCREEN.render_screen(VALUE_SEQUENCE[0], previous=previous)
+
+    assert screen.layout == SCREEN.render(VALUE_SEQUENCE[0])
+
+
+def test_rendered_screen_from_record():
+    from redis_data_store import BoardDisplayRecord
+    from vestaboard.board_state import BoardState
+    from vestaboard.templates import RenderedScreen
+    from vestaboard.transitions import Transition
+
+    screen = SCREEN.render_screen(VALUE_SEQUENCE[0])
+    record = BoardDisplayRecord(
+        state=BoardState.COUNTDOWN,
+        source="test",
+        transition=Transition.CLASSIC,
+        layout=screen.layout,
+        template_id=screen.template_id,
+        components=screen.components,
+    )
+
+    assert RenderedScreen.from_record(record) == screen
+    assert RenderedScreen.from_record(None) is None
+    assert RenderedScreen.from_record(BoardDisplayRecord(BoardState.COUNTDOWN, "test", Transition.CLASSIC)) is None
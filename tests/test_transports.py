@@ -0,0 +1,77 @@
+import pytest
+
+from bench.vestaboard_server import VestaboardStandIn
+from vestaboard import vbml
+from vestaboard.transitions import Transition, TransitionSpeed
+from vestaboard.transports import CloudTransport, LocalTransport, build_transports
+from vestaboard.vestaboard import VestaboardMessenger
+
+
+@pytest.fixture
+def standin():
+    with VestaboardStandIn() as standin:
+        yield standin
+
+
+def paths(standin):
+    return [(method, path) for method, path, _ in standin.requests]
+
+
+def test_local_primary_formats_text_locally(standin):
+    messenger = standin.messenger(local=True)
+
+    messenger.send_message("HELLO WORLD")
+
+    assert paths(standin) == [("POST", "/local-api/message")]
+    assert standin.layout == vbml.format_message("HELLO WORLD")
+
+
+def test_local_primary_skips_transitions(standin):
+    messenger = VestaboardMessenger(
+        transport=standin.local_transport(),
+        fallback_transport=standin.cloud_transport(),
+    )
+
+    applied = messenger.set_transition(Transition.WAVE, TransitionSpeed.GENTLE)
+
+    assert applied == (Transition.WAVE, TransitionSpeed.GENTLE)
+    assert standin.requests == []
+    with pytest.raises(RuntimeError):
+        messenger.get_transition()
+
+
+def test_cloud_primary_sets_transitions(standin):
+    messenger = standin.messenger()
+
+    applied = messenger.set_transition(Transition.WAVE, TransitionSpeed.GENTLE)
+
+    assert applied == (Transition.WAVE, TransitionSpeed.GENTLE)
+    assert paths(standin) == [("PUT", "/transition")]
+    assert messenger.get_transition()["transition"] == Transition.WAVE
+
+
+def test_unreachable_local_falls_back_to_cloud(standin):
+    # nothing listens on port 9 on the loopback interface
+    unreachable = LocalTransport("key", "127.0.0.1", port=9, timeout_s=0.2, retry_attempts=1)
+    messenger = VestaboardMessenger(transport=unreachable, fallback_transport=standin.cloud_transport())
+    layout = vbml.format_message("FALLBACK")
+
+    messenger.send_layout(layout)
+
+    assert paths(standin) == [("POST", "/")]
+    assert standin.layout == layout
+
+
+def test_build_transports():
+    primary, fallback = build_transports(transport="local", api_key="cloud", local_api_key="local", local_host="board.lan")
+    assert isinstance(primary, LocalTransport) and isinstance(fallback, CloudTransport)
+
+    _, fallback = build_transports(transport="local", api_key="cloud", local_api_key="local", local_host="board.lan", fallback=False)
+    assert fallback is None
+
+    with pytest.raises(ValueError):
+        build_transports(transport="local", api_key="cloud")
+    with pytest.raises(ValueError):
+        build_transports(transport="cloud", api_key=None)
+    with pytest.raises(ValueError):
+        build_transports(transport="bluetooth", api_key="cloud")
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from weather_app.units import (
+    CANONICAL_PARAMS,
+    WIND_UNITS,
+    convert_speed,
+    convert_temperature,
+    temperature_symbol,
+)
+
+
+def test_canonical_params_are_metric():
+    assert CANONICAL_PARAMS == {"temperature_unit": "celsius", "windspeed_unit": "kmh"}
+
+
+@pytest.mark.parametrize("celsius, fahrenheit", [(0.0, 32.0), (100.0, 212.0), (-40.0, -40.0), (21.5, 70.7)])
+def test_celsius_to_fahrenheit(celsius, fahrenheit):
+    assert convert_temperature(celsius, "fahrenheit") == pytest.approx(fahrenheit)
+
+
+def test_temperature_converts_arrays():
+    result = convert_temperature([0.0, 10.0], "fahrenheit")
+
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_allclose(result, [32.0, 50.0])
+    np.testing.assert_allclose(convert_temperature([0.0, 10.0], "celsius"), [0.0, 10.0])
+
+
+@pytest.mark.parametrize("unit, expected", [("kmh", 100.0), ("mph", 62.137), ("ms", 27.778), ("kn", 53.996)])
+def test_speed_from_kmh(unit, expected):
+    assert convert_speed(100.0, unit) == pytest.approx(expected, abs=1e-3)
+
+
+def test_every_wind_unit_converts():
+    for unit in WIND_UNITS:
+        assert convert_speed([0.0, 36.0], unit).shape == (2,)
+
+
+@pytest.mark.parametrize("convert, unit", [(convert_temperature, "kelvin"), (convert_speed, "furlongs")])
+def test_unknown_units_raise(convert, unit):
+    with pytest.raises(ValueError):
+        convert(1.0, unit)
+
+
+def test_temperature_symbol():
+    assert temperature_symbol("celsius") == "C"
+    assert temperature_symbol("fahrenheit") == "F"
+
+
+@pytest.fixture
+def weather(tmp_path, monkeypatch):
+    # requests_cache puts its sqlite file in the working directory
+    monkeypatch.chdir(tmp_path)
+    return pytest.importorskip("weather_app.weather")
+
+
+def test_weather_client_accepts_every_wind_unit(weather):
+
+    for unit in WIND_UNITS:
+        assert weather.WeatherClient(wind_unit=unit).wind_unit == unit
+
+    with pytest.raises(ValueError):
+        weather.WeatherClient(wind_unit="furlongs")
+
+
+def shared_clients(weather, store):
+    metric = weather.WeatherClient(temp_unit="celsius", wind_unit="kmh", last_good_store=store)
+    imperial = weather.WeatherClient(temp_unit="fahrenheit", wind_unit="mph", last_good_store=store)
+    return metric, imperial
+
+
+def test_units_share_one_last_good_copy_of_current_weather(weather, monkeypatch):
+    from weather_app.last_good import LastGoodStore
+
+    store = LastGoodStore()
+    metric, imperial = shared_clients(weather, store)
+    readings = {"KONA": {"temperature_2m": 25.0, "wind_speed_10m": 16.0934, "weather_code": 1.0, "precipitation_probability": 10.0}}
+    monkeypatch.setattr(metric, "_fetch_current_readings", lambda: readings)
+
+    (celsius,) = metric.get_current_weather_multi_cities()
+    (fahrenheit,) = imperial.get_current_weather_multi_cities(refetch=False)
+
+    assert (celsius.temperature, celsius.unit, celsius.wind_speed) == (25.0, "C", 16)
+    assert (fahrenheit.temperature, fahrenheit.unit, fahrenheit.wind_speed) == (pytest.approx(77.0), "F", 10)
+    assert len(store._local) == 1
+
+
+def test_detailed_weather_is_stored_in_celsius(weather, monkeypatch):
+    from weather_app.last_good import LastGoodStore
+
+    store = LastGoodStore()
+    metric, imperial = shared_clients(weather, store)
+    canonical = weather.DetailedWeather(
+        city="KONA", temp_now=20.0, temp_max=30.0, temp_min=10.0, feels_like=0.0,
+        uv_idx=7.0, rain_chance_today=40.0, condition="CLEAR", unit="C",
+    )
+    monkeypatch.setattr(metric, "_fetch_detailed_weather", lambda city, lat, lon: canonical)
+
+    assert metric.get_detailed_weather("KONA", 19.64, -155.99) == canonical
+    served = imperial.get_detailed_weather("KONA", 19.64, -155.99, refetch=False)
+
+    assert (served.temp_now, served.temp_max, served.temp_min, served.feels_like) == (68.0, 86.0, 50.0, 32.0)
+    assert (served.unit, served.uv_idx) == ("F", 7.0)
+    (payload, _), = store._local.values()
+    assert payload["temp_now"] == 20.0
@@ -0,0 +1,76 @@
+"""
+Live board state for readers, served from Redis instead of the Vestaboard API.
+
+Every send stores the current record and publishes it on
+RedisDataStore.UPDATES_CHANNEL in one transaction; BoardFeed turns that into
+server-sent events. A stream subscribes before reading the current record,
+so no update can fall between the two, and skips anything whose Redis-assigned
+seq is not past what it already sent.
+"""
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import redis.asyncio as redis_async
+
+from redis_data_store import BoardDisplayRecord, RedisDataStore
+
+logger = logging.getLogger(__name__)
+
+# a comment line this often keeps proxies from closing an idle stream
+KEEPALIVE_S = 15.0
+
+
+def sse_event(record: BoardDisplayRecord) -> str:
+    data = json.dumps(record.to_dict())
+    event_id = f"id: {record.seq}\n" if record.seq is not None else ""
+    return f"event: board\n{event_id}data: {data}\n\n"
+
+
+class BoardFeed:
+    def __init__(self, redis_url: str, keepalive_s: float = KEEPALIVE_S):
+        self.client = redis_async.Redis.from_url(redis_url, decode_responses=True)
+        self.keepalive_s = keepalive_s
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def current(self) -> Optional[BoardDisplayRecord]:
+        """The current record, or None before anything has been shown."""
+        data = await self.client.hgetall(RedisDataStore.KEY)
+        return RedisDataStore.parse_record(data) if data else None
+
+    async def events(self, is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+        """SSE text: the current record, then every change until the client leaves."""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(RedisDataStore.UPDATES_CHANNEL)
+
+        try:
+            last_seq = 0
+
+            record = await self.current()
+            if record is not None:
+                last_seq = record.seq or 0
+                yield sse_event(record)
+
+            while not await is_disconnected():
+                message = await pubsub.get_message(timeout=self.keepalive_s)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                try:
+                    record = BoardDisplayRecord.from_dict(json.loads(message["data"]))
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Ignoring malformed board update: %r", message.get("data"))
+                    continue
+
+                # already covered by the record read at subscribe time
+                if record.seq is not None and record.seq <= last_seq:
+                    continue
+
+                last_seq = record.seq or last_seq
+                yield sse_event(record)
+        finally:
+            await pubsub.unsubscribe(RedisDataStore.UPDATES_CHANNEL)
+            await pubsub.aclose()
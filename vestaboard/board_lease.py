@@ -0,0 +1,200 @@
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseTimeout(Exception):
+    """Raised when another process held the board lease for longer than the wait."""
+
+
+class LeaseLost(Exception):
+    """Raised when a write carries a fencing token older than one already used."""
+
+
+# Take the lease only if it's free, numbering each grant from a counter that
+# never goes back, so a later holder always has the larger token.
+_ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    local token = redis.call('INCR', KEYS[2])
+    redis.call('SET', KEYS[1], token, 'PX', ARGV[1])
+    return {1, token}
+end
+return {0, redis.call('PTTL', KEYS[1])}
+"""
+
+# Only the holder may extend; an expired lease may already be someone else's.
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Only the holder may release, for the same reason.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class LeaseStats:
+    acquired: int
+    # acquisitions that had to wait for another holder first
+    contended: int
+    timeouts: int
+    # holds that expired or were superseded before their writes finished
+    lost: int
+    mean_wait_ms: float
+    mean_hold_ms: float
+
+    @property
+    def contention_ratio(self) -> float:
+        return self.contended / self.acquired if self.acquired else 0.0
+
+
+class BoardLease:
+    """
+    Per-board lease that serializes the transition, record and send steps
+    across every process sending to the board. Like the current-record hash
+    it fences, there is one per Redis, so tokens stay comparable even if
+    the API key changes.
+
+    Each grant carries a fencing token. Writes that can check it (the
+    current-record hash) reject an older token. The Vestaboard API can't
+    check tokens, so a holder renews the lease right before each call
+    attempt instead (LeaseToken.renew); ttl_s only has to outlast the
+    longest gap between renewals: the rate-limit wait, or one request
+    attempt plus its retry backoff.
+    """
+
+    KEY = "vestaboard:lease"
+    FENCE_KEY = "vestaboard:lease:fence"
+    STATS_KEY = "vestaboard:lease:stats"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_s: float = 90.0,
+        wait_s: float = 60.0,
+        poll_s: float = 0.05,
+    ):
+        if ttl_s <= 0:
+            raise ValueError("ttl_s must be positive")
+
+        self.client = client
+        self.ttl_s = ttl_s
+        self.wait_s = wait_s
+        self.poll_s = poll_s
+        self._acquire_script = self.client.register_script(_ACQUIRE_SCRIPT)
+        self._renew_script = self.client.register_script(_RENEW_SCRIPT)
+        self._release_script = self.client.register_script(_RELEASE_SCRIPT)
+
+    def acquire(self) -> "LeaseToken":
+        """Wait up to wait_s for the lease; raises LeaseTimeout."""
+        start = time.monotonic()
+        deadline = start + self.wait_s
+        contended = False
+
+        while True:
+            acquired, value = self._acquire_script(
+                keys=[self.KEY, self.FENCE_KEY],
+                args=[int(self.ttl_s * 1000)],
+            )
+            if int(acquired):
+                break
+
+            contended = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count(timeouts=1)
+                raise LeaseTimeout(f"Board lease still held by another sender after {self.wait_s}s")
+
+            # value is the holder's remaining ttl in ms; no point polling past it
+            time.sleep(max(0.001, min(self.poll_s, remaining, int(value) / 1000)))
+
+        waited_s = time.monotonic() - start
+        self._count(acquired=1, contended=int(contended), wait_ms=waited_s * 1000)
+
+        return LeaseToken(self, int(value), time.monotonic())
+
+    @contextmanager
+    def hold(self) -> Iterator["LeaseToken"]:
+        token = self.acquire()
+        try:
+            yield token
+        finally:
+            token.release()
+
+    def stats(self) -> LeaseStats:
+        data = self.client.hgetall(self.STATS_KEY)
+        acquired = int(data.get("acquired", 0))
+
+        def mean(field: str) -> float:
+            return float(data.get(field, 0)) / acquired if acquired else 0.0
+
+        return LeaseStats(
+            acquired=acquired,
+            contended=int(data.get("contended", 0)),
+            timeouts=int(data.get("timeouts", 0)),
+            lost=int(data.get("lost", 0)),
+            mean_wait_ms=mean("wait_ms"),
+            mean_hold_ms=mean("hold_ms"),
+        )
+
+    def _count(self, **fields: float):
+        # metrics only; never fail a send over them
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for field, amount in fields.items():
+                if isinstance(amount, int):
+                    pipe.hincrby(self.STATS_KEY, field, amount)
+                else:
+                    pipe.hincrbyfloat(self.STATS_KEY, field, amount)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Failed to update board lease stats", exc_info=True)
+
+
+@dataclass
+class LeaseToken:
+    lease: BoardLease
+    # fencing token: strictly larger than any earlier holder's
+    token: int
+    acquired_at: float
+    released: bool = False
+
+    def renew(self):
+        """Extend the lease to a full ttl_s; raises LeaseLost if it is no longer ours."""
+        renewed = self.lease._renew_script(
+            keys=[self.lease.KEY],
+            args=[self.token, int(self.lease.ttl_s * 1000)],
+        )
+        if not int(renewed):
+            self.mark_lost()
+            raise LeaseLost(f"Board lease {self.token} expired or was taken over")
+
+    def mark_lost(self):
+        self.lease._count(lost=1)
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+
+        try:
+            self.lease._release_script(keys=[self.lease.KEY], args=[self.token])
+        except redis.RedisError:
+            # it expires on its own after ttl_s
+            logger.warning("Failed to release board lease %d", self.token, exc_info=True)
+
+        self.lease._count(hold_ms=(time.monotonic() - self.acquired_at) * 1000)
+
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from vestaboard.board_state import BoardState
 
 @dataclass
@@ -8,10 +8,45 @@ class BoardMessage:
     source: str
     layout: Optional[List[List[int]]] = None
     text: Optional[str] = None
+    # set for template screens: the template and slot values behind `layout`
+    template_id: Optional[str] = None
+    components: Optional[Dict[str, str]] = None
 
     def __post_init__(self) -> None:
         has_text = self.text is not None
         has_layout = self.layout is not None
 
         if has_text == has_layout:
-            raise ValueError("BoardMessage must have exactly one of text or layout.")
\ No newline at end of file
+            raise ValueError("BoardMessage must have exactly one of text or layout.")
+
+    @classmethod
+    def from_screen(cls, state: BoardState, source: str, screen) -> "BoardMessage":
+        """A layout message for a vestaboard.templates.RenderedScreen."""
+        return cls(
+            state=state,
+            source=source,
+            layout=screen.layout,
+            template_id=screen.template_id,
+            components=screen.components,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "source": self.source,
+            "layout": self.layout,
+            "text": self.text,
+            "template_id": self.template_id,
+            "components": self.components,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BoardMessage":
+        return cls(
+            state=BoardState(data["state"]),
+            source=data["source"],
+            layout=data.get("layout"),
+            text=data.get("text"),
+            template_id=data.get("template_id"),
+            components=data.get("components"),
+        )
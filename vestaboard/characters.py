@@ -0,0 +1,66 @@
+import re
+from typing import Dict, List
+
+BLANK = 0
+
+# Vestaboard character codes. Lowercase letters map to their uppercase codes.
+CHAR_CODES: Dict[str, int] = {
+    " ": BLANK,
+    **{chr(ord("A") + i): 1 + i for i in range(26)},
+    **{str(d): 27 + (d - 1) for d in range(1, 10)},
+    "0": 36,
+    "!": 37,
+    "@": 38,
+    "#": 39,
+    "$": 40,
+    "(": 41,
+    ")": 42,
+    "-": 44,
+    "+": 46,
+    "&": 47,
+    "=": 48,
+    ";": 49,
+    ":": 50,
+    "'": 52,
+    '"': 53,
+    "%": 54,
+    ",": 55,
+    ".": 56,
+    "/": 59,
+    "?": 60,
+    "°": 62,
+}
+
+RED = 63
+ORANGE = 64
+YELLOW = 65
+GREEN = 66
+BLUE = 67
+VIOLET = 68
+WHITE = 69
+BLACK = 70
+FILLED = 71
+
+MAX_CODE = FILLED
+
+# "{63}" embeds a raw character code in a VBML template
+_CODE_TOKEN = re.compile(r"\{(\d{1,2})\}")
+
+
+def encode_char(ch: str) -> int:
+    return CHAR_CODES.get(ch.upper(), BLANK)
+
+
+def encode_template(template: str) -> List[int]:
+    """Encode a VBML template string to character codes, one per cell."""
+    codes: List[int] = []
+    pos = 0
+
+    for match in _CODE_TOKEN.finditer(template):
+        codes.extend(encode_char(ch) for ch in template[pos:match.start()])
+        code = int(match.group(1))
+        codes.append(code if code <= MAX_CODE else BLANK)
+        pos = match.end()
+
+    codes.extend(encode_char(ch) for ch in template[pos:])
+    return codes
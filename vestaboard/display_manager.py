@@ -1,44 +1,219 @@
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+
 from redis_data_store import RedisDataStore, BoardDisplayRecord
+from vestaboard.board_lease import BoardLease, LeaseLost, LeaseToken
 from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.flap_planner import fastest_rendering, plan_settle
+from vestaboard.send_queue import SendQueue
 from vestaboard.transitions import Transition, TransitionSpeed
 from vestaboard.vestaboard import VestaboardMessenger
 
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class PreparedTransition:
+    transition: Transition
+    transition_speed: TransitionSpeed
+    # when preparation began, so history latency covers the whole send
+    started_at: float
+    start: float
+    # the rendering to send when the planner shifted the message's layout
+    layout: Optional[List[List[int]]] = None
+    # board lease held from preparation until commit() finishes
+    lease: Optional[LeaseToken] = None
+
 class DisplayManager:
     def __init__(
         self,
         messenger: VestaboardMessenger,
         redis_data_store: RedisDataStore,
+        send_queue: Optional[SendQueue] = None,
+        gentle_max_flaps: int = 10,
+        max_center_shift: int = 0,
+        lease: Optional[BoardLease] = None,
     ):
         self.messenger = messenger
         self.redis_data_store = redis_data_store
+        self.send_queue = send_queue
+        # a change whose slowest cell turns at most this many flaps uses the gentle speed
+        self.gentle_max_flaps = gentle_max_flaps
+        # how far a layout may move sideways to shorten the settle
+        self.max_center_shift = max_center_shift
+        # serializes prepare_transition()..commit() across processes
+        self.lease = lease
+
+    def submit(
+        self,
+        message: BoardMessage,
+        *,
+        ttl_s: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ):
+        """
+        Hand a message off for display. With a send queue configured this
+        only appends to the queue and a worker sends it; otherwise it sends
+        inline.
+
+        idempotency_key names the content (see send_queue.content_key); it is
+        scoped to the record currently shown, so the same content can be
+        sent again once the board has shown something else.
+        """
+        if self.send_queue is None:
+            self.send(message)
+            return
 
+        if idempotency_key is not None:
+            shown = self.load_record()
+            idempotency_key = f"{idempotency_key}:{shown.updated_at if shown else ''}"
+
+        self.send_queue.enqueue(message, ttl_s=ttl_s, idempotency_key=idempotency_key)
 
     def send(self, message: BoardMessage):
-        prev_record = self._get_prev_record()
+        self.commit(message, self.prepare_transition(message.state, message.layout))
+
+    def load_record(self) -> Optional[BoardDisplayRecord]:
+        """The current record, or None before anything has been shown."""
+        try:
+            return self._get_prev_record()
+        except ValueError:
+            return None
+
+    def shown_record(self, source: str) -> Optional[BoardDisplayRecord]:
+        """The current record if `source` put it there, else None."""
+        record = self.load_record()
+        return record if record is not None and record.source == source else None
+
+    def prepare_transition(
+        self,
+        state: BoardState,
+        layout: Optional[List[List[int]]] = None,
+        prev_record: Optional[BoardDisplayRecord] = None,
+    ) -> PreparedTransition:
+        """
+        Pick and set the board transition for a message of `state`; follow
+        it with commit(). With the layout, the choice is planned from the
+        flap distance to it. A record already read (see load_record) can be
+        passed in so that read can overlap fetching the content.
+
+        The rate-limit slot for the send is taken first, so a
+        RateLimitExceeded leaves the board's transition and the record
+        untouched. With a board lease this then takes it and commit()
+        releases it, so no other process can change the board in between;
+        the lease isn't held while waiting for the slot.
+        """
+        started_at = time.time()
+        start = time.perf_counter()
+        self.messenger.acquire_send_slot()
+        lease = self.lease.acquire() if self.lease is not None else None
+
+        try:
+            if prev_record is None or (lease is not None and prev_record.fence != lease.token - 1):
+                # the fence counter moved past the record; someone else sent since it was read
+                prev_record = self._get_prev_record()
 
-        transition, transition_speed = self._decide_transition(prev_record, message)
-        board_transition, board_transition_speed = self.messenger.set_transition(transition, transition_speed)
+            if layout is not None and self.max_center_shift and prev_record.layout:
+                layout = fastest_rendering(prev_record.layout, layout, self.max_center_shift)
 
-        # persist record first to allow transition to be properly set
-        self._persist_record(message, board_transition)
-        self._send_content(message)
+            transition, transition_speed = self._decide_transition(prev_record, state, layout)
+
+            if (prev_record.transition, prev_record.transition_speed) == (transition, transition_speed):
+                # the last send already left the board on these settings
+                board_transition, board_transition_speed = transition, transition_speed
+            else:
+                board_transition, board_transition_speed = self.messenger.set_transition(
+                    transition, transition_speed, before_attempt=self._lease_renewer(lease)
+                )
+        except BaseException:
+            if lease is not None:
+                lease.release()
+            raise
+
+        return PreparedTransition(
+            transition=board_transition,
+            transition_speed=board_transition_speed,
+            started_at=started_at,
+            start=start,
+            layout=layout,
+            lease=lease,
+        )
+
+    def commit(self, message: BoardMessage, prepared: PreparedTransition):
+        if prepared.layout is not None and prepared.layout != message.layout:
+            # a shifted layout no longer lines up with its template's slots
+            message = replace(message, layout=prepared.layout, template_id=None, components=None)
+
+        lease = prepared.lease
+        try:
+            self._send_content(message, lease)
+            # only now does the board show it; a failed send leaves the record
+            # (and its subscribers) on the previous content
+            self._persist_record(message, prepared.transition, prepared.transition_speed, lease)
+        finally:
+            if lease is not None:
+                lease.release()
+
+        self._record_history(message, prepared.transition, time.perf_counter() - prepared.start, prepared.started_at)
 
     def _get_prev_record(self) -> BoardDisplayRecord:
         return self.redis_data_store.get_current_record()
 
-    def _persist_record(self, message: BoardMessage, transition: Transition):
-        self.redis_data_store.set_current_record(message, transition)
+    def _persist_record(
+        self,
+        message: BoardMessage,
+        transition: Transition,
+        transition_speed: Optional[TransitionSpeed] = None,
+        lease: Optional[LeaseToken] = None,
+    ):
+        try:
+            self.redis_data_store.set_current_record(
+                message,
+                transition,
+                transition_speed,
+                fencing_token=lease.token if lease is not None else None,
+            )
+        except LeaseLost:
+            lease.mark_lost()
+            raise
 
-    def _send_content(self, message: BoardMessage):
+    @staticmethod
+    def _lease_renewer(lease: Optional[LeaseToken]) -> Optional[Callable[[], None]]:
+        # the board API can't check fencing tokens, so every attempt at a board
+        # call first renews the lease, which fails once it has been lost
+        return lease.renew if lease is not None else None
+
+    def _record_history(self, message: BoardMessage, transition: Transition, latency_s: float, sent_at: float):
+        # history is for analysis only; never fail a send over it
+        try:
+            self.redis_data_store.append_history(message, transition, latency_s, sent_at)
+        except Exception:
+            logger.exception("Failed to append display history")
+
+    def _send_content(self, message: BoardMessage, lease: Optional[LeaseToken] = None):
+        renew = self._lease_renewer(lease)
         if message.layout:
-            self.messenger.send_layout(message.layout)
+            self.messenger.send_layout(message.layout, slot_acquired=True, before_attempt=renew)
             return
 
-        self.messenger.send_message(message.text)
+        self.messenger.send_message(message.text, slot_acquired=True, before_attempt=renew)
 
-    @staticmethod
-    def _decide_transition(prev_record: BoardDisplayRecord, next_message: BoardMessage):
-        if prev_record.state != next_message.state:
-            return Transition.CURTAIN, TransitionSpeed.FAST
+    def _decide_transition(
+        self,
+        prev_record: BoardDisplayRecord,
+        next_state: BoardState,
+        next_layout: Optional[List[List[int]]] = None,
+    ):
+        transition = Transition.CURTAIN if prev_record.state != next_state else Transition.CLASSIC
+
+        if next_layout is None or not prev_record.layout:
+            return transition, TransitionSpeed.FAST
+
+        # settle time follows the slowest cell, so small changes can afford gentle
+        plan = plan_settle(prev_record.layout, next_layout)
+        if plan.max_flaps <= self.gentle_max_flaps:
+            return transition, TransitionSpeed.GENTLE
 
-        return Transition.CLASSIC, TransitionSpeed.FAST
+        return transition, TransitionSpeed.FAST
@@ -0,0 +1,90 @@
+"""
+Settle-time planning from physical flap distance.
+
+Each split-flap cell only rotates forward through a fixed drum order, so
+going from code a to code b takes (pos[b] - pos[a]) mod drum size flaps,
+and a board has settled once its furthest cell gets there. The drum is
+assumed to follow character-code order, skipping unused codes.
+"""
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from vestaboard.characters import BLANK, CHAR_CODES, MAX_CODE
+
+FLAP_ORDER = np.array(sorted({BLANK, *CHAR_CODES.values(), *range(63, MAX_CODE + 1)}), dtype=np.int64)
+DRUM_SIZE = FLAP_ORDER.size
+
+# code -> drum position; unknown codes are treated like a blank
+_POSITION = np.zeros(MAX_CODE + 1, dtype=np.int64)
+_POSITION[FLAP_ORDER] = np.arange(DRUM_SIZE)
+
+
+@dataclass(frozen=True)
+class SettlePlan:
+    # flaps the slowest cell turns through; settle time is proportional to it
+    max_flaps: int
+    total_flaps: int
+    changed_cells: int
+
+
+def _positions(layout) -> np.ndarray:
+    codes = np.clip(np.asarray(layout, dtype=np.int64), 0, MAX_CODE)
+    return _POSITION[codes]
+
+
+def flap_distances(prev_layout, next_layout) -> np.ndarray:
+    """Per-cell forward flap count from one layout (or stack of layouts) to another."""
+    return (_positions(next_layout) - _positions(prev_layout)) % DRUM_SIZE
+
+
+def plan_settle(prev_layout, next_layout) -> SettlePlan:
+    distances = flap_distances(prev_layout, next_layout)
+
+    return SettlePlan(
+        max_flaps=int(distances.max(initial=0)),
+        total_flaps=int(distances.sum()),
+        changed_cells=int(np.count_nonzero(distances)),
+    )
+
+
+def shifted_renderings(layout: Sequence[Sequence[int]], max_shift: int) -> List[np.ndarray]:
+    """
+    The layout moved sideways by up to max_shift columns, within the
+    columns that are blank on every row, so nothing gets cut off. Index 0
+    is the layout as given.
+    """
+    grid = np.asarray(layout, dtype=np.int64)
+    used = np.flatnonzero((grid != BLANK).any(axis=0))
+
+    if used.size == 0 or max_shift <= 0:
+        return [grid]
+
+    left_room = int(used[0])
+    right_room = grid.shape[1] - 1 - int(used[-1])
+
+    shifts = [0] + [
+        s for d in range(1, max_shift + 1) for s in (-d, d)
+        if -left_room <= s <= right_room
+    ]
+    return [np.roll(grid, s, axis=1) for s in shifts]
+
+
+def fastest_rendering(prev_layout, layout, max_shift: int) -> List[List[int]]:
+    """
+    Of the equivalent sideways shifts of `layout`, the one the board
+    settles into soonest from prev_layout: least max flaps, then least
+    total flaps, then the smallest shift.
+    """
+    candidates = shifted_renderings(layout, max_shift)
+    if len(candidates) == 1:
+        return candidates[0].tolist()
+
+    distances = flap_distances(np.asarray(prev_layout)[None, :, :], np.stack(candidates))
+    max_flaps = distances.max(axis=(1, 2))
+    total_flaps = distances.sum(axis=(1, 2))
+
+    # lexsort sorts by the last key first; candidate order already prefers smaller shifts
+    best = int(np.lexsort((np.arange(len(candidates)), total_flaps, max_flaps))[0])
+    return candidates[best].tolist()
@@ -0,0 +1,31 @@
+from typing import List
+
+BOARD_ROWS = 6
+BOARD_COLS = 22
+LAYOUT_SIZE = BOARD_ROWS * BOARD_COLS
+
+# Vestaboard character codes top out at 71, so every cell fits in one
+# ASCII byte and a packed layout survives a decode_responses Redis client.
+MAX_CODE = 127
+
+
+def pack_layout(layout: List[List[int]]) -> bytes:
+    """Pack a 6x22 character-code layout into 132 bytes, row-major."""
+    if len(layout) != BOARD_ROWS or any(len(row) != BOARD_COLS for row in layout):
+        raise ValueError(f"Layout must be {BOARD_ROWS}x{BOARD_COLS}")
+
+    flat = [int(code) for row in layout for code in row]
+    if any(code < 0 or code > MAX_CODE for code in flat):
+        raise ValueError(f"Layout codes must be between 0 and {MAX_CODE}")
+
+    return bytes(flat)
+
+
+def unpack_layout(data: bytes | str) -> List[List[int]]:
+    if isinstance(data, str):
+        data = data.encode("latin-1")
+
+    if len(data) != LAYOUT_SIZE:
+        raise ValueError(f"Packed layout must be {LAYOUT_SIZE} bytes, got {len(data)}")
+
+    return [list(data[r * BOARD_COLS:(r + 1) * BOARD_COLS]) for r in range(BOARD_ROWS)]
@@ -0,0 +1,161 @@
+"""
+Runs one board update as a small dependency graph.
+
+Each Stage names the stages it needs; a stage starts as soon as those have
+finished and is called with their results as keyword arguments, so
+independent network calls (e.g. the weather fetch and the Redis record
+read) overlap and an update takes about as long as its critical path:
+
+    result = UpdatePipeline([
+        Stage("fetch", fetch),
+        Stage("compose", compose, deps=("fetch",)),
+        *display_stages(manager, BoardState.WEATHER, content="compose"),
+    ]).run()
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from vestaboard.board_state import BoardState
+from vestaboard.send_queue import content_key
+
+logger = logging.getLogger(__name__)
+
+
+class StopPipeline(Exception):
+    """Raised by a stage to end the update early without an error."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class PipelineResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    # stage -> (start, end), perf_counter seconds relative to the run start
+    timings: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+    stopped: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.stopped is None
+
+
+class UpdatePipeline:
+    def __init__(self, stages: Iterable[Stage], max_workers: int = 4):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name!r}")
+            self.stages[stage.name] = stage
+
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stages {missing}")
+
+        self._check_acyclic()
+        self.max_workers = max_workers
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through {name!r}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def run(self) -> PipelineResult:
+        """
+        Run every stage. An exception in any stage is re-raised once the
+        stages already running have finished; stages that haven't started
+        are skipped. A StopPipeline ends the run the same way but returns
+        the partial result with `stopped` set.
+        """
+        result = PipelineResult()
+        run_start = time.perf_counter()
+        pending = dict(self.stages)
+        running: Dict[Future, str] = {}
+        failure: Optional[BaseException] = None
+
+        def call(stage: Stage):
+            start = time.perf_counter() - run_start
+            try:
+                return stage.fn(**{dep: result.results[dep] for dep in stage.deps})
+            finally:
+                result.timings[stage.name] = (start, time.perf_counter() - run_start)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="update-pipeline") as pool:
+            while pending or running:
+                if failure is None and result.stopped is None:
+                    ready = [s for s in pending.values() if all(dep in result.results for dep in s.deps)]
+                    for stage in ready:
+                        del pending[stage.name]
+                        running[pool.submit(call, stage)] = stage.name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        result.results[name] = future.result()
+                    except StopPipeline as stop:
+                        result.stopped = str(stop) or name
+                    except Exception as exc:
+                        logger.exception("Pipeline stage %s failed", name)
+                        failure = failure or exc
+
+        result.elapsed_s = time.perf_counter() - run_start
+
+        if failure is not None:
+            raise failure
+
+        return result
+
+
+def display_stages(manager, state: BoardState, content: str) -> List[Stage]:
+    """
+    Stages that show the BoardMessage produced by stage `content`: the
+    Redis record read runs alongside whatever builds the content, the
+    transition is planned and set from the flap distance once the layout is
+    known, and the record/send follow. With a send queue the worker does
+    all of that, so the message is just handed off.
+    """
+    if manager.send_queue is not None:
+        def submit(**deps):
+            message = deps[content]
+            return manager.submit(message, idempotency_key=content_key(message))
+
+        return [Stage("commit", submit, deps=(content,))]
+
+    return [
+        Stage("load_record", manager.load_record),
+        Stage(
+            "prepare_transition",
+            lambda load_record, **deps: manager.prepare_transition(state, deps[content].layout, load_record),
+            deps=("load_record", content),
+        ),
+        Stage(
+            "commit",
+            lambda prepare_transition, **deps: manager.commit(deps[content], prepare_transition),
+            deps=("prepare_transition", content),
+        ),
+    ]
@@ -0,0 +1,108 @@
+import hashlib
+import time
+from typing import Optional, Tuple
+
+import redis
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a send could not get a rate-limit token in time."""
+
+
+# Refill and take atomically so every process sees one shared bucket. Time
+# comes from the Redis server, so client clock skew doesn't matter.
+_TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local refill_per_s = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local data = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_s)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / refill_per_s
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', key, math.ceil(capacity / refill_per_s) * 2 + 1)
+
+if wait == 0 then
+    return {1, '0'}
+end
+return {0, tostring(wait)}
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket shared by every process that sends with the same API key.
+
+    The defaults allow one send per 15 seconds, as Vestaboard recommends.
+    """
+
+    KEY_PREFIX = "vestaboard:ratelimit"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        api_key: str,
+        capacity: int = 1,
+        refill_interval_s: float = 15.0,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if refill_interval_s <= 0:
+            raise ValueError("refill_interval_s must be positive")
+
+        self.client = client
+        self.capacity = capacity
+        self.refill_per_s = 1.0 / refill_interval_s
+        # never put the key itself in Redis
+        key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.key = f"{self.KEY_PREFIX}:{key_id}"
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def _take(self) -> Tuple[bool, float]:
+        acquired, wait_s = self._script(
+            keys=[self.key],
+            args=[self.capacity, self.refill_per_s, 1],
+        )
+        return bool(int(acquired)), float(wait_s)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting."""
+        acquired, _ = self._take()
+        return acquired
+
+    def acquire_until(self, deadline: Optional[float]) -> bool:
+        """
+        Wait for a token until `deadline` (a time.monotonic() value).
+        Returns False if the deadline passes first. None waits indefinitely.
+        """
+        while True:
+            acquired, wait_s = self._take()
+            if acquired:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait_s > remaining:
+                    # the token will not arrive in time; let the caller defer
+                    return False
+
+            time.sleep(wait_s)
+
+    def acquire(self, timeout_s: Optional[float] = None) -> bool:
+        """Block until a token is available, or until timeout_s elapses."""
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        return self.acquire_until(deadline)
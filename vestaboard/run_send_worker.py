@@ -0,0 +1,48 @@
+import logging
+import os
+import signal
+import socket
+import sys
+
+from app import build_board_container
+from vestaboard.send_queue import SendQueueWorker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(message)s",
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+def run():
+    logger.info("Send worker starting")
+
+    container = build_board_container()
+
+    if container.send_queue is None:
+        # the Procfile always starts this process; with the queue off, jobs send
+        # directly, so idle instead of exiting into the platform's restart loop
+        logger.info("VB_SEND_QUEUE is off; send worker idle until stopped")
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        signal.pause()
+        return
+
+    queue = container.send_queue
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+
+    worker = SendQueueWorker(queue, container.display_manager, consumer)
+
+    def _stop(signum, frame):
+        logger.info("Received signal %d; stopping after the current batch", signum)
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    worker.run_forever()
+
+if __name__ == "__main__":
+    run()
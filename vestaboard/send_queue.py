@@ -0,0 +1,312 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import redis
+
+from vestaboard.board_message import BoardMessage
+
+logger = logging.getLogger(__name__)
+
+# Advance the last-delivered entry id, never moving it back.
+_MARK_DELIVERED_SCRIPT = """
+local function parse(id)
+    local ms, seq = string.match(id, '(%d+)-(%d+)')
+    return tonumber(ms), tonumber(seq)
+end
+
+local current = redis.call('GET', KEYS[1])
+if current then
+    local cur_ms, cur_seq = parse(current)
+    local new_ms, new_seq = parse(ARGV[1])
+    if cur_ms > new_ms or (cur_ms == new_ms and cur_seq >= new_seq) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Claim an idempotency key for one send, or return whoever holds it.
+_CLAIM_SEND_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder then
+    return holder
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return false
+"""
+
+# Drop a claim after a failed send, but only the caller's own.
+_RELEASE_CLAIM_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def content_key(message: BoardMessage) -> str:
+    """Idempotency key for a message's source and content."""
+    content = json.dumps([message.source, message.layout, message.text])
+    return f"{message.source}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _entry_order(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+@dataclass(frozen=True)
+class QueuedMessage:
+    entry_id: str
+    message: BoardMessage
+    expires_at: float
+    idempotency_key: str
+
+    @property
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class SendQueue:
+    """
+    Durable outbound queue for board messages on a Redis stream.
+
+    Producers only append to the stream; a SendQueueWorker in the consumer
+    group does the actual sends and acknowledges each entry once it's
+    delivered, so a crash or an API outage leaves the message pending
+    instead of lost.
+    """
+
+    STREAM_KEY = "vestaboard:outbound"
+    GROUP = "vestaboard-senders"
+    SENT_KEY_PREFIX = "vestaboard:outbound:sent"
+    SENT = "sent"
+    # id of the newest entry delivered; anything older would show stale content
+    DELIVERED_KEY = "vestaboard:outbound:delivered"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        maxlen: int = 1000,
+        default_ttl_s: float = 600.0,
+        sent_key_ttl_s: int = 86400,
+        claim_ttl_s: float = 300.0,
+    ):
+        self.client = client
+        self.maxlen = maxlen
+        self.default_ttl_s = default_ttl_s
+        self.sent_key_ttl_s = sent_key_ttl_s
+        # outlives a send's lease wait and retries, so only a crashed sender's claim expires
+        self.claim_ttl_s = claim_ttl_s
+        self._mark_delivered = self.client.register_script(_MARK_DELIVERED_SCRIPT)
+        self._claim_send = self.client.register_script(_CLAIM_SEND_SCRIPT)
+        self._release_claim = self.client.register_script(_RELEASE_CLAIM_SCRIPT)
+
+    def enqueue(
+        self,
+        message: BoardMessage,
+        *,
+        ttl_s: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """
+        Append a message and return its stream entry id.
+
+        The message is dropped if it is still undelivered after ttl_s.
+        Entries sharing an idempotency_key are sent at most once while the
+        key's sent marker lives.
+        """
+        ttl_s = self.default_ttl_s if ttl_s is None else ttl_s
+
+        return self.client.xadd(
+            self.STREAM_KEY,
+            {
+                "message": json.dumps(message.to_dict()),
+                "expires_at": repr(time.time() + ttl_s),
+                "idempotency_key": idempotency_key or "",
+            },
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+    def ensure_group(self) -> None:
+        try:
+            self.client.xgroup_create(self.STREAM_KEY, self.GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def read(self, consumer: str, count: int = 10, block_ms: int = 5000) -> List[QueuedMessage]:
+        """Read entries never delivered to any consumer."""
+        response = self.client.xreadgroup(
+            self.GROUP,
+            consumer,
+            {self.STREAM_KEY: ">"},
+            count=count,
+            block=block_ms,
+        )
+
+        entries = []
+        for _, stream_entries in response or []:
+            entries.extend(stream_entries)
+
+        return self._parse_entries(entries)
+
+    def claim_stale(self, consumer: str, min_idle_ms: int, count: int = 10) -> List[QueuedMessage]:
+        """Take over entries delivered to a consumer that never acknowledged them."""
+        response = self.client.xautoclaim(
+            self.STREAM_KEY,
+            self.GROUP,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+
+        return self._parse_entries(response[1])
+
+    def delivery_count(self, entry_id: str) -> int:
+        pending = self.client.xpending_range(
+            self.STREAM_KEY,
+            self.GROUP,
+            min=entry_id,
+            max=entry_id,
+            count=1,
+        )
+        return int(pending[0]["times_delivered"]) if pending else 0
+
+    def ack(self, entry_id: str) -> None:
+        self.client.xack(self.STREAM_KEY, self.GROUP, entry_id)
+
+    def _sent_key(self, idempotency_key: str) -> str:
+        return f"{self.SENT_KEY_PREFIX}:{idempotency_key}"
+
+    def claim_send(self, idempotency_key: str, consumer: str) -> Optional[str]:
+        """
+        Take the key for one send before sending.
+
+        Returns None once claimed. Otherwise returns the current holder:
+        SENT after a delivery, or the consumer still sending it.
+        """
+        holder = self._claim_send(
+            keys=[self._sent_key(idempotency_key)],
+            args=[consumer, int(self.claim_ttl_s * 1000)],
+        )
+        return holder or None
+
+    def release_claim(self, idempotency_key: str, consumer: str) -> None:
+        self._release_claim(keys=[self._sent_key(idempotency_key)], args=[consumer])
+
+    def mark_sent(self, idempotency_key: str) -> None:
+        self.client.set(self._sent_key(idempotency_key), self.SENT, ex=self.sent_key_ttl_s)
+
+    def is_superseded(self, entry_id: str) -> bool:
+        """Whether an entry enqueued after this one has already been delivered."""
+        delivered = self.client.get(self.DELIVERED_KEY)
+        return delivered is not None and _entry_order(delivered) > _entry_order(entry_id)
+
+    def mark_delivered(self, entry_id: str) -> None:
+        self._mark_delivered(keys=[self.DELIVERED_KEY], args=[entry_id])
+
+    def _parse_entries(self, entries: List[Tuple[str, dict]]) -> List[QueuedMessage]:
+        parsed = []
+        for entry_id, fields in entries:
+            if not fields:
+                # trimmed from the stream while pending; nothing to send
+                self.ack(entry_id)
+                continue
+
+            parsed.append(QueuedMessage(
+                entry_id=entry_id,
+                message=BoardMessage.from_dict(json.loads(fields["message"])),
+                expires_at=float(fields["expires_at"]),
+                idempotency_key=fields.get("idempotency_key") or entry_id,
+            ))
+        return parsed
+
+
+class SendQueueWorker:
+    """Consumer-group worker that delivers queued messages via DisplayManager."""
+
+    def __init__(
+        self,
+        queue: SendQueue,
+        display_manager,
+        consumer: str,
+        min_idle_ms: int = 60_000,
+        max_attempts: int = 5,
+    ):
+        self.queue = queue
+        self.manager = display_manager
+        self.consumer = consumer
+        self.min_idle_ms = min_idle_ms
+        self.max_attempts = max_attempts
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def run_forever(self, block_ms: int = 5000) -> None:
+        self.queue.ensure_group()
+        logger.info("Send worker %s started", self.consumer)
+
+        while not self._stopped:
+            self.run_once(block_ms=block_ms)
+
+    def run_once(self, block_ms: int = 5000) -> int:
+        # Entries left pending by a crashed or failed send come first.
+        entries = self.queue.claim_stale(self.consumer, self.min_idle_ms)
+        if not entries:
+            entries = self.queue.read(self.consumer, block_ms=block_ms)
+
+        for entry in entries:
+            self._deliver(entry)
+
+        return len(entries)
+
+    def _deliver(self, entry: QueuedMessage) -> None:
+        if entry.is_expired:
+            logger.info("Dropping expired message %s from %s", entry.entry_id, entry.message.source)
+            self.queue.ack(entry.entry_id)
+            return
+
+        if self.queue.is_superseded(entry.entry_id):
+            # a retried entry must not overwrite newer content already on the board
+            logger.info("Dropping message %s from %s; a newer message was delivered", entry.entry_id, entry.message.source)
+            self.queue.ack(entry.entry_id)
+            return
+
+        attempts = self.queue.delivery_count(entry.entry_id)
+        if attempts > self.max_attempts:
+            logger.error("Giving up on message %s after %d attempts", entry.entry_id, attempts)
+            self.queue.ack(entry.entry_id)
+            return
+
+        # claimed atomically, so two consumers reclaiming the same entry can't both send it
+        holder = self.queue.claim_send(entry.idempotency_key, self.consumer)
+        if holder == SendQueue.SENT:
+            logger.info("Skipping duplicate message %s (key=%s)", entry.entry_id, entry.idempotency_key)
+            self.queue.ack(entry.entry_id)
+            return
+        if holder is not None:
+            # left pending in case that send fails
+            logger.info("Message %s is being sent by %s; leaving it pending", entry.entry_id, holder)
+            return
+
+        try:
+            self.manager.send(entry.message)
+        except Exception:
+            # left pending; claim_stale retries it once it has been idle long enough
+            logger.exception("Send failed for message %s (attempt %d)", entry.entry_id, attempts)
+            self.queue.release_claim(entry.idempotency_key, self.consumer)
+            return
+
+        self.queue.mark_sent(entry.idempotency_key)
+        self.queue.mark_delivered(entry.entry_id)
+        self.queue.ack(entry.entry_id)
+        logger.info("Delivered message %s from %s", entry.entry_id, entry.message.source)
@@ -0,0 +1,175 @@
+"""
+Declarative board screens, compiled once and rendered locally.
+
+A ScreenTemplate is a list of rows, each a list of Cells laid out left to
+right; a row is as tall as its tallest cell. A Cell is either static text or
+a named slot:
+
+    SCREEN = ScreenTemplate([
+        [Cell(11, "time until"), Cell(11, "days", justify="right")],
+        [Cell(16, slot="name"), Cell(6, slot="days", justify="right")],
+    ]).compile()
+
+    layout = SCREEN.render({"name": "LAUNCH", "days": "12"})
+
+compile() encodes every static cell into a base grid up front, so render()
+only copies that grid and fills the slots. Slot values go through the same
+encoding/justification as vestaboard.vbml, so a template renders exactly
+what the equivalent compose_vbml_component list would.
+
+render_screen() also returns the slot values it rendered. Given the previous
+RenderedScreen of the same template it starts from that layout and
+re-encodes only the slots whose value changed, so the work scales with the
+size of the change rather than the screen.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from vestaboard.characters import BLANK
+from vestaboard.layout_codec import BOARD_COLS, BOARD_ROWS
+from vestaboard.vbml import render_block
+
+
+@dataclass(frozen=True)
+class Cell:
+    width: int
+    text: str = ""
+    # filled from render(values) instead of `text` when set
+    slot: Optional[str] = None
+    justify: str = "left"
+    height: int = 1
+
+
+@dataclass(frozen=True)
+class _SlotCell:
+    name: str
+    row: int
+    x: int
+    width: int
+    height: int
+    justify: str
+
+
+@dataclass(frozen=True)
+class RenderedScreen:
+    # identifies the compiled template, so a stored screen is only reused
+    # against the template that produced it
+    template_id: str
+    layout: List[List[int]]
+    # slot name -> the value rendered into it
+    components: Dict[str, str]
+
+    @classmethod
+    def from_record(cls, record) -> Optional["RenderedScreen"]:
+        """From a BoardDisplayRecord, if it carries a template render."""
+        if record is None or not (record.template_id and record.layout and record.components is not None):
+            return None
+
+        return cls(record.template_id, record.layout, record.components)
+
+
+class CompiledTemplate:
+    # slot renders memoized per (slot geometry, value); values repeat a lot between runs
+    MAX_CACHED_SLOT_VALUES = 512
+
+    def __init__(self, base: List[List[int]], slots: Sequence[_SlotCell]):
+        self._base = base
+        self._slots = tuple(slots)
+        self._encoded: Dict[Tuple[int, int, str, str], List[List[int]]] = {}
+        # templates are module-level and render from several threads
+        self._encoded_lock = threading.Lock()
+
+        geometry = repr((base, self._slots)).encode("utf-8")
+        self.template_id = hashlib.sha1(geometry).hexdigest()[:16]
+
+    @property
+    def slot_names(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(slot.name for slot in self._slots))
+
+    def _encode(self, slot: _SlotCell, value: str) -> List[List[int]]:
+        # a slot name can repeat with different cells; the render depends only on these
+        key = (slot.width, slot.height, slot.justify, value)
+        with self._encoded_lock:
+            block = self._encoded.get(key)
+        if block is not None:
+            return block
+
+        block = render_block(value, slot.width, slot.height, justify=slot.justify)
+        with self._encoded_lock:
+            if len(self._encoded) >= self.MAX_CACHED_SLOT_VALUES:
+                self._encoded.clear()
+            self._encoded[key] = block
+
+        return block
+
+    @staticmethod
+    def _paste(layout: List[List[int]], slot: _SlotCell, block: List[List[int]]):
+        for dy, codes in enumerate(block):
+            layout[slot.row + dy][slot.x:slot.x + slot.width] = codes
+
+    def components(self, values: Mapping[str, object]) -> Dict[str, str]:
+        """Normalize render values to the stored component map; missing slots are ""."""
+        return {
+            name: "" if values.get(name) is None else str(values[name])
+            for name in self.slot_names
+        }
+
+    def render(self, values: Mapping[str, object]) -> List[List[int]]:
+        """Full board layout; slots missing from `values` stay blank."""
+        return self.render_screen(values).layout
+
+    __call__ = render
+
+    def render_screen(
+        self,
+        values: Mapping[str, object],
+        previous: Optional[RenderedScreen] = None,
+    ) -> RenderedScreen:
+        components = self.components(values)
+
+        if previous is not None and previous.template_id == self.template_id:
+            layout = [row[:] for row in previous.layout]
+            changed = [s for s in self._slots if previous.components.get(s.name) != components[s.name]]
+        else:
+            layout = [row[:] for row in self._base]
+            changed = [s for s in self._slots if components[s.name]]
+
+        for slot in changed:
+            self._paste(layout, slot, self._encode(slot, components[slot.name]))
+
+        return RenderedScreen(self.template_id, layout, components)
+
+
+@dataclass(frozen=True)
+class ScreenTemplate:
+    rows: Sequence[Sequence[Cell]]
+
+    def compile(self) -> CompiledTemplate:
+        base = [[BLANK] * BOARD_COLS for _ in range(BOARD_ROWS)]
+        slots: List[_SlotCell] = []
+
+        y = 0
+        for row in self.rows:
+            height = max((cell.height for cell in row), default=1)
+            if y + height > BOARD_ROWS:
+                raise ValueError(f"Template is taller than {BOARD_ROWS} rows")
+
+            x = 0
+            for cell in row:
+                if x + cell.width > BOARD_COLS:
+                    raise ValueError(f"Template row {y} is wider than {BOARD_COLS} columns")
+
+                if cell.slot is not None:
+                    slots.append(_SlotCell(cell.slot, y, x, cell.width, cell.height, cell.justify))
+                elif cell.text:
+                    block = render_block(cell.text, cell.width, cell.height, justify=cell.justify)
+                    for dy, codes in enumerate(block):
+                        base[y + dy][x:x + cell.width] = codes
+
+                x += cell.width
+
+            y += height
+
+        return CompiledTemplate(base, slots)
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+
+class VestaboardTransport(ABC):
+    """
+    Where and how board reads/writes are sent. The messenger owns retries
+    and error handling; a transport only knows its endpoints and auth.
+    """
+
+    name = "base"
+    supports_text = True
+    supports_transitions = True
+    timeout_s: Optional[float] = None
+    retry_attempts: Optional[int] = None
+
+    @abstractmethod
+    def message_url(self) -> str:
+        ...
+
+    def transition_url(self) -> Optional[str]:
+        return None
+
+    @abstractmethod
+    def headers(self) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def parse_current_message(self, response: Any) -> Tuple[Any, Optional[str]]:
+        """Return (layout, message id) from a GET on message_url()."""
+
+
+class CloudTransport(VestaboardTransport):
+    """Vestaboard cloud Read/Write API."""
+
+    name = "cloud"
+    HEADER_NAME = "X-Vestaboard-Token"
+    DEFAULT_BASE_URL = "https://cloud.vestaboard.com/"
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL):
+        self.api_key = api_key
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+
+    def message_url(self) -> str:
+        return self.base_url
+
+    def transition_url(self) -> Optional[str]:
+        return self.base_url + "transition"
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            self.HEADER_NAME: self.api_key,
+        }
+
+    def parse_current_message(self, response: Any) -> Tuple[Any, Optional[str]]:
+        current_message = response.get("currentMessage", {})
+        return current_message.get("layout"), current_message.get("id")
+
+
+class LocalTransport(VestaboardTransport):
+    """
+    Vestaboard Local API on the LAN. It only accepts character-code layouts
+    and has no transition settings.
+    """
+
+    name = "local"
+    supports_text = False
+    supports_transitions = False
+    HEADER_NAME = "X-Vestaboard-Local-Api-Key"
+    DEFAULT_PORT = 7000
+
+    def __init__(
+        self,
+        local_api_key: str,
+        host: str,
+        port: int = DEFAULT_PORT,
+        scheme: str = "http",
+        timeout_s: float = 2.0,
+        retry_attempts: int = 2,
+    ):
+        self.local_api_key = local_api_key
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        # fail over quickly on the LAN instead of running the cloud retry budget
+        self.timeout_s = timeout_s
+        self.retry_attempts = retry_attempts
+
+    def message_url(self) -> str:
+        return f"{self.scheme}://{self.host}:{self.port}/local-api/message"
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            self.HEADER_NAME: self.local_api_key,
+        }
+
+    def parse_current_message(self, response: Any) -> Tuple[Any, Optional[str]]:
+        if isinstance(response, dict):
+            return response.get("message"), None
+        return response, None
+
+
+def build_transports(
+    *,
+    transport: str,
+    api_key: Optional[str],
+    local_api_key: Optional[str] = None,
+    local_host: Optional[str] = None,
+    local_port: int = LocalTransport.DEFAULT_PORT,
+    fallback: bool = True,
+) -> Tuple[VestaboardTransport, Optional[VestaboardTransport]]:
+    """Return (primary, fallback) transports for a transport name."""
+    if transport == "cloud":
+        if not api_key:
+            raise ValueError("Cloud transport requires a Vestaboard Read/Write key")
+        return CloudTransport(api_key), None
+
+    if transport == "local":
+        if not local_api_key or not local_host:
+            raise ValueError("Local transport requires a local API key and host")
+
+        primary = LocalTransport(local_api_key, local_host, port=local_port)
+        secondary = CloudTransport(api_key) if fallback and api_key else None
+        return primary, secondary
+
+    raise ValueError(f"Unknown Vestaboard transport: {transport!r}")
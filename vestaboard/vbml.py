@@ -0,0 +1,166 @@
+"""
+Local renderer for the subset of VBML the apps use.
+
+Covers what compose_vbml_payload/compose_vbml_component produce: fixed
+width/height components with justify/align, flowing left to right and
+wrapping to the next row band, plus absolute positioning. Words wrap within
+a component; anything that doesn't fit is cut off.
+"""
+from typing import Any, Dict, List
+
+from vestaboard.characters import BLANK, encode_template
+from vestaboard.layout_codec import BOARD_COLS, BOARD_ROWS
+
+
+def wrap_text(template: str, width: int) -> List[List[int]]:
+    """
+    Encode a template and word-wrap it to rows of at most `width` cells.
+    Lines that already fit are kept verbatim, including repeated spaces.
+    """
+    rows: List[List[int]] = []
+
+    for line in template.split("\n"):
+        codes = encode_template(line)
+        if len(codes) <= width:
+            rows.append(codes)
+        else:
+            rows.extend(_wrap_words(codes, width))
+
+    return rows
+
+
+def justify_row(row: List[int], width: int, justify: str) -> List[int]:
+    row = row[:width]
+    pad = width - len(row)
+
+    if justify == "right":
+        return [BLANK] * pad + row
+    if justify in {"center", "justified"}:
+        left = pad // 2
+        return [BLANK] * left + row + [BLANK] * (pad - left)
+    return row + [BLANK] * pad
+
+
+def render_block(
+    template: str,
+    width: int,
+    height: int,
+    justify: str = "left",
+    align: str = "top",
+) -> List[List[int]]:
+    """Render one component to a height x width block of codes."""
+    rows = wrap_text(template or "", width)[:height]
+
+    pad = height - len(rows)
+    if align == "bottom":
+        top = pad
+    elif align == "center":
+        top = pad // 2
+    else:
+        top = 0
+
+    blank_row: List[int] = []
+    rows = [blank_row] * top + rows + [blank_row] * (pad - top)
+
+    return [justify_row(row, width, justify) for row in rows]
+
+
+def render_payload(payload: Dict[str, Any]) -> List[List[int]]:
+    """Render a compose_vbml_payload() payload to a full board layout."""
+    style = payload.get("style", {})
+    board_rows = style.get("height", BOARD_ROWS)
+    board_cols = style.get("width", BOARD_COLS)
+    layout = [[BLANK] * board_cols for _ in range(board_rows)]
+
+    x = y = 0
+    band_height = 0
+
+    for component in payload.get("components", []):
+        comp_style = component.get("style", {})
+        width = comp_style.get("width", board_cols)
+        height = comp_style.get("height", 1)
+
+        block = render_block(
+            component.get("template", ""),
+            width,
+            height,
+            justify=comp_style.get("justify", "left"),
+            align=comp_style.get("align", "top"),
+        )
+
+        absolute = comp_style.get("absolutePosition")
+        if absolute is not None:
+            _paste(layout, block, absolute["x"], absolute["y"])
+            continue
+
+        if x + width > board_cols:
+            x = 0
+            y += band_height
+            band_height = 0
+
+        _paste(layout, block, x, y)
+        x += width
+        band_height = max(band_height, height)
+
+    return layout
+
+
+def format_message(message: str) -> List[List[int]]:
+    """Center a plain message on the board, like the VBML format endpoint."""
+    return render_block(message, BOARD_COLS, BOARD_ROWS, justify="center", align="center")
+
+
+def _paste(layout: List[List[int]], block: List[List[int]], x: int, y: int) -> None:
+    for dy, row in enumerate(block):
+        if not 0 <= y + dy < len(layout):
+            continue
+        target = layout[y + dy]
+        for dx, code in enumerate(row):
+            if 0 <= x + dx < len(target):
+                target[x + dx] = code
+
+
+def _wrap_words(codes: List[int], width: int) -> List[List[int]]:
+    rows: List[List[int]] = []
+    row: List[int] = []
+
+    for word in _split_words(codes):
+        while len(word) > width:
+            # hard-break words longer than the component
+            if row:
+                rows.append(row)
+                row = []
+            rows.append(word[:width])
+            word = word[width:]
+
+        if not word:
+            continue
+
+        needed = len(word) + (1 if row else 0)
+        if len(row) + needed > width:
+            rows.append(row)
+            row = []
+
+        if row:
+            row.append(BLANK)
+        row.extend(word)
+
+    if row or not rows:
+        rows.append(row)
+
+    return rows
+
+
+def _split_words(codes: List[int]) -> List[List[int]]:
+    words: List[List[int]] = []
+    word: List[int] = []
+    for code in codes:
+        if code == BLANK:
+            if word:
+                words.append(word)
+                word = []
+        else:
+            word.append(code)
+    if word:
+        words.append(word)
+    return words
@@ -1,29 +1,43 @@
+import logging
 import os
 import time
 import random
 import json
 import requests
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Callable, Dict, Optional, List, Tuple
+from vestaboard import vbml
+from vestaboard.rate_limiter import RateLimitExceeded, RedisTokenBucket
 from vestaboard.transitions import Transition, TransitionSpeed
+from vestaboard.transports import CloudTransport, VestaboardTransport
+
+logger = logging.getLogger(__name__)
 
 
 class VestaboardMessenger:
     """Small helper for interacting with the Vestaboard Read/Write API.
 
-    Expects the environment variable `VB_RW_API_KEY` to be set.
+    Expects the environment variable `VB_RW_API_KEY` to be set unless a
+    transport is passed in.
 
     API docs:
       - GET  https://rw.vestaboard.com/   -> returns current message
       - POST https://rw.vestaboard.com/   -> sets message (e.g., {"text": "..."})
 
+    Board reads/writes go through a transport (cloud by default, or the
+    board's LAN Local API), optionally falling back to a second transport
+    when the first is unreachable. Transition settings are only changed
+    through the primary transport, and only when it supports them; text
+    for a layout-only transport is formatted locally with vbml.
+
     Note: Vestaboard recommends not sending more often than ~1 message / 15 seconds.
     """
 
-    VESTABOARD_URL = "https://cloud.vestaboard.com/"
-    TRANSITION_URL = "https://cloud.vestaboard.com/transition"
-    VBML_URL_FORMAT = "https://vbml.vestaboard.com/format"
-    VBML_URL_COMPOSE = "https://vbml.vestaboard.com/compose"
-    HEADER_NAME = "X-Vestaboard-Token"
+    VESTABOARD_URL = CloudTransport.DEFAULT_BASE_URL
+    TRANSITION_URL = CloudTransport.DEFAULT_BASE_URL + "transition"
+    VBML_BASE_URL = "https://vbml.vestaboard.com/"
+    VBML_URL_FORMAT = VBML_BASE_URL + "format"
+    VBML_URL_COMPOSE = VBML_BASE_URL + "compose"
+    HEADER_NAME = CloudTransport.HEADER_NAME
 
     def __init__(
         self,
@@ -33,31 +47,54 @@ class VestaboardMessenger:
         retry_base_delay_s: float = 0.8,
         retry_max_delay_s: float = 10.0,
         session: requests.Session | None = None,
+        rate_limiter: RedisTokenBucket | None = None,
+        rate_limit_wait_s: float | None = 30.0,
+        transport: VestaboardTransport | None = None,
+        fallback_transport: VestaboardTransport | None = None,
+        vbml_base_url: str | None = None,
     ):
         self.api_key = api_key or os.getenv("VB_RW_API_KEY")
-        if not self.api_key:
-            raise ValueError(
-                "Missing Vestaboard Read/Write key. Set env var VB_RW_API_KEY "
-                "or pass api_key=... to VestaboardMessenger()."
-            )
+        if transport is None:
+            if not self.api_key:
+                raise ValueError(
+                    "Missing Vestaboard Read/Write key. Set env var VB_RW_API_KEY "
+                    "or pass api_key=... to VestaboardMessenger()."
+                )
+            transport = CloudTransport(self.api_key)
 
+        self.transport = transport
+        self.fallback_transport = fallback_transport
+        vbml_base_url = (vbml_base_url or self.VBML_BASE_URL).rstrip("/") + "/"
+        self.vbml_format_url = vbml_base_url + "format"
+        self.vbml_compose_url = vbml_base_url + "compose"
         self.timeout_s = timeout_s
         self.retry_attempts = retry_attempts
         self.retry_base_delay_s = retry_base_delay_s
         self.retry_max_delay_s = retry_max_delay_s
         self._session = session or requests.Session()
+        self.rate_limiter = rate_limiter
+        self.rate_limit_wait_s = rate_limit_wait_s
         self.headers = {
             "Content-Type": "application/json",
-            self.HEADER_NAME: self.api_key,
         }
 
+    def close(self) -> None:
+        self._session.close()
+
     @staticmethod
     def _is_retryable_status(status_code: int) -> bool:
         return status_code in {408, 425, 429, 500, 502, 503, 504}
 
     def _sleep_backoff(self, attempt: int, *, retry_after_s: float | None = None) -> None:
-        # Prefer server-provided Retry-After when present.
+        # Honor a server-provided Retry-After in full; retrying any sooner just
+        # draws another 429. One longer than our own backoff cap is left to the
+        # caller to defer, rather than sleeping through it holding the board.
         if retry_after_s is not None:
+            if retry_after_s > self.retry_max_delay_s:
+                raise RateLimitExceeded(
+                    f"Vestaboard asked to retry after {retry_after_s:.0f}s, "
+                    f"longer than the {self.retry_max_delay_s:.0f}s retry cap"
+                )
             time.sleep(max(0.0, retry_after_s))
             return
 
@@ -65,18 +102,35 @@ class VestaboardMessenger:
         jitter = random.uniform(0.0, 0.5)
         time.sleep(backoff + jitter)
 
-    def _request_json(self, method: str, url: str, *, json: Any | None = None) -> Any:
-        """Make an HTTP request with retries and return parsed JSON."""
+    def _request_json(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any | None = None,
+        headers: Dict[str, str] | None = None,
+        timeout_s: float | None = None,
+        retry_attempts: int | None = None,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Any:
+        """
+        Make an HTTP request with retries and return parsed JSON.
+        before_attempt runs before every attempt and may raise to stop.
+        """
         last_err: Exception | None = None
+        retry_attempts = retry_attempts or self.retry_attempts
+
+        for attempt in range(1, retry_attempts + 1):
+            if before_attempt is not None:
+                before_attempt()
 
-        for attempt in range(1, self.retry_attempts + 1):
             try:
                 resp = self._session.request(
                     method,
                     url,
-                    headers=self.headers,
+                    headers=headers or self.headers,
                     json=json,
-                    timeout=self.timeout_s,
+                    timeout=timeout_s or self.timeout_s,
                 )
 
                 # Intercept 409 Conflict (Message already displayed)
@@ -98,23 +152,26 @@ class VestaboardMessenger:
                         except ValueError:
                             retry_after_s = None
 
-                    if self._is_retryable_status(resp.status_code) and attempt < self.retry_attempts:
+                    if self._is_retryable_status(resp.status_code) and attempt < retry_attempts:
                         self._sleep_backoff(attempt, retry_after_s=retry_after_s)
                         continue
 
                     resp.raise_for_status()
 
+                if not resp.content:
+                    return {}
+
                 return resp.json()
 
             except (requests.Timeout, requests.ConnectionError) as e:
                 last_err = e
-                if attempt >= self.retry_attempts:
+                if attempt >= retry_attempts:
                     break
                 self._sleep_backoff(attempt)
 
             except ValueError as e:
                 last_err = e
-                if attempt >= self.retry_attempts:
+                if attempt >= retry_attempts:
                     break
                 self._sleep_backoff(attempt)
 
@@ -125,12 +182,80 @@ class VestaboardMessenger:
         assert last_err is not None
         raise last_err
 
+    def _transport_request(
+        self,
+        transport: VestaboardTransport,
+        method: str,
+        url: str,
+        *,
+        json: Any | None = None,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Any:
+        return self._request_json(
+            method,
+            url,
+            json=json,
+            headers=transport.headers(),
+            timeout_s=transport.timeout_s,
+            retry_attempts=transport.retry_attempts,
+            before_attempt=before_attempt,
+        )
+
+    def _board_request(
+        self,
+        method: str,
+        *,
+        json: Any | None = None,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Tuple[Any, VestaboardTransport]:
+        """
+        Read or write the board's message through the primary transport,
+        switching to the fallback transport if the primary is unreachable.
+        """
+        try:
+            response = self._transport_request(
+                self.transport, method, self.transport.message_url(), json=json, before_attempt=before_attempt
+            )
+            return response, self.transport
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if self.fallback_transport is None:
+                raise
+
+            logger.warning(
+                "Vestaboard %s transport unreachable (%s); falling back to %s",
+                self.transport.name, e, self.fallback_transport.name,
+            )
+
+        response = self._transport_request(
+            self.fallback_transport, method, self.fallback_transport.message_url(), json=json,
+            before_attempt=before_attempt,
+        )
+        return response, self.fallback_transport
+
+    def _transition_transport(self) -> VestaboardTransport | None:
+        # the fallback only carries messages while the primary is down
+        return self.transport if self.transport.supports_transitions else None
+
+    def acquire_send_slot(self) -> None:
+        """
+        Wait for the shared rate limiter, at most rate_limit_wait_s.
+        Raises RateLimitExceeded so the caller can defer the send instead
+        of running into 429s. A caller that takes the slot itself, before
+        any other board change, passes slot_acquired=True to the send.
+        """
+        if self.rate_limiter is None:
+            return
+
+        if not self.rate_limiter.acquire(timeout_s=self.rate_limit_wait_s):
+            raise RateLimitExceeded(
+                f"No Vestaboard send slot available within {self.rate_limit_wait_s}s"
+            )
+
     def get_message(self) -> Dict[str, Any]:
         """Fetch the current message shown on the Vestaboard."""
-        response = self._request_json("GET", self.VESTABOARD_URL)
+        response, transport = self._board_request("GET")
 
-        current_message = response.get("currentMessage", {})
-        layout = current_message.get("layout")
+        layout, message_id = transport.parse_current_message(response)
 
         if isinstance(layout, str):
             try:
@@ -140,38 +265,87 @@ class VestaboardMessenger:
 
         return {
             "layout": layout,
-            "id": current_message.get("id"),
+            "id": message_id,
             "raw": response,
         }
 
-    def send_message(self, message: str) -> Dict[str, Any]:
-        """Send a plain-text message to the Vestaboard."""
+    def send_message(
+        self,
+        message: str,
+        *,
+        slot_acquired: bool = False,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Dict[str, Any]:
+        """Send a plain-text message to the Vestaboard.
+
+        before_attempt runs before each board request attempt, e.g. to
+        renew a board lease; it may raise to abort the send.
+        """
+        if not self.transport.supports_text:
+            # e.g. the Local API only takes layouts
+            return self.send_layout(
+                vbml.format_message(message),
+                slot_acquired=slot_acquired,
+                before_attempt=before_attempt,
+            )
+
         payload = {"text": message}
-        return self._request_json("POST", self.VESTABOARD_URL, json=payload)
+        if not slot_acquired:
+            self.acquire_send_slot()
+        response, _ = self._board_request("POST", json=payload, before_attempt=before_attempt)
+        return response
 
-    def send_layout(self, layout: List[List]) -> Dict[str, Any]:
+    def send_layout(
+        self,
+        layout: List[List],
+        *,
+        slot_acquired: bool = False,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Dict[str, Any]:
         """Send a pre-formatted layout (character-code array).
         """
-        return self._request_json("POST", self.VESTABOARD_URL, json=layout)
+        if not slot_acquired:
+            self.acquire_send_slot()
+        response, _ = self._board_request("POST", json=layout, before_attempt=before_attempt)
+        return response
 
     def get_transition(self) -> Dict[str, Transition | TransitionSpeed]:
         """Fetch the current transition settings for the Vestaboard."""
-        response = self._request_json("GET", self.TRANSITION_URL)
+        transport = self._transition_transport()
+        if transport is None:
+            raise RuntimeError(f"The {self.transport.name} Vestaboard transport has no transition settings")
+
+        response = self._transport_request(transport, "GET", transport.transition_url())
 
         return {
             "transition": Transition(response["transition"]),
             "transitionSpeed": TransitionSpeed(response["transitionSpeed"]),
         }
 
-    def set_transition(self, transition: Transition, transition_speed: TransitionSpeed)\
-            -> Tuple[Transition, TransitionSpeed]:
-        """Update the Vestaboard transition settings."""
+    def set_transition(
+        self,
+        transition: Transition,
+        transition_speed: TransitionSpeed,
+        *,
+        before_attempt: Callable[[], None] | None = None,
+    ) -> Tuple[Transition, TransitionSpeed]:
+        """Update the Vestaboard transition settings.
+
+        Without a transport that supports transitions the request is a
+        no-op and the requested settings are returned unchanged.
+        """
+        transport = self._transition_transport()
+        if transport is None:
+            return transition, transition_speed
+
         payload = {
             "transition": transition.value,
             "transitionSpeed": transition_speed.value,
         }
 
-        response = self._request_json("PUT", self.TRANSITION_URL, json=payload)
+        response = self._transport_request(
+            transport, "PUT", transport.transition_url(), json=payload, before_attempt=before_attempt
+        )
 
         current_transition = Transition(response["transition"])
         current_speed = TransitionSpeed(response["transitionSpeed"])
@@ -180,7 +354,7 @@ class VestaboardMessenger:
 
     def vbml_format_message(self, message: str) -> List[List]:
         payload = {"message": message}
-        return self._request_json("POST", self.VBML_URL_FORMAT, json=payload)
+        return self._request_json("POST", self.vbml_format_url, json=payload)
 
     def vbml_compose_layout(self, payload) -> List[List]:
-        return self._request_json("POST", self.VBML_URL_COMPOSE, json=payload)
+        return self._request_json("POST", self.vbml_compose_url, json=payload)
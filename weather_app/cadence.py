@@ -0,0 +1,119 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Mapping, Optional
+
+import redis
+
+
+@dataclass(frozen=True)
+class WeatherObservation:
+    temperature: float
+    weather_code: Optional[int] = None
+    precipitation_probability: Optional[float] = None
+
+
+class AdaptiveCadence:
+    """
+    Decides whether a scheduled weather run should fetch from the upstream.
+
+    The scheduler ticks at a fixed rate (at least as often as min_interval_s)
+    and each run asks is_due(). A due run fetches and reports what it saw via
+    observe(); a run that isn't due still renders, from the last fetch. A
+    change bigger than the thresholds (or any weather_code change) in any
+    city halves the interval; a run where every city stayed well inside them
+    stretches it. The interval stays within [min_interval_s, max_interval_s]
+    and the state lives in Redis so it carries across runs.
+    """
+
+    KEY_PREFIX = "weather:cadence"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        job: str,
+        min_interval_s: float = 300.0,
+        max_interval_s: float = 3600.0,
+        temp_step: float = 1.0,
+        precip_step: float = 20.0,
+        tighten_factor: float = 0.5,
+        stretch_factor: float = 1.5,
+        # scheduler ticks drift; a run this close to next_due still counts
+        tolerance_s: float = 30.0,
+    ):
+        self.client = client
+        self.job = job
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max_interval_s
+        self.temp_step = temp_step
+        self.precip_step = precip_step
+        self.tighten_factor = tighten_factor
+        self.stretch_factor = stretch_factor
+        self.tolerance_s = tolerance_s
+
+    @property
+    def key(self) -> str:
+        return f"{self.KEY_PREFIX}:{self.job}"
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        next_due = self.client.hget(self.key, "next_due")
+
+        return next_due is None or now >= float(next_due) - self.tolerance_s
+
+    def volatility(
+        self,
+        observations: Mapping[str, WeatherObservation],
+        previous: Mapping[str, WeatherObservation],
+    ) -> float:
+        """
+        Largest per-city change relative to the thresholds: >= 1 means
+        something changed enough to watch closely.
+        """
+        score = 0.0
+
+        for city, obs in observations.items():
+            prev = previous.get(city)
+            if prev is None:
+                continue
+
+            score = max(score, abs(obs.temperature - prev.temperature) / self.temp_step)
+
+            if obs.weather_code is not None and prev.weather_code is not None and obs.weather_code != prev.weather_code:
+                score = max(score, 1.0)
+
+            if obs.precipitation_probability is not None and prev.precipitation_probability is not None:
+                delta = abs(obs.precipitation_probability - prev.precipitation_probability)
+                score = max(score, delta / self.precip_step)
+
+        return score
+
+    def observe(self, observations: Mapping[str, WeatherObservation], now: Optional[float] = None) -> float:
+        """Record a fetch, adjust the interval, and return the new interval."""
+        now = time.time() if now is None else now
+        data = self.client.hgetall(self.key)
+
+        interval_s = float(data.get("interval_s", self.min_interval_s))
+        previous = {
+            city: WeatherObservation(**obs)
+            for city, obs in json.loads(data.get("observations") or "{}").items()
+        }
+
+        score = self.volatility(observations, previous)
+        if score >= 1.0:
+            interval_s *= self.tighten_factor
+        elif score < 0.5 and previous:
+            interval_s *= self.stretch_factor
+        interval_s = min(max(interval_s, self.min_interval_s), self.max_interval_s)
+
+        self.client.hset(
+            self.key,
+            mapping={
+                "interval_s": interval_s,
+                "next_due": now + interval_s,
+                "volatility": score,
+                "observations": json.dumps({city: asdict(obs) for city, obs in observations.items()}),
+            },
+        )
+
+        return interval_s
@@ -4,4 +4,9 @@ CITY_COORDS = {
     "KONA": (19.64, -155.99), # 19.6419° N, 155.9962° W
     "WAIMEA": (20.02, -155.66), # 20.0204° N, 155.6689° W
     "RUILI": (24.01, 97.85), # 24.0128° N, 97.8519° E
-}
\ No newline at end of file
+}
+
+# locations shown on the detailed weather screen
+DETAILED_COORDS = {
+    "WOODINVILLE": CITY_COORDS["WOODINVILLE"],
+}
@@ -0,0 +1,212 @@
+"""
+One fetch per grid cell for every weather view.
+
+Each screen registers a WeatherView naming the locations and Open-Meteo
+variables it needs. The planner unions those per grid cell, and
+WeatherDataPlane fetches each cell at most once per refresh period, in
+canonical units, and shares the result through Redis, so views only project
+their fields from it and adding a view (or a display unit) adds no upstream
+calls.
+"""
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import redis
+
+from weather_app.forecast_store import ForecastSnapshot
+from weather_app.units import CANONICAL_PARAMS
+
+logger = logging.getLogger(__name__)
+
+
+def grid_cell(lat: float, lon: float) -> str:
+    # Open-Meteo's finest models are ~1-2 km; two decimals is well inside a cell
+    return f"{lat:.2f}:{lon:.2f}"
+
+
+@dataclass(frozen=True)
+class WeatherView:
+    name: str
+    locations: Mapping[str, Tuple[float, float]]
+    current: Tuple[str, ...] = ()
+    hourly: Tuple[str, ...] = ()
+    daily: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CellPlan:
+    cell: str
+    lat: float
+    lon: float
+    current: Tuple[str, ...] = ()
+    hourly: Tuple[str, ...] = ()
+    daily: Tuple[str, ...] = ()
+
+    def merge(self, view: WeatherView) -> "CellPlan":
+        return CellPlan(
+            cell=self.cell,
+            lat=self.lat,
+            lon=self.lon,
+            current=tuple(sorted(set(self.current) | set(view.current))),
+            hourly=tuple(sorted(set(self.hourly) | set(view.hourly))),
+            daily=tuple(sorted(set(self.daily) | set(view.daily))),
+        )
+
+
+@dataclass(frozen=True)
+class CellData:
+    current: Dict[str, float]
+    current_fetched_at: float
+    forecast: Optional[ForecastSnapshot] = None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "current": self.current,
+            "current_fetched_at": self.current_fetched_at,
+            "forecast": self.forecast.to_json() if self.forecast is not None else None,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CellData":
+        data = json.loads(raw)
+
+        return cls(
+            current=data["current"],
+            current_fetched_at=data["current_fetched_at"],
+            forecast=ForecastSnapshot.from_json(data["forecast"]) if data.get("forecast") else None,
+        )
+
+
+class ViewRegistry:
+    def __init__(self, views: Iterable[WeatherView] = ()):
+        self._views: Dict[str, WeatherView] = {}
+        for view in views:
+            self.register(view)
+
+    def register(self, view: WeatherView):
+        self._views[view.name] = view
+
+    def __getitem__(self, name: str) -> WeatherView:
+        return self._views[name]
+
+    def plan(self) -> Dict[str, CellPlan]:
+        """The union of variables every registered view needs, per grid cell."""
+        plans: Dict[str, CellPlan] = {}
+
+        for view in self._views.values():
+            for lat, lon in view.locations.values():
+                cell = grid_cell(lat, lon)
+                plans[cell] = plans.get(cell, CellPlan(cell, lat, lon)).merge(view)
+
+        return plans
+
+    def plan_for(self, lat: float, lon: float, view: WeatherView) -> CellPlan:
+        cell = grid_cell(lat, lon)
+        return self.plan().get(cell, CellPlan(cell, lat, lon)).merge(view)
+
+
+class WeatherDataPlane:
+    """
+    Cached per-cell fetches. Current conditions are reused for
+    current_max_age_s and hourly/daily series for forecast_max_age_s; a run
+    that only needs fresh current conditions doesn't refetch the series.
+    """
+
+    KEY_PREFIX = "weather:cell"
+
+    def __init__(
+        self,
+        api: Any,
+        base_url: str,
+        registry: ViewRegistry,
+        client: Optional[redis.Redis] = None,
+        current_max_age_s: float = 240.0,
+        forecast_max_age_s: float = 3600.0,
+    ):
+        self.api = api
+        self.base_url = base_url
+        self.registry = registry
+        self.client = client
+        self.current_max_age_s = current_max_age_s
+        self.forecast_max_age_s = forecast_max_age_s
+        self._local: Dict[str, CellData] = {}
+
+    def _key(self, cell: str) -> str:
+        return f"{self.KEY_PREFIX}:{cell}"
+
+    def _load(self, cell: str) -> Optional[CellData]:
+        data = self._local.get(cell)
+        if data is not None or self.client is None:
+            return data
+
+        raw = self.client.get(self._key(cell))
+        return CellData.from_json(raw) if raw else None
+
+    def _save(self, cell: str, data: CellData):
+        self._local[cell] = data
+
+        if self.client is None:
+            return
+
+        try:
+            ttl_s = int(max(self.current_max_age_s, self.forecast_max_age_s))
+            self.client.set(self._key(cell), data.to_json(), ex=ttl_s)
+        except Exception:
+            logger.exception("Failed to share weather cell %s", cell)
+
+    def get(self, lat: float, lon: float, view: WeatherView, now: Optional[float] = None) -> CellData:
+        plan = self.registry.plan_for(lat, lon, view)
+        now = time.time() if now is None else now
+        cached = self._load(plan.cell)
+
+        current_ok = (
+            cached is not None
+            and now - cached.current_fetched_at < self.current_max_age_s
+            and set(plan.current) <= cached.current.keys()
+        )
+        forecast_ok = not (plan.hourly or plan.daily) or (
+            cached is not None
+            and cached.forecast is not None
+            and cached.forecast.is_fresh(self.forecast_max_age_s, now)
+            and set(plan.hourly) <= cached.forecast.hourly.keys()
+            and set(plan.daily) <= cached.forecast.daily.keys()
+        )
+
+        if current_ok and forecast_ok:
+            return cached
+
+        data = self.fetch(plan, include_forecast=not forecast_ok)
+        if forecast_ok and cached is not None:
+            data = CellData(data.current, data.current_fetched_at, cached.forecast)
+
+        self._save(plan.cell, data)
+        return data
+
+    def fetch(self, plan: CellPlan, include_forecast: bool = True) -> CellData:
+        """One upstream request for a cell, bypassing the cache."""
+        params: Dict[str, Any] = {
+            "latitude": plan.lat,
+            "longitude": plan.lon,
+            "current": list(plan.current),
+            # always canonical units; consumers convert with weather_app.units
+            **CANONICAL_PARAMS,
+            "timezone": "auto",
+        }
+        if include_forecast and plan.hourly:
+            params["hourly"] = list(plan.hourly)
+        if include_forecast and plan.daily:
+            params["daily"] = list(plan.daily)
+
+        response = self.api.weather_api(self.base_url, params=params)[0]
+
+        current = response.Current()
+        values = {name: float(current.Variables(i).Value()) for i, name in enumerate(plan.current)}
+
+        forecast = None
+        if include_forecast and (plan.hourly or plan.daily):
+            forecast = ForecastSnapshot.from_response(response, list(plan.hourly), list(plan.daily))
+
+        return CellData(current=values, current_fetched_at=time.time(), forecast=forecast)
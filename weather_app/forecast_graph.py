@@ -0,0 +1,134 @@
+"""
+Next-hours forecast as a board graph: temperature height bars coloured by
+temperature band, with a precipitation-probability strip underneath.
+
+The hourly series come from the detailed view's cell, so the graph costs no
+extra API calls; binning and tile mapping are one vectorized pass.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vestaboard import characters
+from vestaboard.layout_codec import BOARD_COLS
+from vestaboard.templates import Cell, ScreenTemplate
+from weather_app.forecast_store import ForecastSnapshot
+from weather_app.units import convert_temperature, temperature_symbol
+
+BAR_ROWS = 4
+
+# canonical (celsius) upper bounds of each bar colour; hotter than the last is red
+TEMP_BANDS_C = np.array([0.0, 10.0, 18.0, 25.0, 30.0])
+TEMP_COLORS = np.array([
+    characters.WHITE,
+    characters.BLUE,
+    characters.GREEN,
+    characters.YELLOW,
+    characters.ORANGE,
+    characters.RED,
+])
+
+# precipitation probability (%) upper bounds; a likely-rain column is violet
+RAIN_BANDS = np.array([20.0, 40.0, 70.0])
+RAIN_COLORS = np.array([characters.BLANK, characters.WHITE, characters.BLUE, characters.VIOLET])
+
+GRAPH_SCREEN = ScreenTemplate([
+    [Cell(9, slot="title"), Cell(13, slot="summary", justify="right")],
+    *([Cell(BOARD_COLS, slot=f"bar.{r}")] for r in range(BAR_ROWS)),
+    [Cell(BOARD_COLS, slot="rain")],
+]).compile()
+
+
+def bin_columns(values: np.ndarray, columns: int = BOARD_COLS) -> np.ndarray:
+    """
+    Fit an hourly series to `columns`: the mean of each column's hours when
+    there are more hours than columns, otherwise each hour repeated.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+
+    if n == 0:
+        return np.full(columns, np.nan)
+    if n < columns:
+        return values[np.arange(columns) * n // columns]
+
+    column_of_hour = np.arange(n) * columns // n
+    valid = ~np.isnan(values)
+    sums = np.bincount(column_of_hour[valid], weights=values[valid], minlength=columns)
+    counts = np.bincount(column_of_hour[valid], minlength=columns)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def graph_tiles(temps_c: np.ndarray, rain_pct: np.ndarray, rows: int = BAR_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (bars, rain): a rows x columns grid of temperature bars, scaled to the
+    window's own min..max with at least one tile per column, and one row
+    of precipitation tiles. Missing hours leave a blank column.
+    """
+    known = temps_c[~np.isnan(temps_c)]
+    # an all-missing window is all blank columns; nanmin/nanmax would raise on it
+    lo, hi = (known.min(), known.max()) if known.size else (0.0, 0.0)
+    span = hi - lo if hi > lo else 1.0
+
+    heights = 1 + np.rint((temps_c - lo) / span * (rows - 1))
+    heights = np.where(np.isnan(temps_c), 0, heights)
+
+    colors = TEMP_COLORS[np.searchsorted(TEMP_BANDS_C, np.nan_to_num(temps_c), side="right")]
+    # row 0 is the top; a column fills its bottom `height` rows
+    filled = np.arange(rows)[:, None] >= rows - heights[None, :]
+    bars = np.where(filled, colors[None, :], characters.BLANK)
+
+    rain = RAIN_COLORS[np.searchsorted(RAIN_BANDS, np.nan_to_num(rain_pct), side="right")]
+    return bars, rain
+
+
+@dataclass(frozen=True)
+class ForecastGraph:
+    hours: int
+    temp_min: float
+    temp_max: float
+    rain_max: float
+    unit: str
+    bars: List[List[int]]
+    rain: List[int]
+    # a last good graph served while the forecast couldn't be refreshed
+    is_stale: bool = False
+
+    def slot_values(self) -> Dict[str, str]:
+        def encode(codes: List[int]) -> str:
+            return "".join(f"{{{code}}}" for code in codes)
+
+        return {
+            "title": "STALE" if self.is_stale else f"NEXT {self.hours}H",
+            "summary": f"{self.temp_min:.0f}-{self.temp_max:.0f}{temperature_symbol(self.unit)} {self.rain_max:.0f}%",
+            **{f"bar.{r}": encode(row) for r, row in enumerate(self.bars)},
+            "rain": encode(self.rain),
+        }
+
+
+def build_forecast_graph(forecast: ForecastSnapshot, hours: int, unit: str, now: Optional[datetime] = None) -> ForecastGraph:
+    """The next `hours` of `forecast` as a graph; raises ValueError if none have a temperature."""
+    temps_c = forecast.next_hours("temperature_2m", hours, now)
+    rain_pct = forecast.next_hours("precipitation_probability", hours, now)
+
+    known = temps_c[~np.isnan(temps_c)]
+    if known.size == 0:
+        raise ValueError(f"No forecast temperatures for the next {hours}h")
+    known_rain = rain_pct[~np.isnan(rain_pct)]
+
+    bars, rain = graph_tiles(bin_columns(temps_c), bin_columns(rain_pct))
+    temp_min, temp_max = convert_temperature([known.min(), known.max()], unit).tolist()
+
+    return ForecastGraph(
+        hours=int(temps_c.size),
+        temp_min=temp_min,
+        temp_max=temp_max,
+        rain_max=float(known_rain.max()) if known_rain.size else 0.0,
+        unit=unit,
+        bars=bars.tolist(),
+        rain=rain.tolist(),
+    )
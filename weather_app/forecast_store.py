@@ -0,0 +1,123 @@
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass(frozen=True)
+class ForecastSnapshot:
+    """
+    Hourly and daily series for one location. Times are UTC unix seconds
+    marking the start of each hour/day; daily days are local to the location.
+    """
+
+    hourly_time: np.ndarray
+    hourly: Dict[str, np.ndarray]
+    daily_time: np.ndarray
+    daily: Dict[str, np.ndarray]
+    utc_offset_s: int
+    fetched_at: float
+
+    @classmethod
+    def from_response(
+        cls,
+        response,
+        hourly_variables: List[str],
+        daily_variables: List[str],
+        fetched_at: Optional[float] = None,
+    ) -> "ForecastSnapshot":
+        """Build from an openmeteo_requests response, variables in request order."""
+        hourly_time, hourly = _series(response.Hourly() if hourly_variables else None, hourly_variables)
+        daily_time, daily = _series(response.Daily() if daily_variables else None, daily_variables)
+
+        return cls(
+            hourly_time=hourly_time,
+            hourly=hourly,
+            daily_time=daily_time,
+            daily=daily,
+            utc_offset_s=int(response.UtcOffsetSeconds()),
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+        )
+
+    def is_fresh(self, max_age_s: float, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        # the series must still cover the current hour
+        covered = self.hourly_time.size == 0 or self.hourly_time[-1] >= now - 3600
+        return covered and now - self.fetched_at < max_age_s
+
+    def _hour_index(self, now_ts: float) -> int:
+        return max(int(np.searchsorted(self.hourly_time, now_ts, side="right")) - 1, 0)
+
+    def _local_day_end(self, now_ts: float) -> int:
+        local = int(now_ts) + self.utc_offset_s
+        return (local // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY - self.utc_offset_s
+
+    def rest_of_day_max(self, name: str, now: Optional[datetime] = None) -> float:
+        """Max of an hourly series from the current hour to local midnight."""
+        now_ts = _timestamp(now)
+        start = self._hour_index(now_ts)
+        end = int(np.searchsorted(self.hourly_time, self._local_day_end(now_ts), side="left"))
+
+        window = self.hourly[name][start:max(end, start + 1)]
+        return float(np.nanmax(window))
+
+    def next_hours_range(self, name: str, hours: int, now: Optional[datetime] = None) -> Tuple[float, float]:
+        """(min, max) of an hourly series over the next `hours`, current hour included."""
+        start = self._hour_index(_timestamp(now))
+
+        window = self.hourly[name][start:start + max(hours, 1)]
+        return float(np.nanmin(window)), float(np.nanmax(window))
+
+    def next_hours(self, name: str, hours: int, now: Optional[datetime] = None) -> np.ndarray:
+        start = self._hour_index(_timestamp(now))
+        return self.hourly[name][start:start + hours]
+
+    def today(self, name: str, now: Optional[datetime] = None) -> float:
+        """Today's (local) value of a daily series."""
+        idx = max(int(np.searchsorted(self.daily_time, _timestamp(now), side="right")) - 1, 0)
+        return float(self.daily[name][idx])
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "hourly_time": self.hourly_time.tolist(),
+            "hourly": {name: _nan_to_none(v) for name, v in self.hourly.items()},
+            "daily_time": self.daily_time.tolist(),
+            "daily": {name: _nan_to_none(v) for name, v in self.daily.items()},
+            "utc_offset_s": self.utc_offset_s,
+            "fetched_at": self.fetched_at,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ForecastSnapshot":
+        data = json.loads(raw)
+
+        return cls(
+            hourly_time=np.asarray(data["hourly_time"], dtype=np.int64),
+            hourly={name: np.asarray(v, dtype=np.float64) for name, v in data["hourly"].items()},
+            daily_time=np.asarray(data["daily_time"], dtype=np.int64),
+            daily={name: np.asarray(v, dtype=np.float64) for name, v in data["daily"].items()},
+            utc_offset_s=data["utc_offset_s"],
+            fetched_at=data["fetched_at"],
+        )
+
+
+def _series(block, variables: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    if block is None:
+        return np.empty(0, dtype=np.int64), {}
+
+    times = np.arange(block.Time(), block.TimeEnd(), block.Interval(), dtype=np.int64)
+    values = {name: block.Variables(i).ValuesAsNumpy().astype(np.float64) for i, name in enumerate(variables)}
+    return times, values
+
+
+def _timestamp(now: Optional[datetime]) -> float:
+    return now.timestamp() if now is not None else time.time()
+
+
+def _nan_to_none(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else float(v) for v in values]
@@ -0,0 +1,49 @@
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+
+class LastGoodStore:
+    """
+    Last successfully fetched weather value per request key, so a slow or
+    failing Open-Meteo can be answered from a local read. Kept in process
+    memory and, when a Redis client is given, shared across job runs.
+    """
+
+    KEY_PREFIX = "weather:last_good"
+
+    def __init__(self, client: redis.Redis | None = None, ttl_s: int = 86400):
+        self.client = client
+        self.ttl_s = ttl_s
+        self._local: Dict[str, Tuple[Any, float]] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{key}"
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(payload, fetched_at) for the last good value, if any."""
+        entry = self._local.get(key)
+        if entry is not None or self.client is None:
+            return entry
+
+        raw = self.client.get(self._key(key))
+        if not raw:
+            return None
+
+        data = json.loads(raw)
+        entry = (data["payload"], data["fetched_at"])
+        self._local[key] = entry
+        return entry
+
+    def put(self, key: str, payload: Any, fetched_at: Optional[float] = None):
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        self._local[key] = (payload, fetched_at)
+
+        if self.client is not None:
+            self.client.set(
+                self._key(key),
+                json.dumps({"payload": payload, "fetched_at": fetched_at}),
+                ex=self.ttl_s,
+            )
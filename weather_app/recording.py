@@ -0,0 +1,141 @@
+"""
+Record and replay raw Open-Meteo responses.
+
+openmeteo_requests only needs a session with a requests-style `request`
+method, so both classes here plug in through WeatherClient(api_session=...):
+
+    client = WeatherClient(api_session=RecordingSession(dir, inner=session))
+    client = WeatherClient(api_session=ReplaySession(dir))
+
+Each request is stored as one JSON file named by a hash of its method, URL
+and params, with the FlatBuffers body base64-encoded.
+"""
+import base64
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import requests
+
+# params that vary per location; a non-strict replay ignores them
+LOCATION_PARAMS = frozenset({"latitude", "longitude"})
+
+
+class ReplayMissError(LookupError):
+    pass
+
+
+class RecordedResponse:
+    """The parts of requests.Response that openmeteo_requests reads."""
+
+    def __init__(self, status_code: int, content: bytes, url: str = ""):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} replayed error for url: {self.url}", response=self)
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]], ignore: frozenset = frozenset()) -> str:
+    canonical = {
+        name: ",".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+        for name, value in (params or {}).items()
+        if name not in ignore
+    }
+    raw = json.dumps([method.upper(), url, sorted(canonical.items())])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+class RecordingSession:
+    """Passes requests through to `inner` and writes every response to disk."""
+
+    def __init__(self, directory: str, inner: Any = None):
+        self.directory = directory
+        self.inner = inner or requests.Session()
+        os.makedirs(directory, exist_ok=True)
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        response = self.inner.request(method, url, params=params, **kwargs)
+
+        record = {
+            "method": method.upper(),
+            "url": url,
+            "params": params or {},
+            "status_code": response.status_code,
+            "content_b64": base64.b64encode(response.content).decode("ascii"),
+        }
+        path = os.path.join(self.directory, f"{request_key(method, url, params)}.json")
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2, default=str)
+
+        return response
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url: str, data: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.request("POST", url, params=data, **kwargs)
+
+
+class ReplaySession:
+    """
+    Serves recorded responses without touching the network. With
+    strict=False a request for an unrecorded location falls back to any
+    recording with the same variables.
+    """
+
+    def __init__(self, directory: str, strict: bool = True):
+        self.directory = directory
+        self.strict = strict
+        self.hits = 0
+
+        self._exact: Dict[str, RecordedResponse] = {}
+        self._by_variables: Dict[str, RecordedResponse] = {}
+
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+
+            with open(os.path.join(directory, name)) as f:
+                record = json.load(f)
+
+            response = RecordedResponse(
+                status_code=record["status_code"],
+                content=base64.b64decode(record["content_b64"]),
+                url=record["url"],
+            )
+            method, url, params = record["method"], record["url"], record["params"]
+
+            self._exact[request_key(method, url, params)] = response
+            self._by_variables.setdefault(request_key(method, url, params, LOCATION_PARAMS), response)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        response = self._exact.get(request_key(method, url, params))
+
+        if response is None and not self.strict:
+            response = self._by_variables.get(request_key(method, url, params, LOCATION_PARAMS))
+
+        if response is None:
+            raise ReplayMissError(f"No recorded response for {method.upper()} {url} {params}")
+
+        self.hits += 1
+        return response
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url: str, data: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.request("POST", url, params=data, **kwargs)
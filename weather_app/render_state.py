@@ -0,0 +1,74 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Mapping
+
+import redis
+
+
+@dataclass(frozen=True)
+class RenderedState:
+    digest: str
+    # the values the board was last rendered from, for hysteresis
+    values: Dict[str, float]
+
+
+def layout_digest(layout: List[List[int]]) -> str:
+    """Digest of a locally rendered board layout."""
+    return hashlib.sha1(bytes(code for row in layout for code in row)).hexdigest()
+
+
+def hold_values(
+    values: Mapping[str, float],
+    previous: Mapping[str, float],
+    thresholds: Mapping[str, float],
+) -> Dict[str, float]:
+    """
+    Keep the previously rendered value wherever the new one moved by less
+    than its threshold, so readings hovering on a rounding boundary don't
+    flap the board. Thresholds are keyed by the value name's last dotted
+    part, e.g. "temperature" covers "KONA.temperature".
+    """
+    held = {}
+    for name, value in values.items():
+        last = previous.get(name)
+        threshold = thresholds.get(name.rsplit(".", 1)[-1], 0.0)
+
+        if last is not None and abs(value - last) < threshold:
+            held[name] = last
+        else:
+            held[name] = value
+
+    return held
+
+
+class RenderStateStore:
+    """
+    Last rendered state per job. A run whose components digest matches the
+    stored one has nothing new to show and can skip compose and send.
+    """
+
+    KEY_PREFIX = "weather:rendered"
+
+    def __init__(self, client: redis.Redis, job: str, ttl_s: int = 86400):
+        self.client = client
+        self.job = job
+        self.ttl_s = ttl_s
+
+    @property
+    def key(self) -> str:
+        return f"{self.KEY_PREFIX}:{self.job}"
+
+    def get(self) -> RenderedState | None:
+        data = self.client.hgetall(self.key)
+
+        if not data or "digest" not in data:
+            return None
+
+        return RenderedState(digest=data["digest"], values=json.loads(data.get("values") or "{}"))
+
+    def put(self, digest: str, values: Mapping[str, float]):
+        pipe = self.client.pipeline()
+        pipe.hset(self.key, mapping={"digest": digest, "values": json.dumps(dict(values))})
+        pipe.expire(self.key, self.ttl_s)
+        pipe.execute()
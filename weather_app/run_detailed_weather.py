@@ -1,11 +1,18 @@
 import logging
 import sys
-from typing import Optional
+from dataclasses import replace
+from typing import Dict, List, Optional
 
-from app import build_weather_container
+from app import build_weather_cadence, build_weather_container
 from vestaboard.board_message import BoardMessage
 from vestaboard.board_state import BoardState
-from weather_app.weather_header import WeatherHeader
+from vestaboard.pipeline import Stage, StopPipeline, UpdatePipeline, display_stages
+from vestaboard.templates import Cell, RenderedScreen, ScreenTemplate
+from weather_app.cadence import WeatherObservation
+from weather_app.cities import DETAILED_COORDS
+from weather_app.weather import DetailedWeather
+from weather_app.render_state import RenderStateStore, hold_values, layout_digest
+from weather_app.weather_header import HEADER_ROW, WeatherHeader
 
 from vestaboard import utils
 
@@ -19,25 +26,25 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def format_string(
-    label: str,
+SOURCE = "detailed_weather_app"
+
+# numeric fields whose rendered value is held back by hysteresis
+HELD_FIELDS = ("temp_now", "feels_like", "temp_max", "temp_min", "uv_idx", "rain_chance_today")
+
+def format_value(
     value: float,
     unit: Optional[str] = None,
     precision: Optional[int] = None,
 ) -> str:
     """
-    Fixed-width 10 chars:
+    At most 5 chars, right-aligned in its cell by the template:
 
     precision:
       None  -> default 1 decimal
       0     -> integer (100.0 -> 100)
       N     -> N decimals
     """
-    total_width = 10
-    label_width = 5
-    value_width = total_width - label_width
-
-    label_fixed = f"{label:<{label_width}}"[:label_width]
+    value_width = 5
 
     p = 1 if precision is None else precision
 
@@ -50,11 +57,35 @@ def format_string(
 
     value_str = f"{value_core}{unit}" if unit else value_core
 
-    if len(value_str) > value_width:
-        value_str = value_str[-value_width:]
+    return value_str[-value_width:]
+
+
+def _reading(label: str, slot: str) -> List[Cell]:
+    return [Cell(5, label), Cell(5, slot=slot, justify="right")]
+
+
+DETAILED_SCREEN = ScreenTemplate([
+    HEADER_ROW,
+    [Cell(5, slot="city"), Cell(2), Cell(15, slot="condition", justify="right")],
+    [*_reading("NOW", "temp_now"), Cell(2), *_reading("UVI", "uv_idx")],
+    [*_reading("LIKE", "feels_like"), Cell(2), *_reading("RAIN", "rain_chance_today")],
+    _reading("MAX", "temp_max"),
+    _reading("MIN", "temp_min"),
+]).compile()
 
-    return f"{label_fixed}{value_str:>{value_width}}"
 
+def detailed_slot_values(detailed: DetailedWeather, weather_header: WeatherHeader) -> Dict[str, str]:
+    return {
+        **weather_header.slot_values(),
+        "city": detailed.city,
+        "condition": detailed.condition,
+        "temp_now": format_value(detailed.temp_now, detailed.unit),
+        "uv_idx": format_value(detailed.uv_idx),
+        "feels_like": format_value(detailed.feels_like, detailed.unit),
+        "rain_chance_today": format_value(detailed.rain_chance_today, "%", 0),
+        "temp_max": format_value(detailed.temp_max, detailed.unit),
+        "temp_min": format_value(detailed.temp_min, detailed.unit),
+    }
 
 
 def run():
@@ -66,117 +97,79 @@ def run():
 
     container = build_weather_container()
     wc = container.weather_client
-    weather_header = WeatherHeader()
-    vb = container.board.vestaboard_messenger
     manager = container.board.display_manager
 
-    detailed = wc.get_detailed_weather("WOODINVILLE", 47.75, -122.16)
+    # the cadence gates the upstream fetch only; the header still updates every run
+    cadence = build_weather_cadence(container, SOURCE)
+    due = cadence.is_due()
+    if not due:
+        logger.info("Not due under the adaptive cadence; reusing the last fetch")
 
-    vbml_components = []
-    for hc in weather_header.compose_header_components():
-        vbml_components.append(hc)
+    render_state = RenderStateStore(container.board.redis_data_store.client, SOURCE)
 
-    vbml_components.append(
-        utils.compose_vbml_component(
-            detailed.city,
-            justify="left",
-            align="top",
-            height=1,
-            width=5
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            "",
-            justify="left",
-            align="top",
-            height=1,
-            width=2
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            detailed.condition,
-            justify="right",
-            align="top",
-            height=1,
-            width=15
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("NOW ", detailed.temp_now, detailed.unit),
-            justify="left",
-            align="top",
-            height=1,
-            width=11
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("UVI ", detailed.uv_idx),
-            justify="right",
-            align="top",
-            height=1,
-            width=11
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("LIKE ", detailed.feels_like, detailed.unit),
-            justify="left",
-            align="top",
-            height=1,
-            width=11
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("RAIN ", detailed.rain_chance_today, "%", 0),
-            justify="right",
-            align="top",
-            height=1,
-            width=11
-        )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("MAX ", detailed.temp_max, detailed.unit),
-            justify="left",
-            align="top",
-            height=1,
-            width=22
+    def fetch() -> DetailedWeather:
+        detailed = wc.get_detailed_weather("WOODINVILLE", *DETAILED_COORDS["WOODINVILLE"], refetch=due)
+
+        if due and not detailed.is_stale:
+            interval_s = cadence.observe({
+                detailed.city: WeatherObservation(detailed.temp_now, detailed.weather_code, detailed.precipitation_probability)
+            })
+            logger.info("Next detailed weather fetch in %.0fs", interval_s)
+
+        return detailed
+
+    def load_previous():
+        return render_state.get(), manager.shown_record(SOURCE)
+
+    def render(fetch, load_previous):
+        previous, record = load_previous
+
+        held_values = hold_values(
+            {name: getattr(fetch, name) for name in HELD_FIELDS},
+            previous.values if previous else {},
+            container.config.hysteresis_thresholds(),
         )
-    )
-
-    vbml_components.append(
-        utils.compose_vbml_component(
-            format_string("MIN ", detailed.temp_min, detailed.unit),
-            justify="left",
-            align="top",
-            height=1,
-            width=22
+        detailed = replace(fetch, **held_values)
+
+        weather_header = WeatherHeader(stale=detailed.is_stale)
+        # only the slots that changed since the board's last render are re-encoded
+        screen = DETAILED_SCREEN.render_screen(
+            detailed_slot_values(detailed, weather_header),
+            previous=RenderedScreen.from_record(record),
         )
-    )
+        digest = layout_digest(screen.layout)
+
+        if previous and previous.digest == digest and record is not None:
+            raise StopPipeline("Rendered detailed weather unchanged; skipping send")
 
-    vbml_payload = utils.compose_vbml_payload(vbml_components)
-    logger.debug("VBML payload prepared")
-    vbml_layout = vb.vbml_compose_layout(vbml_payload)
+        return screen, digest, held_values
+
+    def compose(render) -> BoardMessage:
+        return BoardMessage.from_screen(BoardState.WEATHER, SOURCE, render[0])
+
+    # the Redis reads overlap the weather fetch
+    pipeline = UpdatePipeline([
+        Stage("fetch", fetch),
+        Stage("load_previous", load_previous),
+        Stage("render", render, deps=("fetch", "load_previous")),
+        Stage("compose", compose, deps=("render",)),
+        *display_stages(manager, BoardState.WEATHER, content="compose"),
+    ])
 
     try:
-        msg = BoardMessage(BoardState.WEATHER, "detailed_weather_app", layout=vbml_layout)
-        manager.send(msg)
-        logger.info("Message sent successfully")
+        result = pipeline.run()
     except Exception:
         logger.exception("Error sending message")
         raise
 
+    if not result.completed:
+        logger.info(result.stopped)
+        return
+
+    logger.info("Message sent successfully in %.2fs", result.elapsed_s)
+
+    _, digest, held_values = result.results["render"]
+    render_state.put(digest, held_values)
+
 if __name__ == "__main__":
     run()
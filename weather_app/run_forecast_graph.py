@@ -0,0 +1,89 @@
+import logging
+import sys
+
+from app import build_weather_container
+from vestaboard.board_message import BoardMessage
+from vestaboard.board_state import BoardState
+from vestaboard.pipeline import Stage, StopPipeline, UpdatePipeline, display_stages
+from vestaboard.templates import RenderedScreen
+from weather_app.cities import DETAILED_COORDS
+from weather_app.forecast_graph import GRAPH_SCREEN, ForecastGraph
+from weather_app.render_state import RenderStateStore, layout_digest
+
+from vestaboard import utils
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(message)s",
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "forecast_graph_app"
+
+CITY = "WOODINVILLE"
+# one column per hour
+GRAPH_HOURS = 22
+
+
+def run():
+    logger.info("Forecast graph job started")
+
+    # Time gate: only run between 08:00–23:00 Pacific Time
+    if not utils.time_gate(logger, 8, 0, 23, 0):
+        return
+
+    container = build_weather_container()
+    wc = container.weather_client
+    manager = container.board.display_manager
+
+    render_state = RenderStateStore(container.board.redis_data_store.client, SOURCE)
+
+    def fetch() -> ForecastGraph:
+        return wc.get_forecast_graph(*DETAILED_COORDS[CITY], hours=GRAPH_HOURS)
+
+    def load_previous():
+        return render_state.get(), manager.shown_record(SOURCE)
+
+    def render(fetch, load_previous):
+        previous, record = load_previous
+
+        screen = GRAPH_SCREEN.render_screen(fetch.slot_values(), previous=RenderedScreen.from_record(record))
+        digest = layout_digest(screen.layout)
+
+        if previous and previous.digest == digest and record is not None:
+            raise StopPipeline("Forecast graph unchanged; skipping send")
+
+        return screen, digest
+
+    def compose(render) -> BoardMessage:
+        return BoardMessage.from_screen(BoardState.WEATHER, SOURCE, render[0])
+
+    pipeline = UpdatePipeline([
+        Stage("fetch", fetch),
+        Stage("load_previous", load_previous),
+        Stage("render", render, deps=("fetch", "load_previous")),
+        Stage("compose", compose, deps=("render",)),
+        *display_stages(manager, BoardState.WEATHER, content="compose"),
+    ])
+
+    try:
+        result = pipeline.run()
+    except Exception:
+        logger.exception("Error sending forecast graph")
+        raise
+
+    if not result.completed:
+        logger.info(result.stopped)
+        return
+
+    logger.info("Forecast graph sent successfully in %.2fs", result.elapsed_s)
+
+    _, digest = result.results["render"]
+    render_state.put(digest, {})
+
+if __name__ == "__main__":
+    run()
@@ -1,11 +1,16 @@
 import logging
 import sys
-from typing import List
+from dataclasses import replace
+from typing import Dict, List, Tuple
 
-from app import build_weather_container
+from app import build_weather_cadence, build_weather_container
 from vestaboard.board_message import BoardMessage
 from vestaboard.board_state import BoardState
-from weather_app.weather_header import WeatherHeader
+from vestaboard.pipeline import Stage, StopPipeline, UpdatePipeline, display_stages
+from vestaboard.templates import Cell, RenderedScreen, ScreenTemplate
+from weather_app.cadence import WeatherObservation
+from weather_app.render_state import RenderStateStore, hold_values, layout_digest
+from weather_app.weather_header import HEADER_ROW, WeatherHeader
 from weather_app.weather import WeatherNow, format_weather_line
 
 from vestaboard import utils
@@ -20,6 +25,37 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+SOURCE = "weather_app"
+
+def hold_weather_values(
+    weather_data: List[WeatherNow],
+    previous: Dict[str, float],
+    thresholds: Dict[str, float],
+) -> Tuple[List[WeatherNow], Dict[str, float]]:
+    held = hold_values(
+        {f"{now.city}.temperature": now.temperature for now in weather_data},
+        previous,
+        thresholds,
+    )
+
+    return [replace(now, temperature=held[f"{now.city}.temperature"]) for now in weather_data], held
+
+# one line per city under the header
+CITIES_PER_SCREEN = 5
+
+WEATHER_SCREEN = ScreenTemplate([
+    HEADER_ROW,
+    *([Cell(22, slot=f"city.{i}")] for i in range(CITIES_PER_SCREEN)),
+]).compile()
+
+
+def weather_slot_values(weather_data: List[WeatherNow], weather_header: WeatherHeader) -> Dict[str, str]:
+    return {
+        **weather_header.slot_values(),
+        **{f"city.{i}": "{67}" + format_weather_line(now) for i, now in enumerate(weather_data[:CITIES_PER_SCREEN])},
+    }
+
+
 def run():
     logger.info("Weather job started")
 
@@ -29,44 +65,89 @@ def run():
 
     container = build_weather_container()
     wc = container.weather_client
-    weather_header = WeatherHeader()
-    vb = container.board.vestaboard_messenger
     manager = container.board.display_manager
 
-    weather_data: List[WeatherNow] = []
+    # the cadence gates the upstream fetch only; the header's date and time
+    # still update every run, from the last fetched values
+    cadence = build_weather_cadence(container, SOURCE)
+    due = cadence.is_due()
+    if not due:
+        logger.info("Not due under the adaptive cadence; reusing the last fetch")
+
+    render_state = RenderStateStore(container.board.redis_data_store.client, SOURCE)
+
+    def fetch() -> List[WeatherNow]:
+        try:
+            weather_data = wc.get_current_weather_multi_cities(refetch=due)
+            logger.info("Successfully retrieved weather info (%d cities)", len(weather_data))
+        except Exception:
+            logger.exception("Error retrieving weather info")
+            # In production/scheduled runs, fail fast so the platform marks the job as failed.
+            raise
+
+        if not weather_data:
+            raise StopPipeline("No weather data returned; skipping message send.")
+
+        if due and not any(now.is_stale for now in weather_data):
+            interval_s = cadence.observe({
+                now.city: WeatherObservation(now.temperature, now.weather_code, now.precipitation_probability)
+                for now in weather_data
+            })
+            logger.info("Next weather fetch in %.0fs", interval_s)
+
+        return weather_data
+
+    def load_previous():
+        return render_state.get(), manager.shown_record(SOURCE)
+
+    def render(fetch, load_previous):
+        previous, record = load_previous
+
+        weather_data, held_values = hold_weather_values(
+            fetch,
+            previous.values if previous else {},
+            container.config.hysteresis_thresholds(),
+        )
+
+        weather_header = WeatherHeader(stale=any(now.is_stale for now in weather_data))
+        # only the city lines (or header parts) that changed are re-encoded
+        screen = WEATHER_SCREEN.render_screen(
+            weather_slot_values(weather_data, weather_header),
+            previous=RenderedScreen.from_record(record),
+        )
+        digest = layout_digest(screen.layout)
+
+        if previous and previous.digest == digest and record is not None:
+            raise StopPipeline("Rendered weather unchanged; skipping send")
+
+        return screen, digest, held_values
+
+    def compose(render) -> BoardMessage:
+        return BoardMessage.from_screen(BoardState.WEATHER, SOURCE, render[0])
+
+    # the Redis reads overlap the weather fetch
+    pipeline = UpdatePipeline([
+        Stage("fetch", fetch),
+        Stage("load_previous", load_previous),
+        Stage("render", render, deps=("fetch", "load_previous")),
+        Stage("compose", compose, deps=("render",)),
+        *display_stages(manager, BoardState.WEATHER, content="compose"),
+    ])
 
     try:
-        weather_data = wc.get_current_weather_multi_cities()
-        logger.info("Successfully retrieved weather info (%d cities)", len(weather_data))
+        result = pipeline.run()
     except Exception:
-        logger.exception("Error retrieving weather info")
-        # In production/scheduled runs, fail fast so the platform marks the job as failed.
+        logger.exception("Error sending message")
         raise
 
-    if not weather_data:
-        logger.warning("No weather data returned; skipping message send.")
+    if not result.completed:
+        logger.info(result.stopped)
         return
 
-    vbml_components = []
-    for hc in weather_header.compose_header_components():
-        vbml_components.append(hc)
-
-    for now in weather_data:
-        weather_string = "{67}" + format_weather_line(now)
-        component = utils.compose_vbml_component(weather_string)
-        vbml_components.append(component)
+    logger.info("Message sent successfully in %.2fs", result.elapsed_s)
 
-    vbml_payload = utils.compose_vbml_payload(vbml_components)
-    logger.debug("VBML payload prepared")
-    vbml_layout = vb.vbml_compose_layout(vbml_payload)
-
-    try:
-        msg = BoardMessage(BoardState.WEATHER, "weather_app", layout=vbml_layout)
-        manager.send(msg)
-        logger.info("Message sent successfully")
-    except Exception:
-        logger.exception("Error sending message")
-        raise
+    _, digest, held_values = result.results["render"]
+    render_state.put(digest, held_values)
 
 
 if __name__ == "__main__":
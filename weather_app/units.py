@@ -0,0 +1,52 @@
+"""
+Weather data is fetched and cached in one canonical unit system and
+converted locally, so every unit a board displays shares one fetch.
+"""
+from typing import Dict
+
+import numpy as np
+
+CANONICAL_TEMP_UNIT = "celsius"
+CANONICAL_WIND_UNIT = "kmh"
+
+CANONICAL_PARAMS: Dict[str, str] = {
+    "temperature_unit": CANONICAL_TEMP_UNIT,
+    "windspeed_unit": CANONICAL_WIND_UNIT,
+}
+
+# multiply a km/h value by these
+_KMH_TO = {
+    "kmh": 1.0,
+    "mph": 1 / 1.609344,
+    "ms": 1 / 3.6,
+    "kn": 1 / 1.852,
+}
+
+TEMPERATURE_UNITS = frozenset({"celsius", "fahrenheit"})
+WIND_UNITS = frozenset(_KMH_TO)
+
+
+def convert_temperature(celsius, unit: str) -> np.ndarray:
+    """Celsius values (scalar or array) to `unit`, as a float64 array."""
+    values = np.asarray(celsius, dtype=np.float64)
+
+    if unit == "celsius":
+        return values
+    if unit == "fahrenheit":
+        return values * 1.8 + 32.0
+
+    raise ValueError(f"Unknown temperature unit: {unit!r}")
+
+
+def convert_speed(kmh, unit: str) -> np.ndarray:
+    """km/h values (scalar or array) to `unit`, as a float64 array."""
+    try:
+        factor = _KMH_TO[unit]
+    except KeyError:
+        raise ValueError(f"Unknown wind speed unit: {unit!r}") from None
+
+    return np.asarray(kmh, dtype=np.float64) * factor
+
+
+def temperature_symbol(unit: str) -> str:
+    return "C" if unit == "celsius" else "F"
@@ -1,15 +1,35 @@
+import atexit
+import logging
 import os
+import threading
 import time
 import random
-from dataclasses import dataclass
-from typing import Dict, Any, List
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
 from retry_requests import retry
 from datetime import datetime, timezone
 import requests
+import numpy as np
 import openmeteo_requests
+import redis
 import requests_cache
 
-from weather_app.cities import CITY_COORDS
+from weather_app.cities import CITY_COORDS, DETAILED_COORDS
+from weather_app.data_plane import CellData, ViewRegistry, WeatherDataPlane, WeatherView, grid_cell
+from weather_app.forecast_graph import ForecastGraph, build_forecast_graph
+from weather_app.last_good import LastGoodStore
+from weather_app.units import (
+    CANONICAL_TEMP_UNIT,
+    TEMPERATURE_UNITS,
+    WIND_UNITS,
+    convert_speed,
+    convert_temperature,
+    temperature_symbol,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 @dataclass(frozen=True)
 class WeatherNow:
@@ -18,6 +38,10 @@ class WeatherNow:
     unit: str
     wind_speed: int
     wind_unit: str
+    # served from the last good value because the upstream was slow or down
+    is_stale: bool = False
+    weather_code: Optional[int] = None
+    precipitation_probability: Optional[float] = None
 
 @dataclass(frozen=True)
 class DetailedWeather:
@@ -30,6 +54,9 @@ class DetailedWeather:
     rain_chance_today: float
     condition: str
     unit: str
+    is_stale: bool = False
+    weather_code: Optional[int] = None
+    precipitation_probability: Optional[float] = None
 
 
 class WeatherClient:
@@ -40,6 +67,25 @@ class WeatherClient:
 
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
+    CURRENT_VIEW = WeatherView(
+        name="current",
+        locations=CITY_COORDS,
+        current=("temperature_2m", "wind_speed_10m", "weather_code", "precipitation_probability"),
+    )
+    DETAILED_VIEW = WeatherView(
+        name="detailed",
+        locations=DETAILED_COORDS,
+        current=("temperature_2m", "apparent_temperature", "weather_code", "precipitation_probability"),
+        hourly=("precipitation_probability", "temperature_2m"),
+        daily=("temperature_2m_max", "temperature_2m_min", "uv_index_max"),
+    )
+    # the detailed view's hourly series, so the graph shares its cells' fetches
+    GRAPH_VIEW = WeatherView(
+        name="graph",
+        locations=DETAILED_COORDS,
+        hourly=("precipitation_probability", "temperature_2m"),
+    )
+
     def __init__(
         self,
         temp_unit: str = "celsius",
@@ -49,15 +95,23 @@ class WeatherClient:
         retry_base_delay_s: float = 0.8,
         retry_max_delay_s: float = 10.0,
         session: requests.Session | None = None,
+        api_session: Any = None,
+        data_client: redis.Redis | None = None,
+        refresh_s: float = 240.0,
+        forecast_max_age_s: float = 3600.0,
+        last_good_store: LastGoodStore | None = None,
+        stale_max_age_s: float = 1800.0,
+        revalidate_wait_s: float = 3.0,
+        revalidate_exit_wait_s: float = 20.0,
     ):
         self.cities_coords = CITY_COORDS
         self.temp_unit = temp_unit
         self.wind_unit = wind_unit
 
-        if self.temp_unit not in {"fahrenheit", "celsius"}:
-            raise ValueError("WEATHER_UNIT must be 'fahrenheit' or 'celsius'")
-        if self.wind_unit not in {"mph", "kmh"}:
-            raise ValueError("WEATHER_WIND_UNIT must be 'mph' or 'kmh'")
+        if self.temp_unit not in TEMPERATURE_UNITS:
+            raise ValueError(f"WEATHER_UNIT must be one of {sorted(TEMPERATURE_UNITS)}")
+        if self.wind_unit not in WIND_UNITS:
+            raise ValueError(f"WEATHER_WIND_UNIT must be one of {sorted(WIND_UNITS)}")
 
         self.timeout_s = timeout_s
         self.retry_attempts = retry_attempts
@@ -67,7 +121,27 @@ class WeatherClient:
 
         self.cache_session = requests_cache.CachedSession('.cache', expire_after=500)
         self.retry_session = retry(self.cache_session, retries=5, backoff_factor=0.2)
-        self.client = openmeteo_requests.Client(session=self.retry_session)
+        # a RecordingSession/ReplaySession (weather_app.recording) can stand in here
+        self.api_session = api_session or self.retry_session
+        self.client = openmeteo_requests.Client(session=self.api_session)
+
+        # every view this process can render, so each cell is fetched once for all of them;
+        # cells are cached in canonical units and converted per board
+        self.views = ViewRegistry([self.CURRENT_VIEW, self.DETAILED_VIEW, self.GRAPH_VIEW])
+        self.data_plane = WeatherDataPlane(
+            self.client,
+            self.BASE_URL,
+            self.views,
+            client=data_client,
+            current_max_age_s=refresh_s,
+            forecast_max_age_s=forecast_max_age_s,
+        )
+
+        self.last_good_store = last_good_store
+        self.stale_max_age_s = stale_max_age_s
+        self.revalidate_wait_s = revalidate_wait_s
+        self.revalidate_exit_wait_s = revalidate_exit_wait_s
+        self._revalidations: List[threading.Thread] = []
 
     @staticmethod
     def _is_retryable_status(status_code: int) -> bool:
@@ -80,104 +154,188 @@ class WeatherClient:
         jitter = random.uniform(0.0, 0.5)
         time.sleep(backoff + jitter)
 
-    def get_detailed_weather(self, city: str, lat, lon) -> DetailedWeather:
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": [
-                "temperature_2m",
-                "apparent_temperature",
-                "weather_code",
-            ],
-            "hourly": [
-                "precipitation_probability",
-            ],
-            "daily": [
-                "temperature_2m_max",
-                "temperature_2m_min",
-                "uv_index_max",
-                "sunset",
-            ],
-            "temperature_unit": self.temp_unit,
-            "windspeed_unit": self.wind_unit,
-            "timezone": "auto",
-        }
-
-        responses = self.client.weather_api(self.BASE_URL, params=params)
-        response = responses[0]
+    def _stale_while_revalidate(
+        self,
+        key: str,
+        fetch: Callable[[], T],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+        refetch: bool = True,
+    ) -> Tuple[T, bool]:
+        """
+        (value, is_stale). With a last good value younger than
+        stale_max_age_s, refetch in a background thread and wait at most
+        revalidate_wait_s for it; if the upstream is slower or fails, serve
+        the last good value marked stale. The background fetch still
+        refreshes the store when it lands, so the next run picks it up; the
+        process waits up to revalidate_exit_wait_s for it at exit (see
+        wait_for_revalidations). Without a usable value this is a plain fetch.
+
+        refetch=False serves a usable last good value as-is, without asking
+        the upstream at all.
+
+        Values are stored in canonical units, so every display unit shares
+        one last good copy; callers convert what this returns.
+        """
+        cached = self.last_good_store.get(key) if self.last_good_store else None
+        age_s = time.time() - cached[1] if cached else None
+
+        if cached is None or age_s > self.stale_max_age_s:
+            value = fetch()
+            self._remember(key, value, encode)
+            return value, False
+
+        if not refetch:
+            return decode(cached[0]), False
+
+        done = threading.Event()
+        result: Dict[str, T] = {}
+
+        def revalidate():
+            try:
+                value = fetch()
+                self._remember(key, value, encode)
+                result["value"] = value
+            except Exception:
+                logger.exception("Weather revalidation failed for %s", key)
+            finally:
+                done.set()
+
+        thread = threading.Thread(target=revalidate, name="weather-revalidate", daemon=True)
+        if not self._revalidations:
+            # the jobs are one-shot; without this the fetch dies with the process
+            atexit.register(self.wait_for_revalidations)
+        self._revalidations.append(thread)
+        thread.start()
+
+        if done.wait(self.revalidate_wait_s) and "value" in result:
+            return result["value"], False
+
+        logger.warning("Serving stale weather for %s (%.0fs old)", key, age_s)
+        return decode(cached[0]), True
+
+    def wait_for_revalidations(self, timeout_s: Optional[float] = None) -> None:
+        """Join background refetches, waiting at most timeout_s in total."""
+        timeout_s = self.revalidate_exit_wait_s if timeout_s is None else timeout_s
+        deadline = time.monotonic() + timeout_s
+
+        for thread in self._revalidations:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning("Weather revalidation still running after %.0fs; abandoning it", timeout_s)
+                return
+
+    def _remember(self, key: str, value: Any, encode: Callable[[Any], Any]):
+        if self.last_good_store is None:
+            return
+
+        try:
+            self.last_good_store.put(key, encode(value))
+        except Exception:
+            logger.exception("Failed to store last good weather for %s", key)
+
+    def get_detailed_weather(self, city: str, lat, lon, refetch: bool = True) -> DetailedWeather:
+        detailed, stale = self._stale_while_revalidate(
+            key=f"detailed:{city}:{grid_cell(lat, lon)}",
+            fetch=lambda: self._fetch_detailed_weather(city, lat, lon),
+            encode=asdict,
+            decode=lambda payload: DetailedWeather(**payload),
+            refetch=refetch,
+        )
 
-        # -------- Current --------
-        current = response.Current()
-        temperature = current.Variables(0).Value()
-        feels_like = current.Variables(1).Value()
-        weather_code = int(current.Variables(2).Value())
+        temp_now, feels_like, temp_max, temp_min = convert_temperature(
+            [detailed.temp_now, detailed.feels_like, detailed.temp_max, detailed.temp_min],
+            self.temp_unit,
+        ).tolist()
 
-        # -------- Daily --------
-        daily = response.Daily()
-        high = float(daily.Variables(0).ValuesAsNumpy()[0])
-        low = float(daily.Variables(1).ValuesAsNumpy()[0])
-        uv_index = float(daily.Variables(2).ValuesAsNumpy()[0])
+        return replace(
+            detailed,
+            temp_now=temp_now,
+            feels_like=feels_like,
+            temp_max=temp_max,
+            temp_min=temp_min,
+            unit=temperature_symbol(self.temp_unit),
+            is_stale=stale,
+        )
 
-        # -------- Rain chance (derived) --------
-        hourly = response.Hourly()
-        rain_probs = hourly.Variables(0).ValuesAsNumpy()
+    def _fetch_detailed_weather(self, city: str, lat, lon) -> DetailedWeather:
+        data = self.data_plane.get(lat, lon, self.DETAILED_VIEW)
+        return self._project_detailed_weather(data, city)
 
-        rain_chance_today = float(rain_probs[:24].max())
+    def _project_detailed_weather(self, data: CellData, city: str) -> DetailedWeather:
+        """The city's detailed weather in canonical units."""
+        current = data.current
+        forecast = data.forecast
+        weather_code = int(current["weather_code"])
 
-        detailed = DetailedWeather(
+        return DetailedWeather(
             city=city,
-            temp_now=temperature,
-            temp_max=high,
-            temp_min=low,
-            feels_like=feels_like,
-            uv_idx=uv_index,
-            rain_chance_today=rain_chance_today,
+            temp_now=current["temperature_2m"],
+            temp_max=forecast.today("temperature_2m_max"),
+            temp_min=forecast.today("temperature_2m_min"),
+            feels_like=current["apparent_temperature"],
+            uv_idx=forecast.today("uv_index_max"),
+            # from the current hour to local midnight
+            rain_chance_today=forecast.rest_of_day_max("precipitation_probability"),
             condition=self._weathercode_to_text(weather_code),
-            unit="C" if self.temp_unit == "celsius" else "F"
+            unit=temperature_symbol(CANONICAL_TEMP_UNIT),
+            weather_code=weather_code,
+            precipitation_probability=current["precipitation_probability"],
         )
 
-        return detailed
-
-
-    def get_current_weather_multi_cities(self) -> list[WeatherNow]:
-        results: List[WeatherNow] = []
-
-        for city, (lat, lon) in self.cities_coords.items():
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "current": ["temperature_2m", "wind_speed_10m", "weather_code"],
-                "temperature_unit": self.temp_unit,
-                "windspeed_unit": "kmh" if self.wind_unit == "kmh" else "mph",
-                "timezone": "auto",
-            }
-
-            responses = self.client.weather_api(self.BASE_URL, params=params)
-            response = responses[0]
-
-            results.append(self._parse_current_to_weather_now(response=response, city=city))
-
-        return results
+    def get_forecast_graph(self, lat, lon, hours: int) -> ForecastGraph:
+        """The next `hours` as a board graph, from the cell's cached hourly series."""
+        graph, stale = self._stale_while_revalidate(
+            key=f"graph:{grid_cell(lat, lon)}:{hours}",
+            fetch=lambda: self._fetch_forecast_graph(lat, lon, hours),
+            encode=asdict,
+            decode=lambda payload: ForecastGraph(**payload),
+        )
 
-    def _parse_current_to_weather_now(self, response, city: str) -> WeatherNow:
-        """
-        Convert Open-Meteo response object into WeatherNow.
-        """
-        current = response.Current()
+        # the tiles are unit-independent; only the range label converts
+        temp_min, temp_max = convert_temperature([graph.temp_min, graph.temp_max], self.temp_unit).tolist()
+        return replace(graph, temp_min=temp_min, temp_max=temp_max, unit=self.temp_unit, is_stale=stale)
+
+    def _fetch_forecast_graph(self, lat, lon, hours: int) -> ForecastGraph:
+        data = self.data_plane.get(lat, lon, self.GRAPH_VIEW)
+        return build_forecast_graph(data.forecast, hours, CANONICAL_TEMP_UNIT)
+
+    def get_current_weather_multi_cities(self, refetch: bool = True) -> list[WeatherNow]:
+        readings, stale = self._stale_while_revalidate(
+            key=f"current:{','.join(self.cities_coords)}",
+            fetch=self._fetch_current_readings,
+            encode=lambda readings: readings,
+            decode=lambda payload: payload,
+            refetch=refetch,
+        )
 
-        temperature = float(current.Variables(0).Value())
-        wind_speed = int(round(float(current.Variables(1).Value())))
-        weather_code = int(current.Variables(2).Value())
+        return self._project_weather_now(readings, is_stale=stale)
 
-        unit = "C" if self.temp_unit == "celsius" else "F"
+    def _fetch_current_readings(self) -> Dict[str, Dict[str, float]]:
+        """Each city's current conditions, in canonical units."""
+        return {
+            city: self.data_plane.get(lat, lon, self.CURRENT_VIEW).current
+            for city, (lat, lon) in self.cities_coords.items()
+        }
 
-        return WeatherNow(
-            city=city,
-            temperature=temperature,
-            unit=unit,
-            wind_speed=wind_speed,
-            wind_unit=self.wind_unit,
-        )
+    def _project_weather_now(self, readings: Dict[str, Dict[str, float]], is_stale: bool = False) -> List[WeatherNow]:
+        # readings hold canonical units; convert every city in one pass
+        temperatures = convert_temperature([r["temperature_2m"] for r in readings.values()], self.temp_unit)
+        wind_speeds = np.rint(convert_speed([r["wind_speed_10m"] for r in readings.values()], self.wind_unit))
+
+        return [
+            WeatherNow(
+                city=city,
+                temperature=float(temperature),
+                unit=temperature_symbol(self.temp_unit),
+                wind_speed=int(wind_speed),
+                wind_unit=self.wind_unit,
+                is_stale=is_stale,
+                weather_code=int(current["weather_code"]),
+                precipitation_probability=current["precipitation_probability"],
+            )
+            for (city, current), temperature, wind_speed in zip(readings.items(), temperatures, wind_speeds)
+        ]
 
     @staticmethod
     def _weathercode_to_text(code: int) -> str:
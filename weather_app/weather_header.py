@@ -1,10 +1,20 @@
 from datetime import datetime
+from typing import Dict
 from zoneinfo import ZoneInfo
-from vestaboard import utils
+from vestaboard.templates import Cell
+
+# the header as a template row, filled from WeatherHeader.slot_values()
+HEADER_ROW = [
+    Cell(6, slot="header.date"),
+    Cell(10, slot="header.filler", justify="center"),
+    Cell(6, slot="header.time", justify="right"),
+]
 
 
 class WeatherHeader():
-    def __init__(self):
+    def __init__(self, stale: bool = False):
+        # shown in place of the colour bar when serving a last good value
+        self.stale = stale
         self.now = datetime.now(ZoneInfo("America/Los_Angeles"))
         self.month = self.now.strftime("%b")
         self.day = self.now.day.__str__()
@@ -12,36 +22,21 @@ class WeatherHeader():
         self.hour_in_12 = self.hour % 12 or 12
         self.ampm = "AM" if self.hour < 12 else "PM"
 
-    def compose_header_components(self):
-        date_string = self.month + " " + self.day
-        date_component = utils.compose_vbml_component(
-            date_string,
-            height=1,
-            width=6,
-            justify="left",
-            align="top"
-        )
-
-        filler_component = utils.compose_vbml_component(
-            "{63}{64}{65}{66}{67}{68}",
-            height=1,
-            width=10,
-            justify="center",
-            align="top"
-        )
-
-        time_string = str(self.hour_in_12) + self.ampm
-        time_component = utils.compose_vbml_component(
-            time_string,
-            height=1,
-            width=6,
-            justify="right",
-            align="top"
-        )
-
-        return [date_component, filler_component, time_component]
-
-
+    @property
+    def date_string(self) -> str:
+        return self.month + " " + self.day
 
+    @property
+    def filler(self) -> str:
+        return "{63}STALE{63}" if self.stale else "{63}{64}{65}{66}{67}{68}"
 
+    @property
+    def time_string(self) -> str:
+        return str(self.hour_in_12) + self.ampm
 
+    def slot_values(self) -> Dict[str, str]:
+        return {
+            "header.date": self.date_string,
+            "header.filler": self.filler,
+            "header.time": self.time_string,
+        }